@@ -0,0 +1,119 @@
+"""
+Benchmark the vectorized handicap kernel against the scalar Decimal functions
+
+    python -m api.benchmarks.handicap_kernel --users 1 1000 1000000
+
+The scalar path is timed on at most --decimal-sample Users and extrapolated past that,
+every User it is timed on is also checked against the kernel's result.
+"""
+import argparse
+import time
+from typing import Tuple
+
+import numpy as np
+
+from api.handicap_kernel import from_tenths, handicap_indexes
+from api.handicap_math import (
+    WINDOW_SIZE,
+    calculate_differential,
+    handicap,
+)
+
+
+def generate_rounds(num_users: int, seed: int = 18) -> dict:
+    rng = np.random.default_rng(seed)
+    rounds_per_user = rng.integers(0, WINDOW_SIZE + 1, size=num_users)
+    num_rounds = int(rounds_per_user.sum())
+    return {
+        'user_ids': np.repeat(np.arange(1, num_users + 1), rounds_per_user),
+        'gross_scores': rng.integers(62, 126, size=num_rounds),
+        'course_ratings': rng.integers(660, 781, size=num_rounds),
+        'slopes': rng.integers(55, 156, size=num_rounds) * 10,
+    }
+
+
+def scalar_indexes(rounds: dict, num_users: int) -> dict:
+    """The per-User Decimal path used before the kernel, on the first num_users Users"""
+    num_rows = int(np.searchsorted(rounds['user_ids'], num_users, side='right'))
+    rows_by_user = {}
+    for row in range(num_rows):
+        rows_by_user.setdefault(int(rounds['user_ids'][row]), []).append(row)
+
+    indexes = {}
+    for user_id, rows in rows_by_user.items():
+        differentials = [
+            calculate_differential(
+                gross_score=int(rounds['gross_scores'][row]),
+                course_rating=from_tenths(rounds['course_ratings'][row]),
+                slope=from_tenths(rounds['slopes'][row]),
+            )
+            for row in rows
+        ]
+        if len(differentials) < 5:
+            continue
+        indexes[user_id] = round(handicap(differentials=differentials), 1)
+    return indexes
+
+
+def best_of(repeat: int, func, *args) -> Tuple[float, object]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(num_users: int, decimal_sample: int, repeat: int) -> dict:
+    rounds = generate_rounds(num_users=num_users)
+    kernel_seconds, (user_ids, index_tenths) = best_of(
+        repeat,
+        handicap_indexes,
+        rounds['user_ids'],
+        rounds['gross_scores'],
+        rounds['course_ratings'],
+        rounds['slopes'],
+    )
+
+    sample_users = min(num_users, decimal_sample)
+    decimal_seconds, expected = best_of(repeat, scalar_indexes, rounds, sample_users)
+    decimal_seconds *= num_users / sample_users
+
+    sampled = user_ids <= sample_users
+    actual = {int(user_id): from_tenths(tenths) for user_id, tenths in zip(user_ids[sampled], index_tenths[sampled])}
+    if actual != expected:
+        raise AssertionError(f"kernel and Decimal indexes differ for {num_users} users")
+
+    return {
+        'users': num_users,
+        'rounds': len(rounds['user_ids']),
+        'kernel_seconds': kernel_seconds,
+        'decimal_seconds': decimal_seconds,
+        'extrapolated': sample_users < num_users,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized handicap kernel")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 1000, 1000000])
+    parser.add_argument(
+        "--decimal-sample",
+        type=int,
+        default=100000,
+        help="most Users to time the Decimal path on, larger runs are extrapolated",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"{'users':>10} {'rounds':>11} {'kernel':>10} {'decimal':>11} {'speedup':>8}")
+    for num_users in args.users:
+        result = run(num_users=num_users, decimal_sample=args.decimal_sample, repeat=args.repeat)
+        decimal_seconds = f"{result['decimal_seconds']:.4f}s" + ('*' if result['extrapolated'] else ' ')
+        print(
+            f"{result['users']:>10} {result['rounds']:>11} {result['kernel_seconds']:>9.4f}s "
+            f"{decimal_seconds:>11} {result['decimal_seconds'] / result['kernel_seconds']:>7.1f}x"
+        )
+    print("* extrapolated from --decimal-sample users")
@@ -0,0 +1,158 @@
+"""
+Benchmark the baked repository lookups against building and compiling their ORM query on every call
+
+    python -m api.benchmarks.repository_lookups --calls 5000
+
+The lookups run against an in-memory SQLite database, so the time per call is almost all
+query construction, compilation and loading rather than the database answering. Every
+uncached call is also checked against the baked lookup's result.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Callable, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base
+from api.models import GolfClub, GolfCourse, GolfRound, GolfRoundStats, Handicap, TeeBox, User
+from api.pagination import PageRequest, paginate
+from api.repositories.golf_round_repository import GolfRoundRepository
+from api.repositories.handicap_repository import HandicapRepository
+from api.repositories.user_repository import UserRepository
+from api.schemas import GolfRoundSchema
+
+NUM_USERS = 100
+ROUNDS_PER_USER = 20
+golf_round_schema = GolfRoundSchema()
+
+
+def create_session():
+    engine = create_engine('sqlite://')
+
+    @event.listens_for(engine, 'connect')
+    def attach_public_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    tables = [model.__table__ for model in (User, GolfClub, GolfCourse, TeeBox, GolfRound, GolfRoundStats, Handicap)]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+
+    session.add(GolfClub(name='Olympia Fields', golf_courses=[GolfCourse(name='North', num_holes=18)]))
+    session.add(TeeBox(golf_course_id=1, tee_color='blue', par=70, distance=6800, unit='yards', course_rating=72,
+                       slope=130))
+    session.execute(User.__table__.insert(), [
+        {
+            'email': f'golfer{user_id}@footwedge.com',
+            'password_hash': 'hash',
+            'first_name': 'Golfer',
+            'last_name': f'Number {user_id}',
+            'role': 'standard_user',
+        }
+        for user_id in range(1, NUM_USERS + 1)
+    ])
+    session.execute(GolfRound.__table__.insert(), [
+        {
+            'golf_course_id': 1,
+            'tee_box_id': 1,
+            'user_id': user_id,
+            'gross_score': 80 + round_number % 10,
+            'towards_handicap': True,
+            'played_on': date(2021, 1, 1) + timedelta(days=round_number),
+        }
+        for user_id in range(1, NUM_USERS + 1)
+        for round_number in range(ROUNDS_PER_USER)
+    ])
+    session.execute(Handicap.__table__.insert(), [
+        {'user_id': user_id, 'index': 12.5, 'authorized_association': 'USGA', 'record_start_date': date(2021, 1, 1)}
+        for user_id in range(1, NUM_USERS + 1)
+    ])
+    session.commit()
+    return session
+
+
+def repositories(session) -> dict:
+    repos = {
+        'user': UserRepository(model=User),
+        'handicap': HandicapRepository(model=Handicap),
+        'golf_round': GolfRoundRepository(model=GolfRound),
+    }
+    for repo in repos.values():
+        repo.db_session = session
+    return repos
+
+
+def lookups(repos: dict) -> dict:
+    """Each lookup as (uncached, baked), the uncached one being how it was written before baking"""
+    user_repo, handicap_repo, golf_round_repo = repos['user'], repos['handicap'], repos['golf_round']
+    page_request = PageRequest(limit=10)
+    return {
+        'UserRepository.get_by_email': (
+            lambda n: user_repo.query().filter_by(email=f'golfer{n}@footwedge.com').first(),
+            lambda n: user_repo.get_by_email(email=f'golfer{n}@footwedge.com'),
+        ),
+        'HandicapRepository.get_active': (
+            lambda n: handicap_repo.query().filter_by(record_end_date=None).filter(Handicap.user_id == n).first(),
+            lambda n: handicap_repo.get_active(user_id=n),
+        ),
+        'GolfRoundRepository.get_by_user_id': (
+            lambda n: paginate(
+                golf_round_repo.query(golf_round_schema).filter_by(user_id=n),
+                order_by=[GolfRound.played_on, GolfRound.id],
+                page_request=page_request,
+                descending=True,
+            ).items,
+            lambda n: golf_round_repo.get_by_user_id(user_id=n, schema=golf_round_schema, page_request=page_request).items,
+        ),
+        'BaseRepository.get': (
+            lambda n: golf_round_repo.query(golf_round_schema).filter(GolfRound.id == n).first(),
+            lambda n: golf_round_repo.get(model_id=n, schema=golf_round_schema),
+        ),
+    }
+
+
+def per_call_seconds(lookup: Callable, calls: int, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for call in range(calls):
+            lookup(call % NUM_USERS + 1)
+        timings.append((time.perf_counter() - start) / calls)
+    return min(timings)
+
+
+def run(name: str, uncached: Callable, baked: Callable, session, calls: int, repeat: int) -> Tuple[float, float]:
+    for n in range(1, NUM_USERS + 1):
+        if uncached(n) != baked(n):
+            raise AssertionError(f"{name} returns something else baked for {n}")
+        # a fresh identity map each call, so neither side is answered from the last one's objects
+        session.expunge_all()
+
+    def isolated(lookup):
+        def call(n):
+            result = lookup(n)
+            session.expunge_all()
+            return result
+        return call
+
+    return per_call_seconds(isolated(uncached), calls, repeat), per_call_seconds(isolated(baked), calls, repeat)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the baked repository lookups")
+    parser.add_argument("--calls", type=int, default=5000, help="calls of each lookup per timing")
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    session = create_session()
+    print(f"{'lookup':<36} {'uncached':>10} {'baked':>10} {'saved':>10} {'speedup':>8}")
+    for name, (uncached, baked) in lookups(repositories(session)).items():
+        uncached_seconds, baked_seconds = run(name, uncached, baked, session, calls=args.calls, repeat=args.repeat)
+        print(
+            f"{name:<36} {uncached_seconds * 1e6:>8.0f}us {baked_seconds * 1e6:>8.0f}us "
+            f"{(uncached_seconds - baked_seconds) * 1e6:>8.0f}us {uncached_seconds / baked_seconds:>7.1f}x"
+        )
@@ -0,0 +1,221 @@
+"""
+Benchmark the API's serving modes against each other at a fixed number of workers
+
+    python -m api.benchmarks.serving --modes threads gevent --connections 2 50 200 1000
+
+Every mode runs gunicorn with api/gunicorn_config.py and the same API_WORKERS, so each gets the
+same memory budget of worker processes. The endpoint served makes the SearchService call a golf
+club write makes, against a stand-in search service that answers after --upstream-latency
+seconds, which is the outbound wait that holds a thread in the threads mode.
+Throughput, latency, errors and the workers' peak resident memory are reported per run.
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from flask import Flask, jsonify, request
+
+from api.services.search_service import SearchService
+
+GUNICORN_CONFIG = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn_config.py')
+REQUEST_TIMEOUT_SECONDS = 30
+
+app = Flask(__name__)
+
+
+@app.route('/golf-clubs/<int:golf_club_id>', methods=['PUT'])
+def add_golf_club(golf_club_id: int):
+    SearchService.add_golf_club(golf_club_id=golf_club_id, payload=request.get_json())
+    return jsonify({'status': 'success'})
+
+
+class SearchServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 would refuse connections before the API does
+    request_queue_size = 4096
+
+
+def start_search_service(latency: float) -> ThreadingHTTPServer:
+    class SlowSearchService(BaseHTTPRequestHandler):
+
+        def do_PUT(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = SearchServiceServer(('127.0.0.1', 0), SlowSearchService)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port: int, timeout: float = 15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn did not start listening on {port}")
+
+
+def start_api(mode: str, workers: int, port: int, search_service_url: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        'API_SERVING_MODE': mode,
+        'API_WORKERS': str(workers),
+        'PORT': str(port),
+        'SEARCH_SERVICE_API_BASE_URL': search_service_url,
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'api.benchmarks.serving:app', '-c', GUNICORN_CONFIG,
+         '-b', f'127.0.0.1:{port}'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    wait_until_listening(port)
+    return process
+
+
+def worker_pids(master_pid: int) -> list:
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat:
+                # the command name in parentheses can contain spaces, fields after it can't
+                parent_pid = int(stat.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent_pid == master_pid:
+            pids.append(int(entry))
+    return pids
+
+
+def resident_megabytes(pids: list) -> float:
+    kilobytes = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        kilobytes += int(line.split()[1])
+        except OSError:
+            continue
+    return kilobytes / 1024
+
+
+def generate_load(port: int, connections: int, duration: float) -> dict:
+    """Each connection sends PUTs back to back over keep-alive until duration runs out"""
+    deadline = time.monotonic() + duration
+    body = b'{"name": "Olympia Fields"}'
+    headers = {'Content-Type': 'application/json'}
+
+    def client(connection_number: int):
+        latencies, errors = [], 0
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=REQUEST_TIMEOUT_SECONDS)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request('PUT', f'/golf-clubs/{connection_number}', body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=REQUEST_TIMEOUT_SECONDS)
+        conn.close()
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        results = list(executor.map(client, range(connections)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    return {
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else float('nan'),
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float('nan'),
+        'errors': sum(errors for _, errors in results),
+    }
+
+
+def run(mode: str, workers: int, connections: int, duration: float, search_service_url: str) -> dict:
+    port = free_port()
+    process = start_api(mode=mode, workers=workers, port=port, search_service_url=search_service_url)
+    peak_megabytes = 0.0
+    done = threading.Event()
+
+    def sample_memory():
+        nonlocal peak_megabytes
+        while not done.wait(0.2):
+            peak_megabytes = max(peak_megabytes, resident_megabytes(worker_pids(process.pid)))
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+    try:
+        result = generate_load(port=port, connections=connections, duration=duration)
+    finally:
+        done.set()
+        sampler.join()
+        process.terminate()
+        process.wait()
+    return {'mode': mode, 'connections': connections, 'worker_megabytes': peak_megabytes, **result}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the API's serving modes")
+    parser.add_argument("--modes", nargs="+", default=['threads', 'gevent'])
+    parser.add_argument("--connections", type=int, nargs="+", default=[2, 50, 200, 1000])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load per run")
+    parser.add_argument("--upstream-latency", type=float, default=0.2, help="seconds the search service takes")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    search_service = start_search_service(latency=args.upstream_latency)
+    search_service_url = f'http://127.0.0.1:{search_service.server_address[1]}'
+    print(f"{'mode':>8} {'conns':>6} {'req/s':>9} {'p50':>9} {'p99':>9} {'errors':>7} {'worker rss':>11}")
+    for mode in args.modes:
+        for connections in args.connections:
+            result = run(
+                mode=mode,
+                workers=args.workers,
+                connections=connections,
+                duration=args.duration,
+                search_service_url=search_service_url,
+            )
+            print(
+                f"{result['mode']:>8} {result['connections']:>6} {result['requests_per_second']:>9.1f} "
+                f"{result['p50_ms']:>7.0f}ms {result['p99_ms']:>7.0f}ms {result['errors']:>7} "
+                f"{result['worker_megabytes']:>9.1f}MB"
+            )
+    search_service.shutdown()
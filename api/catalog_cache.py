@@ -0,0 +1,223 @@
+"""
+A read-through Redis cache for the course catalog, golf clubs, courses, tee boxes and holes.
+
+Each entry is stored with the versions of the tags it depends on as they were before it was
+loaded, and a write bumps the versions of the tags it changes, so a write invalidates exactly
+the entries built from what it changed, including any loaded while it was committing. One
+worker at a time loads a missed entry, the others wait up to CATALOG_CACHE_LOCK_WAIT_SECONDS
+for it to be stored. A missed entry is loaded from the primary, an entry loaded from a replica
+that hasn't replayed a write yet would be stored under the versions that write bumped. The
+versions of an entry's tags are its ETag too, so a conditional GET of it doesn't need the
+database. When Redis is unavailable reads fall through to the database.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, List, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from api.database import primary_reads
+from api.pagination import PageRequest
+from api.redis_client import redis_client
+from api.repositories.versions import Version
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'catalog'
+LOCK_POLL_SECONDS = 0.02
+
+
+def golf_club_tag(golf_club_id: int) -> str:
+    """A golf club, its golf courses and their tee boxes"""
+    return f'golf_club:{golf_club_id}'
+
+
+def tee_box_tag(tee_box_id: int) -> str:
+    return f'tee_box:{tee_box_id}'
+
+
+def tee_box_holes_tag(tee_box_id: int) -> str:
+    return f'tee_box:{tee_box_id}:holes'
+
+
+def page_key(page_request: Optional[PageRequest]) -> str:
+    if page_request is None:
+        return 'all'
+    return f'{page_request.limit}:{page_request.cursor or ""}'
+
+
+class CatalogCache:
+
+    def __init__(self, redis, ttl_seconds: int, lock_seconds: float = 5, lock_wait_seconds: float = 0.5,
+                 enabled: bool = True, primary_reads: Callable[[], ContextManager] = nullcontext):
+        self._redis_client = redis
+        self._ttl_seconds = ttl_seconds
+        self._lock_seconds = lock_seconds
+        self._lock_wait_seconds = lock_wait_seconds
+        self._enabled = enabled
+        self._primary_reads = primary_reads
+        self._stats = defaultdict(Counter)
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _entry_key(key: str) -> str:
+        return f'{CACHE_KEY_PREFIX}:entry:{key}'
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f'{CACHE_KEY_PREFIX}:lock:{key}'
+
+    @staticmethod
+    def _version_key(tag: str) -> str:
+        return f'{CACHE_KEY_PREFIX}:version:{tag}'
+
+    @staticmethod
+    def _epoch_key() -> str:
+        return f'{CACHE_KEY_PREFIX}:epoch'
+
+    def _count(self, name: str, outcome: str):
+        with self._stats_lock:
+            self._stats[name][outcome] += 1
+
+    def stats(self) -> dict:
+        """Hits, misses and errors per cached read since this process started"""
+        with self._stats_lock:
+            return {name: dict(outcomes) for name, outcomes in self._stats.items()}
+
+    def get_or_load(self, name: str, key: str, tags: List[str], load: Callable[[], Any]) -> Any:
+        """
+        Read an entry, loading and storing it on a miss
+        :param: name of the read, entries and stats are kept per name
+        :param: key identifies the entry among the name's
+        :param: tags the entry depends on, invalidating any of them invalidates it
+        :param: load returns the JSON serializable value from the database
+        :return: the value
+        """
+        if not self._enabled:
+            return load()
+        key = f'{name}:{key}'
+        try:
+            found, value, versions, token = self._read_or_lock(key, tags)
+        except RedisError as exc:
+            logger.warning(f"Catalog cache unavailable reading {key}, reason: {exc}")
+            self._count(name, 'error')
+            return load()
+        if found:
+            self._count(name, 'hit')
+            return value
+        if token is None:
+            # whoever is loading it is slow, this request won't wait on it any longer
+            self._count(name, 'lock_timeout')
+            return load()
+
+        self._count(name, 'miss')
+        try:
+            with self._primary_reads():
+                value = load()
+            self._store(key, value, versions)
+        finally:
+            self._release_lock(key, token)
+        return value
+
+    def get_version(self, name: str, key: str, tags: List[str], fallback: Callable[[], Version]) -> Version:
+        """
+        Fingerprint an entry by the versions of its tags, which change with every write that invalidates it
+        :param: name, key and tags of the entry as passed to get_or_load
+        :param: fallback returns the Version from the database, for when the cache is disabled or unavailable
+        :return: Version
+        """
+        if not self._enabled:
+            return fallback()
+        keys = [self._epoch_key()] + [self._version_key(tag) for tag in tags]
+        try:
+            epoch, *versions = self._redis_client.mget(keys)
+            if epoch is None:
+                # versions start over when Redis loses them, a new epoch keeps the ETags
+                # from before from matching again
+                self._redis_client.set(self._epoch_key(), uuid.uuid4().hex, nx=True)
+                epoch, *versions = self._redis_client.mget(keys)
+        except RedisError as exc:
+            logger.warning(f"Catalog cache unavailable fingerprinting {name}:{key}, reason: {exc}")
+            return fallback()
+        fingerprint = json.dumps([name, key, epoch, versions])
+        return Version(etag=hashlib.sha1(fingerprint.encode('utf-8')).hexdigest())
+
+    def invalidate(self, tags: List[str]):
+        """
+        Make every entry depending on any of tags stale, call after the write has committed
+        :param: tags
+        """
+        if not self._enabled or not tags:
+            return
+        try:
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for tag in tags:
+                pipeline.incr(self._version_key(tag))
+            pipeline.execute()
+        except RedisError as exc:
+            # the stale entries expire after CATALOG_CACHE_TTL_SECONDS
+            logger.error(f"Unable to invalidate catalog cache tags: {tags}, reason: {exc}")
+
+    def _read(self, key: str, tags: List[str]) -> Tuple[bool, Any, list]:
+        pipeline = self._redis_client.pipeline(transaction=False)
+        pipeline.mget([self._version_key(tag) for tag in tags])
+        pipeline.get(self._entry_key(key))
+        versions, entry = pipeline.execute()
+        if entry is not None:
+            entry = json.loads(entry)
+            if entry['versions'] == versions:
+                return True, entry['value'], versions
+        return False, None, versions
+
+    def _store(self, key: str, value: Any, versions: list):
+        try:
+            entry = json.dumps({'versions': versions, 'value': value})
+            self._redis_client.set(self._entry_key(key), entry, ex=self._ttl_seconds)
+        except RedisError as exc:
+            logger.warning(f"Unable to store catalog cache entry {key}, reason: {exc}")
+
+    def _read_or_lock(self, key: str, tags: List[str]) -> Tuple[bool, Any, list, Optional[str]]:
+        """
+        Read an entry or else take the lock on loading it, waiting for another worker's load if it
+        holds the lock
+        :return: whether it was found, its value, the versions of its tags and the lock's token,
+                 which is None if the lock wait ran out
+        """
+        deadline = time.monotonic() + self._lock_wait_seconds
+        token = uuid.uuid4().hex
+        while True:
+            found, value, versions = self._read(key, tags)
+            if found:
+                return found, value, versions, None
+            if self._redis_client.set(self._lock_key(key), token, nx=True, px=int(self._lock_seconds * 1000)):
+                return found, value, versions, token
+            if time.monotonic() >= deadline:
+                return found, value, versions, None
+            time.sleep(LOCK_POLL_SECONDS)
+
+    def _release_lock(self, key: str, token: str):
+        try:
+            # the lock may have expired and been taken by another worker while this one loaded
+            if self._redis_client.get(self._lock_key(key)) == token:
+                self._redis_client.delete(self._lock_key(key))
+        except RedisError as exc:
+            logger.warning(f"Unable to release catalog cache lock {key}, reason: {exc}")
+
+
+catalog_cache = CatalogCache(
+    redis=redis_client,
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+    lock_seconds=settings.CATALOG_CACHE_LOCK_SECONDS,
+    lock_wait_seconds=settings.CATALOG_CACHE_LOCK_WAIT_SECONDS,
+    enabled=settings.CATALOG_CACHE_ENABLED,
+    primary_reads=primary_reads,
+)
+# for services constructed without a cache
+UNCACHED = CatalogCache(redis=None, ttl_seconds=0, enabled=False)
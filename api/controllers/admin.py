@@ -0,0 +1,34 @@
+from http import HTTPStatus
+
+from flask import (
+    Blueprint,
+    jsonify,
+    make_response,
+    request,
+)
+from flask_jwt_extended import jwt_required
+
+from api.catalog_cache import catalog_cache
+from api.helpers import requires_admin
+from api.slow_queries import slow_query_log
+
+
+blueprint = Blueprint('admin', __name__)
+
+
+@blueprint.route('/slow-queries', methods=['GET', 'DELETE'])
+@jwt_required
+@requires_admin
+def slow_queries():
+    if request.method == 'DELETE':
+        slow_query_log.clear()
+        return make_response(jsonify({'status': 'success'}), HTTPStatus.OK)
+
+    return make_response(jsonify({'status': 'success', 'result': slow_query_log.top()}), HTTPStatus.OK)
+
+
+@blueprint.route('/catalog-cache', methods=['GET'])
+@jwt_required
+@requires_admin
+def catalog_cache_stats():
+    return make_response(jsonify({'status': 'success', 'result': catalog_cache.stats()}), HTTPStatus.OK)
@@ -1,6 +1,5 @@
 from http import HTTPStatus
 
-import redis
 from flask import (
     Blueprint,
     jsonify,
@@ -13,15 +12,11 @@ from flask_jwt_extended import (
     jwt_refresh_token_required,
 )
 
-from api.settings import settings
+from api.redis_client import redis_client
 
 BLACKLISTED_TOKEN_FLAG = '1'
 ACTIVE_TOKEN_FLAG = '0'
 
-redis_client = redis.StrictRedis.from_url(
-    url=settings.REDIS_URI,
-    decode_responses=True
-)
 blueprint = Blueprint('auth', __name__)
 jwt = JWTManager()
 
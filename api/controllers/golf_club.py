@@ -3,6 +3,7 @@ from flask import (
     request
 )
 
+from api.catalog_cache import catalog_cache
 from api.services import (
     golf_course_service,
     golf_club_service,
@@ -14,8 +15,10 @@ from api.schemas import (
     GolfCourseSchema,
 )
 from api.helpers import (
+    conditional,
     requires_json_content,
     throws_500_on_exception,
+    with_page_request,
 )
 
 
@@ -24,27 +27,45 @@ golf_club_schema = GolfClubSchema()
 golf_course_schema = GolfCourseSchema()
 
 
+def _golf_club_service() -> golf_club_service.GolfClubService:
+    return golf_club_service.GolfClubService(
+        repo=golf_club_repo,
+        schema=golf_club_schema,
+        catalog_cache=catalog_cache,
+    )
+
+
+def _golf_course_service() -> golf_course_service.GolfCourseService:
+    return golf_course_service.GolfCourseService(
+        repo=golf_course_repo,
+        schema=golf_course_schema,
+        catalog_cache=catalog_cache,
+    )
+
+
 @blueprint.route('/', methods=['GET', 'POST'])
 @requires_json_content
 @throws_500_on_exception
-def golf_clubs():
+@with_page_request
+@conditional(lambda page_request: golf_club_repo.get_all_version(
+    schema=golf_club_schema, page_request=page_request))
+def golf_clubs(page_request):
     service = golf_club_service.GolfClubService(
         repo=golf_club_repo,
         schema=golf_club_schema,
+        catalog_cache=catalog_cache,
     )
     if request.method == 'GET':
-        return service.get_all()
+        return service.get_all(page_request=page_request)
 
     return service.add(payload=request.get_json())
 
 
 @blueprint.route('/<int:golf_club_id>', methods=['GET', 'DELETE'])
 @throws_500_on_exception
+@conditional(lambda golf_club_id: _golf_club_service().get_version(_id=golf_club_id))
 def golf_clubs_by_id(golf_club_id):
-    service = golf_club_service.GolfClubService(
-        repo=golf_club_repo,
-        schema=golf_club_schema,
-    )
+    service = _golf_club_service()
     if request.method == 'GET':
         return service.get(_id=golf_club_id)
     if request.method == 'DELETE':
@@ -54,13 +75,13 @@ def golf_clubs_by_id(golf_club_id):
 @blueprint.route('/<int:golf_club_id>/golf-courses', methods=['GET', 'POST'])
 @requires_json_content
 @throws_500_on_exception
-def golf_courses(golf_club_id):
-    service = golf_course_service.GolfCourseService(
-        repo=golf_course_repo,
-        schema=golf_course_schema,
-    )
+@with_page_request
+@conditional(lambda golf_club_id, page_request: _golf_course_service().get_version_by_golf_club_id(
+    golf_club_id=golf_club_id, page_request=page_request))
+def golf_courses(golf_club_id, page_request):
+    service = _golf_course_service()
     if request.method == 'GET':
-        return service.get_by_golf_club_id(golf_club_id=golf_club_id)
+        return service.get_by_golf_club_id(golf_club_id=golf_club_id, page_request=page_request)
 
     request_body = request.get_json()
     request_body['golf_club_id'] = golf_club_id
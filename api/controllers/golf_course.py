@@ -3,6 +3,7 @@ from flask import (
     request
 )
 
+from api.catalog_cache import catalog_cache
 from api.services import (
     golf_course_service,
     tee_box_service,
@@ -17,8 +18,10 @@ from api.schemas import (
     HoleSchema,
 )
 from api.helpers import (
+    conditional,
     requires_json_content,
     throws_500_on_exception,
+    with_page_request,
 )
 
 
@@ -28,26 +31,55 @@ tee_box_schema = TeeBoxSchema()
 hole_schema = HoleSchema()
 
 
+def _tee_box_service() -> tee_box_service.TeeBoxService:
+    return tee_box_service.TeeBoxService(
+        repo=tee_box_repo,
+        schema=tee_box_schema,
+        catalog_cache=catalog_cache,
+    )
+
+
+def _hole_service() -> hole_service.HoleService:
+    return hole_service.HoleService(
+        repo=hole_repo,
+        schema=hole_schema,
+        catalog_cache=catalog_cache,
+    )
+
+
+def _golf_courses_version(page_request):
+    ids = request.args.getlist('id')
+    if ids:
+        return golf_course_repo.get_version(model_ids=ids, schema=golf_course_schema)
+    return golf_course_repo.get_all_version(schema=golf_course_schema, page_request=page_request)
+
+
 @blueprint.route('/', methods=['GET'])
 @throws_500_on_exception
-def golf_courses():
+@with_page_request
+@conditional(_golf_courses_version)
+def golf_courses(page_request):
     ids = request.args.getlist('id')
     service = golf_course_service.GolfCourseService(
         repo=golf_course_repo,
         schema=golf_course_schema,
+        catalog_cache=catalog_cache,
     )
     if ids:
         return service.get_by_ids(ids=ids)
 
-    return service.get_all()
+    return service.get_all(page_request=page_request)
 
 
 @blueprint.route('/<int:golf_course_id>', methods=['GET', 'DELETE'])
 @throws_500_on_exception
+@conditional(lambda golf_course_id: golf_course_repo.get_version(
+    model_ids=[golf_course_id], schema=golf_course_schema))
 def golf_courses_by_id(golf_course_id):
     service = golf_course_service.GolfCourseService(
         repo=golf_course_repo,
         schema=golf_course_schema,
+        catalog_cache=catalog_cache,
     )
     if request.method == 'GET':
         return service.get(_id=golf_course_id)
@@ -58,13 +90,17 @@ def golf_courses_by_id(golf_course_id):
 @blueprint.route('/<int:golf_course_id>/tee-boxes', methods=['GET', 'POST'])
 @requires_json_content
 @throws_500_on_exception
-def tee_boxes(golf_course_id):
+@with_page_request
+@conditional(lambda golf_course_id, page_request: tee_box_repo.get_version_by_golf_course_id(
+    golf_course_id=golf_course_id, page_request=page_request))
+def tee_boxes(golf_course_id, page_request):
     service = tee_box_service.TeeBoxService(
         repo=tee_box_repo,
         schema=tee_box_schema,
+        catalog_cache=catalog_cache,
     )
     if request.method == 'GET':
-        return service.get_by_golf_course_id(golf_course_id=golf_course_id)
+        return service.get_by_golf_course_id(golf_course_id=golf_course_id, page_request=page_request)
 
     payload = request.get_json()
     return service.add(golf_course_id=golf_course_id, payload=payload)
@@ -73,11 +109,9 @@ def tee_boxes(golf_course_id):
 # TODO: Consider diff controller?
 @blueprint.route('/tee-boxes/<int:tee_box_id>', methods=['GET', 'DELETE'])
 @throws_500_on_exception
+@conditional(lambda tee_box_id: _tee_box_service().get_version(_id=tee_box_id))
 def tee_box_by_id(tee_box_id):
-    service = tee_box_service.TeeBoxService(
-        repo=tee_box_repo,
-        schema=tee_box_schema,
-    )
+    service = _tee_box_service()
     if request.method == 'GET':
         return service.get(_id=tee_box_id)
     if request.method == 'DELETE':
@@ -87,13 +121,13 @@ def tee_box_by_id(tee_box_id):
 @blueprint.route('/<int:golf_course_id>/tee-boxes/<int:tee_box_id>/holes', methods=['GET', 'POST'])
 @requires_json_content
 @throws_500_on_exception
-def holes(golf_course_id, tee_box_id):
-    service = hole_service.HoleService(
-        repo=hole_repo,
-        schema=hole_schema,
-    )
+@with_page_request
+@conditional(lambda golf_course_id, tee_box_id, page_request: _hole_service().get_version_by_tee_box_id(
+    tee_box_id=tee_box_id, page_request=page_request))
+def holes(golf_course_id, tee_box_id, page_request):
+    service = _hole_service()
     if request.method == 'GET':
-        return service.get_by_tee_box_id(tee_box_id=tee_box_id)
+        return service.get_by_tee_box_id(tee_box_id=tee_box_id, page_request=page_request)
 
     payload = request.get_json()
     return service.add(
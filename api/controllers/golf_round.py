@@ -14,36 +14,66 @@ from flask_jwt_extended import (
 from api.services import (
     golf_round_service,
     golf_round_stats_service,
-    hole_service,
+    handicap_history_service,
+    handicap_window_service,
 )
 from api.repositories.golf_round_repository import golf_round_repo
 from api.repositories.golf_round_stats_repository import golf_round_stats_repo
-from api.repositories.hole_repository import hole_repo
+from api.repositories.handicap_differential_repository import handicap_differential_repo
+from api.repositories.handicap_history_repository import handicap_history_repo
+from api.repositories.stats_totals_repository import stats_totals_repo
+from api.repositories.tee_box_repository import tee_box_repo
 from api.schemas import (
     GolfRoundSchema,
     GolfRoundStatsSchema,
-    HoleSchema
+    HandicapHistorySchema,
+)
+from api.helpers import (
+    conditional,
+    requires_json_content,
+    requires_service_token,
+    with_page_request,
 )
-from api.helpers import requires_json_content
 
 
 blueprint = Blueprint('golf-rounds', __name__)
 golf_round_schema = GolfRoundSchema()
 golf_round_stats_schema = GolfRoundStatsSchema()
-hole_schema = HoleSchema()
+handicap_history_schema = HandicapHistorySchema()
+
+
+def _handicap_window_service() -> handicap_window_service.HandicapWindowService:
+    return handicap_window_service.HandicapWindowService(
+        repo=handicap_differential_repo,
+        golf_round_repo=golf_round_repo,
+        tee_box_repo=tee_box_repo,
+    )
+
+
+def _handicap_history_service() -> handicap_history_service.HandicapHistoryService:
+    return handicap_history_service.HandicapHistoryService(
+        repo=handicap_history_repo,
+        golf_round_repo=golf_round_repo,
+        schema=handicap_history_schema,
+    )
 
 
 @blueprint.route('/', methods=['GET', 'POST'])
 @requires_json_content
 @jwt_required
-def golf_rounds():
+@with_page_request
+@conditional(lambda page_request: golf_round_repo.get_version_by_user_id(
+    user_id=get_jwt_identity(), schema=golf_round_schema, page_request=page_request))
+def golf_rounds(page_request):
     user_id = get_jwt_identity()
     service = golf_round_service.GolfRoundService(
         repo=golf_round_repo,
         schema=golf_round_schema,
+        handicap_window_service=_handicap_window_service(),
+        handicap_history_service=_handicap_history_service(),
     )
     if request.method == 'GET':
-        return service.get_by_user_id(user_id=user_id)
+        return service.get_by_user_id(user_id=user_id, page_request=page_request)
 
     payload = request.get_json()
     return service.add(user_id=user_id, payload=payload)
@@ -57,6 +87,9 @@ def delete_golf_round(golf_round_id):
     service = golf_round_service.GolfRoundService(
         repo=golf_round_repo,
         schema=golf_round_schema,
+        handicap_window_service=_handicap_window_service(),
+        handicap_history_service=_handicap_history_service(),
+        stats_totals_repo=stats_totals_repo,
     )
 
     golf_round = golf_round_repo.get(model_id=golf_round_id)
@@ -71,13 +104,27 @@ def delete_golf_round(golf_round_id):
 
 
 @blueprint.route('/<int:user_id>', methods=['GET'])
-def golf_rounds_by_user_id(user_id):
+@with_page_request
+@conditional(lambda user_id, page_request: golf_round_repo.get_version_by_user_id(
+    user_id=user_id, schema=golf_round_schema, page_request=page_request))
+def golf_rounds_by_user_id(user_id, page_request):
     # TODO: Implement Authentication for server to server auth
     service = golf_round_service.GolfRoundService(
         repo=golf_round_repo,
         schema=golf_round_schema,
     )
-    return service.get_by_user_id(user_id=user_id)
+    return service.get_by_user_id(user_id=user_id, page_request=page_request)
+
+
+@blueprint.route('/<int:user_id>/handicap-window', methods=['GET'])
+@requires_service_token
+def handicap_window_by_user_id(user_id):
+    service = golf_round_service.GolfRoundService(
+        repo=golf_round_repo,
+        schema=golf_round_schema,
+        handicap_window_service=_handicap_window_service(),
+    )
+    return service.get_handicap_window(user_id=user_id)
 
 
 @blueprint.route('/<int:golf_round_id>/golf-round-stats', methods=['GET', 'POST'])
@@ -87,6 +134,7 @@ def golf_round_stats(golf_round_id):
     service = golf_round_stats_service.GolfRoundStatsService(
         repo=golf_round_stats_repo,
         schema=golf_round_stats_schema,
+        stats_totals_repo=stats_totals_repo,
     )
     if request.method == 'GET':
         return service.get_by_golf_round_id(golf_round_id=golf_round_id)
@@ -103,9 +151,24 @@ def stats_summary():
         repo=golf_round_stats_repo,
         schema=golf_round_stats_schema,
     )
-    rounds = golf_round_repo.get_by_user_id(user_id=user_id)
-    hole_svc = hole_service.HoleService(
-        repo=hole_repo,
-        schema=hole_schema,
+    return stats_service.stats_summary(user_id=user_id)
+
+
+@blueprint.route('/golf-round-stats/totals', methods=['GET'])
+@jwt_required
+def stats_totals():
+    user_id = get_jwt_identity()
+    season = request.args.get('season')
+    if season is not None and not season.isdigit():
+        response_body = {
+            'status': 'fail',
+            'message': f"season must be a year, got: '{season}'",
+        }
+        return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
+
+    stats_service = golf_round_stats_service.GolfRoundStatsService(
+        repo=golf_round_stats_repo,
+        schema=golf_round_stats_schema,
+        stats_totals_repo=stats_totals_repo,
     )
-    return stats_service.stats_summary_by_round_id(golf_rounds=rounds, hole_service=hole_svc)
+    return stats_service.totals(user_id=user_id, season=int(season) if season is not None else None)
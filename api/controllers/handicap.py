@@ -1,5 +1,11 @@
+from datetime import date
+from http import HTTPStatus
+from typing import Optional
+
 from flask import (
     Blueprint,
+    jsonify,
+    make_response,
     request,
 )
 from flask_jwt_extended import (
@@ -7,17 +13,36 @@ from flask_jwt_extended import (
     get_jwt_identity,
 )
 
-from api.services import handicap_service
-from api.schemas import HandicapSchema
+from api.services import handicap_history_service, handicap_service
+from api.schemas import HandicapHistorySchema, HandicapSchema
 from api.helpers import (
     requires_json_content,
+    requires_service_token,
     throws_500_on_exception,
+    with_page_request,
 )
+from api.repositories.golf_round_repository import golf_round_repo
+from api.repositories.handicap_history_repository import handicap_history_repo
 from api.repositories.handicap_repository import handicap_repo
 
 
 blueprint = Blueprint('handicap', __name__)
 handicap_schema = HandicapSchema()
+handicap_history_schema = HandicapHistorySchema()
+
+
+def _date_arg(name: str) -> Optional[date]:
+    """
+    Read an optional YYYY-MM-DD query parameter
+    :raise: ValueError if it isn't a date
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date formatted YYYY-MM-DD, got: '{value}'")
 
 
 @blueprint.route('/', methods=['GET', 'POST'])
@@ -41,6 +66,34 @@ def handicap():
     return service.add(user_id=user_id, payload=payload)
 
 
+@blueprint.route('/history', methods=['GET'])
+@jwt_required
+@throws_500_on_exception
+@with_page_request
+def handicap_history(page_request):
+    user_id = get_jwt_identity()
+    try:
+        start_date, end_date = _date_arg('start'), _date_arg('end')
+    except ValueError as e:
+        response_body = {
+            'status': 'fail',
+            'message': str(e),
+        }
+        return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
+
+    service = handicap_history_service.HandicapHistoryService(
+        repo=handicap_history_repo,
+        golf_round_repo=golf_round_repo,
+        schema=handicap_history_schema,
+    )
+    return service.get_range(
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        page_request=page_request,
+    )
+
+
 @blueprint.route('/<int:user_id>', methods=['POST'])
 @requires_json_content
 @throws_500_on_exception
@@ -52,3 +105,15 @@ def add_handicap_for_user(user_id):
     )
     payload = request.get_json()
     return service.add(user_id=user_id, payload=payload)
+
+
+@blueprint.route('/<int:user_id>/active', methods=['DELETE'])
+@throws_500_on_exception
+@requires_service_token
+def close_active_handicap_for_user(user_id):
+    # for the handicap service, once a User no longer has enough rounds for a handicap
+    service = handicap_service.HandicapService(
+        repo=handicap_repo,
+        schema=handicap_schema,
+    )
+    return service.close_active(user_id=user_id)
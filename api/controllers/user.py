@@ -29,6 +29,17 @@ from api.repositories.user_repository import user_repo
 
 
 blueprint = Blueprint('user', __name__)
+# everything else on a User, like their role, is never set by the User themselves
+REGISTRATION_FIELDS = (
+    'email',
+    'password',
+    'first_name',
+    'last_name',
+    'middle_initial',
+    'phone_number',
+    'date_of_birth',
+    'gender',
+)
 handicap_schema = HandicapSchema()
 golf_round_schema = GolfRoundSchema()
 golf_round_stats_schema = GolfRoundStatsSchema()
@@ -52,7 +63,9 @@ def register_user():
         response_body = {"message": error_message}
         return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST.value)
 
-    new_user = user_repo.create(data=request_body)
+    new_user = user_repo.create(data={
+        field: request_body[field] for field in REGISTRATION_FIELDS if field in request_body
+    })
     user_id = new_user.id
     access_token = create_access_token(identity=user_id)
     refresh_token = create_refresh_token(identity=user_id)
@@ -1,19 +1,101 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+import random
+from contextlib import contextmanager
+from typing import Sequence
+
+from flask import has_request_context
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.dml import UpdateBase
 
 from api.settings import settings
+from api.sticky_reads import StickyReads, current_user_id, sticky_reads
+
+
+def _is_write(clause) -> bool:
+    return isinstance(clause, UpdateBase) or getattr(clause, '_for_update_arg', None) is not None
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to a replica and everything else to the primary.
+
+    A session reads from the primary once it has written, so it always reads its own writes,
+    and so does a request for a User that wrote within the last REPLICA_STICKY_SECONDS.
+    Sessions outside of a request, workers and scripts, only use the primary, as do the reads
+    made inside a primary_reads block.
+    """
+
+    def __init__(self, replicas: Sequence[Engine] = (), sticky_reads: StickyReads = None, **kwargs):
+        super().__init__(**kwargs)
+        self._replica = random.choice(replicas) if replicas else None
+        self._sticky_reads = sticky_reads
+        self._reads_primary = self._replica is None
+        self._checked_sticky = False
+        self._wrote = False
+        self._primary_reads = 0
+
+    def _is_sticky(self) -> bool:
+        if not has_request_context():
+            return True
+        return bool(self._sticky_reads) and self._sticky_reads.is_sticky(current_user_id())
+
+    def get_bind(self, mapper=None, clause=None):
+        if self._flushing or _is_write(clause):
+            self._reads_primary = self._wrote = True
+        elif not self._reads_primary and not self._primary_reads and not self._checked_sticky:
+            self._checked_sticky = True
+            self._reads_primary = self._is_sticky()
+
+        if self._reads_primary or self._primary_reads:
+            return super().get_bind(mapper=mapper, clause=clause)
+        return self._replica
+
+    @contextmanager
+    def primary_reads(self):
+        """Send the reads made inside the block to the primary, for reads that can't be stale"""
+        self._primary_reads += 1
+        try:
+            yield
+        finally:
+            self._primary_reads -= 1
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _mark_sticky_reads(session: RoutingSession):
+    if session._wrote and session._sticky_reads:
+        session._wrote = False
+        session._sticky_reads.mark(current_user_id())
+
 
 engine = create_engine(settings.FOOTWEDGE_DATABASE_URI)
+replica_engines = [create_engine(uri) for uri in settings.FOOTWEDGE_REPLICA_DATABASE_URIS]
 db_session = scoped_session(
     sessionmaker(
+        class_=RoutingSession,
         autocommit=False,
         autoflush=False,
-        bind=engine
+        # objects stay loaded after a commit rather than being reloaded on next access
+        expire_on_commit=False,
+        bind=engine,
+        replicas=replica_engines,
+        sticky_reads=sticky_reads,
     )
 )
 
-Base = declarative_base()
+
+def primary_reads():
+    """primary_reads for the current scoped session"""
+    return db_session().primary_reads()
+
+
+class _Base:
+    # server generated defaults come back with RETURNING in the INSERT or UPDATE itself
+    __mapper_args__ = {'eager_defaults': True}
+
+
+Base = declarative_base(cls=_Base)
 
 
 # def init_db():
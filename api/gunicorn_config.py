@@ -0,0 +1,33 @@
+"""
+gunicorn settings for the API, API_SERVING_MODE picks how a worker serves concurrent requests
+
+threads: API_THREADS threads per worker, a request waiting on Postgres, SQS or the search
+    service holds on to its thread until the call returns
+gevent: a greenlet per request, up to API_WORKER_CONNECTIONS per worker, a request waiting on
+    any of those yields to the worker's other requests
+"""
+import os
+
+SERVING_MODES = ('threads', 'gevent')
+serving_mode = os.environ.get('API_SERVING_MODE', 'threads')
+if serving_mode not in SERVING_MODES:
+    raise ValueError(f"API_SERVING_MODE must be one of {', '.join(SERVING_MODES)}, not '{serving_mode}'")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+proc_name = 'footwedge-api'
+workers = int(os.environ.get('API_WORKERS', 1))
+timeout = 60
+
+if serving_mode == 'gevent':
+    # the gevent worker monkey patches sockets, so requests, boto3 and redis yield while they wait
+    worker_class = 'gevent'
+    worker_connections = int(os.environ.get('API_WORKER_CONNECTIONS', 1000))
+else:
+    threads = int(os.environ.get('API_THREADS', 2))
+
+
+def post_fork(server, worker):
+    if serving_mode == 'gevent':
+        # psycopg2 waits on Postgres inside libpq, this has it wait on a gevent socket instead
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -0,0 +1,17 @@
+from typing import Iterable, Iterator, Tuple
+
+from api.handicap_window import DifferentialWindow, HANDICAP_WINDOW_SIZE
+
+
+def handicap_history(entries: Iterable, seed: Iterable = ()) -> Iterator[Tuple[object, object]]:
+    """
+    Compute the handicap index as of every round in one chronological pass, sliding a
+    window of the most recent rounds so each round costs O(log k) rather than a full recompute
+    :param: entries rounds oldest first, any objects with golf_round_id, played_on and differential
+    :param: seed the rounds immediately before entries, used to resume a history part way through
+    :return: (entry, handicap index or None) for every entry, oldest first
+    """
+    window = DifferentialWindow(entries=seed, window_size=HANDICAP_WINDOW_SIZE, capacity=HANDICAP_WINDOW_SIZE)
+    for entry in entries:
+        window.add(entry)
+        yield entry, window.handicap_index()
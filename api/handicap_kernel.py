@@ -0,0 +1,108 @@
+"""
+The handicap index of many Users at once over numpy arrays of fixed-point tenths, matching
+the Decimal functions of api.handicap_math exactly. Used by the bulk recalculation.
+"""
+from decimal import Decimal
+
+import numpy as np
+
+from api.handicap_math import (
+    MIN_HANDICAP_ROUNDS,
+    WINDOW_SIZE,
+    calculate_differential,
+    handicap,
+)
+
+# indexes this close to a rounding boundary, in tenths, are recomputed with Decimals; float
+# error is below 1e-10 tenths for any real round so this never changes a result, only its cost
+TIE_TOLERANCE = 1e-6
+
+
+def in_tenths(value) -> bool:
+    """Whether a course rating or slope can be converted to_tenths"""
+    tenths = Decimal(value) * 10
+    return tenths == tenths.to_integral_value()
+
+
+def to_tenths(values) -> np.ndarray:
+    """
+    Convert course ratings or slopes to integer tenths
+    :raise: ValueError if a value has more precision than tenths
+    """
+    values = list(values)
+    if not all(in_tenths(value) for value in values):
+        raise ValueError("course ratings and slopes must be given to at most one decimal place")
+    return np.array([int(Decimal(value) * 10) for value in values], dtype=np.int64)
+
+
+def from_tenths(tenths: int) -> Decimal:
+    return Decimal(int(tenths)).scaleb(-1)
+
+
+def _sample_sizes(num_rounds: np.ndarray) -> np.ndarray:
+    return np.select(
+        [num_rounds < MIN_HANDICAP_ROUNDS, num_rounds <= 10, num_rounds <= 19],
+        [0, 1, 5],
+        default=10,
+    )
+
+
+def _decimal_index_tenths(gross_scores, course_ratings, slopes) -> int:
+    differentials = [
+        calculate_differential(
+            gross_score=int(gross_score),
+            course_rating=from_tenths(course_rating),
+            slope=from_tenths(slope),
+        )
+        for gross_score, course_rating, slope in zip(gross_scores, course_ratings, slopes)
+    ]
+    return int(round(handicap(differentials=differentials), 1).scaleb(1))
+
+
+def handicap_indexes(user_ids, gross_scores, course_ratings, slopes, window_size: int = WINDOW_SIZE):
+    """
+    Calculate the handicap index of many Users at once
+    :param: user_ids array of User ids, each User's rounds contiguous and most recent first
+    :param: gross_scores array of gross scores
+    :param: course_ratings, slopes arrays of integer tenths, see to_tenths
+    :param: window_size only a User's most recent window_size rounds are counted
+    :return: (user_ids, index_tenths) arrays for the Users with enough rounds for a handicap
+    """
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    gross_scores = np.asarray(gross_scores, dtype=np.int64)
+    course_ratings = np.asarray(course_ratings, dtype=np.int64)
+    slopes = np.asarray(slopes, dtype=np.int64)
+    num_rows = len(user_ids)
+    if not num_rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    group_starts = np.flatnonzero(np.concatenate(([True], user_ids[1:] != user_ids[:-1])))
+    group_counts = np.diff(np.append(group_starts, num_rows))
+    groups = np.repeat(np.arange(len(group_starts)), group_counts)
+    positions = np.arange(num_rows) - np.repeat(group_starts, group_counts)
+    in_window = positions < window_size
+
+    # (gross - rating) * 113 / slope with rating and slope in tenths, exact until the division
+    differentials = ((gross_scores * 10 - course_ratings) * 113) / slopes
+    windows = np.full((len(group_starts), window_size), np.inf)
+    windows[groups[in_window], positions[in_window]] = differentials[in_window]
+
+    sizes = _sample_sizes(np.minimum(group_counts, window_size))
+    sums = np.zeros(len(group_starts))
+    for size in (1, 5, 10):
+        selected = sizes == size
+        if selected.any():
+            lowest = np.partition(windows[selected], size - 1, axis=1)[:, :size]
+            sums[selected] = lowest.sum(axis=1)
+
+    has_handicap = sizes > 0
+    index_tenths = np.zeros(len(group_starts))
+    index_tenths[has_handicap] = sums[has_handicap] * 9.6 / sizes[has_handicap]
+    near_tie = has_handicap & (np.abs(index_tenths - np.floor(index_tenths) - 0.5) < TIE_TOLERANCE)
+    index_tenths = np.rint(index_tenths).astype(np.int64)
+
+    for group in np.flatnonzero(near_tie):
+        rows = slice(group_starts[group], group_starts[group] + min(group_counts[group], window_size))
+        index_tenths[group] = _decimal_index_tenths(gross_scores[rows], course_ratings[rows], slopes[rows])
+
+    return user_ids[group_starts[has_handicap]], index_tenths[has_handicap]
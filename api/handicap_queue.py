@@ -0,0 +1,111 @@
+import logging
+import queue
+
+from redis.exceptions import RedisError
+
+from api.job_queue import (
+    InProcessJobQueue,
+    Job,
+    JobQueue,
+    RedisJobQueue,
+    SqsJobQueue,
+)
+from api.redis_client import redis_client
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY_PREFIX = 'handicap:pending'
+# SQS caps DelaySeconds at 15 minutes
+MAX_DELAY_SECONDS = 900
+REDIS_QUEUE_NAME = 'handicap'
+
+
+class HandicapQueue:
+    """
+    Coalesces handicap recompute requests per User in front of the handicap job queue.
+
+    The first request for a User sets a pending marker that expires after coalesce_seconds and
+    sends a message delayed by the same amount, so requests inside the window ride along with it
+    and the recompute it triggers sees every round recorded before it is delivered. A request after
+    the marker expires queues one follow-up recompute, so each User has at most one recompute
+    waiting to be delivered at a time.
+    """
+
+    def __init__(self, job_queue: JobQueue, redis, coalesce_seconds: int):
+        self._job_queue = job_queue
+        self._redis_client = redis
+        self._coalesce_seconds = min(max(coalesce_seconds, 0), MAX_DELAY_SECONDS)
+        self._job_queue.on_failure(self._job_failed)
+
+    @staticmethod
+    def _pending_key(user_id: int) -> str:
+        return f'{PENDING_KEY_PREFIX}:{user_id}'
+
+    def _mark_pending(self, user_id: int) -> bool:
+        try:
+            return bool(self._redis_client.set(
+                self._pending_key(user_id),
+                '1',
+                nx=True,
+                ex=self._coalesce_seconds,
+            ))
+        except RedisError as exc:
+            # fail open, an extra recompute is better than a missed one
+            logger.warning(f"Unable to coalesce handicap recompute for user_id: {user_id}, reason: {exc}")
+            return True
+
+    def _clear_pending(self, user_id: int):
+        try:
+            self._redis_client.delete(self._pending_key(user_id))
+        except RedisError as exc:
+            logger.warning(f"Unable to clear pending handicap recompute for user_id: {user_id}, reason: {exc}")
+
+    def _job_failed(self, job: Job):
+        # no recompute is coming, so the next request for the User must not be coalesced into it
+        self._clear_pending(job.body['user_id'])
+
+    def request_recompute(self, user_id: int) -> bool:
+        """
+        Queue a handicap recompute for a User unless one is already waiting to be delivered
+        :param: user_id
+        :return: True if a job was queued, False if the request was coalesced
+        """
+        if self._coalesce_seconds and not self._mark_pending(user_id):
+            logger.info(f"handicap recompute for user_id: {user_id} already pending, coalescing")
+            return False
+
+        logger.info("queueing handicap calculation...")
+        try:
+            self._job_queue.send(body={"user_id": user_id}, delay_seconds=self._coalesce_seconds)
+        except queue.Full:
+            self._clear_pending(user_id)
+            raise
+        return True
+
+
+def _calculate_handicap(body: dict):
+    # imported here, the tasks module depends on services that import this module
+    from api.tasks import calculate_usga_handicap
+    calculate_usga_handicap(body['user_id'])
+
+
+def create_job_queue(backend: str) -> JobQueue:
+    options = {
+        'batch_size': settings.JOB_QUEUE_BATCH_SIZE,
+        'flush_seconds': settings.JOB_QUEUE_FLUSH_SECONDS,
+    }
+    if backend == 'sqs':
+        return SqsJobQueue(queue_url=settings.HANDICAP_QUEUE_URL, **options)
+    if backend == 'redis':
+        return RedisJobQueue(redis_client=redis_client, name=REDIS_QUEUE_NAME, **options)
+    if backend == 'in_process':
+        return InProcessJobQueue(handler=_calculate_handicap, **options)
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND: '{backend}'")
+
+
+handicap_queue = HandicapQueue(
+    job_queue=create_job_queue(backend=settings.JOB_QUEUE_BACKEND),
+    redis=redis_client,
+    coalesce_seconds=settings.HANDICAP_COALESCE_SECONDS,
+)
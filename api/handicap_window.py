@@ -0,0 +1,126 @@
+from bisect import bisect_left, insort
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from api.handicap_math import (
+    MIN_HANDICAP_ROUNDS,
+    average_handicap,
+    sample_size,
+)
+
+HANDICAP_WINDOW_SIZE = 20
+# rounds kept beyond the window so deleting a round can backfill it without reloading history
+HANDICAP_WINDOW_CAPACITY = 2 * HANDICAP_WINDOW_SIZE
+
+
+class DifferentialWindow:
+    """
+    A User's most recent handicap differentials, most recent first.
+
+    Only the first window_size entries count towards the handicap, their differentials are
+    also kept in sorted order so the lowest-N selection never needs a sort. Entries past the
+    window, up to capacity, are a backfill buffer for when a round in the window is deleted.
+    Entries are any objects with golf_round_id, played_on and differential attributes.
+
+    A window is complete when none of the User's rounds older than its last entry are missing from
+    it. A persisted window isn't, deletes may have backfilled it after older rounds were trimmed.
+    """
+
+    def __init__(
+            self,
+            entries: Iterable = (),
+            window_size: int = HANDICAP_WINDOW_SIZE,
+            capacity: int = HANDICAP_WINDOW_CAPACITY,
+            complete: bool = True,
+    ):
+        self.window_size = window_size
+        self.capacity = capacity
+        self._keys = []
+        self._entries = []
+        self._sorted_differentials = []
+        self.complete = True
+        for entry in entries:
+            self.add(entry)
+        self.complete = complete
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> list:
+        return list(self._entries)
+
+    @property
+    def window(self) -> list:
+        return self._entries[:self.window_size]
+
+    @property
+    def is_short(self) -> bool:
+        """The window holds fewer rounds than it counts, older rounds may need to be reloaded"""
+        return len(self._entries) < self.window_size
+
+    @staticmethod
+    def _key(golf_round_id: int, played_on) -> tuple:
+        # ascending keys sort the most recent round first
+        return -played_on.toordinal(), -golf_round_id
+
+    def _remove_sorted_differential(self, differential: Decimal):
+        position = bisect_left(self._sorted_differentials, differential)
+        del self._sorted_differentials[position]
+
+    def add(self, entry) -> List:
+        """
+        Add a round to the window
+        :param: entry
+        :return: entries dropped past capacity, including entry itself if it is too old to keep or
+                 older than every entry of an incomplete window, where rounds may be missing before it
+        """
+        key = self._key(entry.golf_round_id, entry.played_on)
+        position = bisect_left(self._keys, key)
+        if position >= self.capacity or (position == len(self._entries) and not self.complete):
+            return [entry]
+
+        self._keys.insert(position, key)
+        self._entries.insert(position, entry)
+        if position < self.window_size:
+            insort(self._sorted_differentials, entry.differential)
+            if len(self._entries) > self.window_size:
+                demoted = self._entries[self.window_size]
+                self._remove_sorted_differential(demoted.differential)
+
+        dropped = self._entries[self.capacity:]
+        del self._keys[self.capacity:]
+        del self._entries[self.capacity:]
+        return dropped
+
+    def remove(self, golf_round_id: int, played_on) -> Optional[object]:
+        """
+        Remove a round from the window, backfilling from the buffer if it was counted
+        :param: golf_round_id, played_on
+        :return: the removed entry or None if the round is not in the window
+        """
+        key = self._key(golf_round_id, played_on)
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            return None
+
+        del self._keys[position]
+        removed = self._entries.pop(position)
+        if position < self.window_size:
+            self._remove_sorted_differential(removed.differential)
+            if len(self._entries) >= self.window_size:
+                promoted = self._entries[self.window_size - 1]
+                insort(self._sorted_differentials, promoted.differential)
+        return removed
+
+    def handicap_index(self) -> Optional[Decimal]:
+        """
+        :return: the handicap index of the rounds in the window or None if there are too few rounds
+        """
+        num_rounds = len(self._sorted_differentials)
+        if num_rounds < MIN_HANDICAP_ROUNDS:
+            return None
+
+        size = sample_size(num_rounds=num_rounds)
+        lowest_differentials = self._sorted_differentials[:size]
+        return round(average_handicap(lowest_differentials), 1)
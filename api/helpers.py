@@ -1,12 +1,21 @@
+import hmac
 import sys
 import logging
 from http import HTTPStatus
 from functools import wraps
 
 from flask import request, make_response, jsonify
+from flask_jwt_extended import get_jwt_identity
+from werkzeug.http import is_resource_modified
+
+from api.pagination import InvalidPageRequest, PageRequest
+from api.repositories.user_repository import user_repo
+from api.settings import settings
 
 logger = logging.getLogger(__name__)
 
+ADMIN_ROLE = 'admin'
+
 
 def requires_json_content(f):
     @wraps(f)
@@ -40,3 +49,80 @@ def throws_500_on_exception(f):
         return response
 
     return decorated
+
+
+def with_page_request(f):
+    """
+    Pass the page requested by the cursor and limit query parameters of a GET as page_request,
+    responding 400 when either can't be used to fetch a page
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        try:
+            page_request = PageRequest.from_args(request.args) if request.method == 'GET' else None
+            return f(*args, page_request=page_request, **kwargs)
+        except InvalidPageRequest as e:
+            response_body = {
+                'status': 'fail',
+                'message': str(e),
+            }
+            return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
+
+    return decorated
+
+
+def requires_admin(f):
+    """Goes after jwt_required, responds 403 unless the signed in User is an admin"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        user = user_repo.get(get_jwt_identity())
+        if user is None or user.role != ADMIN_ROLE:
+            return make_response(
+                jsonify({'status': 'fail', 'message': 'Admin access required'}),
+                HTTPStatus.FORBIDDEN,
+            )
+        return f(*args, **kwargs)
+
+    return decorated
+
+
+def requires_service_token(f):
+    """Responds 401 unless the request's Bearer token is the SERVICE_API_TOKEN other services call with"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers.get('Authorization', '')
+        expected = f'Bearer {settings.SERVICE_API_TOKEN}'
+        if settings.SERVICE_API_TOKEN is None or not hmac.compare_digest(token.encode(), expected.encode()):
+            return make_response(
+                jsonify({'status': 'fail', 'message': 'Service credentials required'}),
+                HTTPStatus.UNAUTHORIZED,
+            )
+        return f(*args, **kwargs)
+
+    return decorated
+
+
+def conditional(get_version):
+    """
+    Give a GET an ETag from get_version, called with the view's arguments, and respond 304 without
+    calling the view when the request's If-None-Match still matches it. There's no Last-Modified,
+    deleting a row doesn't move the latest time any of the rest changed.
+    :param: get_version returns the Version of the rows the view responds with
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+
+            version = get_version(*args, **kwargs)
+            if is_resource_modified(request.environ, etag=version.etag):
+                response = make_response(f(*args, **kwargs))
+            else:
+                response = make_response('', HTTPStatus.NOT_MODIFIED)
+            response.set_etag(version.etag)
+            return response
+
+        return decorated
+
+    return decorator
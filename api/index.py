@@ -2,7 +2,7 @@ from flask import Flask
 from flask_cors import CORS
 
 from api import version_info
-from api import routes, config
+from api import routes, config, query_stats
 from api.controllers.auth import jwt
 from api.database import db_session
 
@@ -13,6 +13,7 @@ def create_app(app_settings):
     flask_app.config.from_object(app_settings)
     jwt.init_app(app=flask_app)
     routes.register(flask_app)
+    query_stats.init_app(flask_app)
     return flask_app
 
 
@@ -0,0 +1,241 @@
+import abc
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, List
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+SQS_MAX_BATCH_SIZE = 10
+
+Job = namedtuple('Job', ['body', 'delay_seconds'])
+
+
+class JobQueue(abc.ABC):
+    """
+    Base class for the backends handicap recompute requests are queued on.
+
+    send() only appends to an in-memory buffer so callers never wait on the backend. A daemon
+    sender thread, started on first use so it is never inherited across a fork, drains the buffer
+    in batches of up to batch_size jobs, waiting at most flush_seconds for a batch to fill.
+    Jobs the backend fails to take are retried with backoff up to max_attempts times, then passed
+    to the on_failure handlers. Jobs still buffered when the process exits are flushed first.
+    """
+
+    def __init__(
+            self,
+            batch_size: int = SQS_MAX_BATCH_SIZE,
+            flush_seconds: float = 0.05,
+            max_pending: int = 10000,
+            max_attempts: int = 3,
+            retry_seconds: float = 0.1,
+    ):
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._max_attempts = max_attempts
+        self._retry_seconds = retry_seconds
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._sender = None
+        self._sender_lock = threading.Lock()
+        self._failure_handlers = []
+
+    def send(self, body: dict, delay_seconds: int = 0):
+        """
+        Queue a job without waiting for the backend
+        :raise: queue.Full if the backend has fallen too far behind
+        """
+        self._ensure_sender()
+        self._pending.put_nowait(Job(body=body, delay_seconds=delay_seconds))
+
+    def on_failure(self, handler: Callable[[Job], None]):
+        """Call handler with every job the backend still hasn't taken after max_attempts"""
+        self._failure_handlers.append(handler)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait for every queued job to be handed to the backend
+        :return: False if the timeout passed first
+        """
+        deadline = time.monotonic() + timeout
+        while self._pending.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _ensure_sender(self):
+        if self._sender and self._sender.is_alive():
+            return
+        with self._sender_lock:
+            if self._sender and self._sender.is_alive():
+                return
+            if self._sender is None:
+                # the sender is a daemon thread, without this jobs buffered at exit would be lost
+                atexit.register(self._flush_at_exit)
+            self._sender = threading.Thread(target=self._run_sender, name=type(self).__name__, daemon=True)
+            self._sender.start()
+
+    def _flush_at_exit(self):
+        if not self.flush():
+            logger.error(f"{self._pending.unfinished_tasks} jobs were not sent by {type(self).__name__} before exit")
+
+    def _next_batch(self) -> List[Job]:
+        batch = [self._pending.get()]
+        deadline = time.monotonic() + self._flush_seconds
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_sender(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._send_with_retries(batch)
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    def _send_with_retries(self, batch: List[Job]):
+        for attempt in range(self._max_attempts):
+            if attempt:
+                time.sleep(self._retry_seconds * 2 ** (attempt - 1))
+            try:
+                batch = self._send_batch(batch)
+            except Exception:
+                logger.exception(f"Unable to send {len(batch)} jobs with {type(self).__name__}, attempt {attempt + 1}")
+            if not batch:
+                return
+
+        for job in batch:
+            logger.error(f"Gave up sending job: {job.body} after {self._max_attempts} attempts")
+            for handler in self._failure_handlers:
+                try:
+                    handler(job)
+                except Exception:
+                    logger.exception(f"Failure handler raised for job: {job.body}")
+
+    @abc.abstractmethod
+    def _send_batch(self, batch: List[Job]) -> List[Job]:
+        """
+        Hand a batch of jobs to the backend
+        :return: the jobs the backend rejected, they are retried
+        :raise: if none of the batch was sent, it is retried
+        """
+
+
+class SqsJobQueue(JobQueue):
+
+    def __init__(self, queue_url: str, sqs_client=None, **kwargs):
+        super().__init__(**kwargs)
+        self._queue_url = queue_url
+        self._sqs_client = sqs_client
+
+    @property
+    def sqs_client(self):
+        if self._sqs_client is None:
+            self._sqs_client = boto3.client('sqs')
+        return self._sqs_client
+
+    def _send_batch(self, batch: List[Job]) -> List[Job]:
+        failed = []
+        for start in range(0, len(batch), SQS_MAX_BATCH_SIZE):
+            jobs = batch[start:start + SQS_MAX_BATCH_SIZE]
+            entries = [
+                {
+                    'Id': str(index),
+                    'MessageBody': json.dumps(job.body, default=str),
+                    'DelaySeconds': job.delay_seconds,
+                }
+                for index, job in enumerate(jobs)
+            ]
+            try:
+                sqs_resp = self.sqs_client.send_message_batch(QueueUrl=self._queue_url, Entries=entries)
+            except Exception:
+                # only this request's jobs are retried, the ones before it were sent
+                logger.exception(f"Unable to send {len(jobs)} jobs to SQS")
+                failed.extend(jobs)
+                continue
+            for failure in sqs_resp.get('Failed', []):
+                logger.warning(f"SQS rejected job: {entries[int(failure['Id'])]['MessageBody']} reason: {failure}")
+                failed.append(jobs[int(failure['Id'])])
+        return failed
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Jobs ready to run are kept in a list and delayed jobs in a sorted set scored by when they
+    are due, receive() moves due jobs onto the list before popping from it
+    """
+
+    def __init__(self, redis_client, name: str, **kwargs):
+        super().__init__(**kwargs)
+        self._redis_client = redis_client
+        self._ready_key = f'jobs:{name}'
+        self._delayed_key = f'jobs:{name}:delayed'
+
+    def _send_batch(self, batch: List[Job]) -> List[Job]:
+        now = time.time()
+        pipeline = self._redis_client.pipeline(transaction=False)
+        for job in batch:
+            body = json.dumps(job.body, default=str)
+            if job.delay_seconds:
+                pipeline.zadd(self._delayed_key, {body: now + job.delay_seconds})
+            else:
+                pipeline.rpush(self._ready_key, body)
+        pipeline.execute()
+        return []
+
+    def _promote_due_jobs(self):
+        due = self._redis_client.zrangebyscore(self._delayed_key, '-inf', time.time())
+        for body in due:
+            # only the consumer that removes a job from the sorted set gets to promote it
+            if self._redis_client.zrem(self._delayed_key, body):
+                self._redis_client.rpush(self._ready_key, body)
+
+    def receive(self, timeout: int = 1):
+        """
+        Pop the next job ready to run
+        :return: the job body or None if no job became ready before the timeout
+        """
+        self._promote_due_jobs()
+        popped = self._redis_client.blpop(self._ready_key, timeout=timeout)
+        if not popped:
+            return None
+        _, body = popped
+        return json.loads(body)
+
+
+class InProcessJobQueue(JobQueue):
+    """Runs jobs on the sender thread, for running the API locally without a queue"""
+
+    def __init__(self, handler: Callable[[dict], None], **kwargs):
+        super().__init__(**kwargs)
+        self._handler = handler
+
+    def _run(self, body: dict):
+        try:
+            self._handler(body)
+        except Exception:
+            logger.exception(f"Job failed: {body}")
+
+    def _send_batch(self, batch: List[Job]) -> List[Job]:
+        for job in batch:
+            if job.delay_seconds:
+                timer = threading.Timer(job.delay_seconds, self._run, args=(job.body,))
+                timer.daemon = True
+                timer.start()
+            else:
+                self._run(job.body)
+        return []
@@ -0,0 +1,48 @@
+"""add handicap differential window
+
+Revision ID: 3c1f5a9d2b7e
+Revises: 789bb853f8fa
+Create Date: 2026-10-18 09:12:41.522318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f5a9d2b7e'
+down_revision = '789bb853f8fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'handicap_differential',
+        sa.Column('golf_round_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('golf_course_id', sa.Integer(), nullable=False),
+        sa.Column('tee_box_id', sa.Integer(), nullable=False),
+        sa.Column('gross_score', sa.Integer(), nullable=False),
+        sa.Column('played_on', sa.Date(), nullable=False),
+        sa.Column('course_rating', sa.Numeric(), nullable=False),
+        sa.Column('slope', sa.Numeric(), nullable=False),
+        sa.Column('differential', sa.Numeric(), nullable=False),
+        sa.Column('created_ts', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['golf_round_id'], ['public.golf_round.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['public.user.id'], ),
+        sa.PrimaryKeyConstraint('golf_round_id'),
+        schema='public'
+    )
+
+    op.create_index(
+        'ix_handicap_differential_user_id_played_on',
+        'handicap_differential',
+        ['user_id', 'played_on', 'golf_round_id'],
+        schema='public'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_handicap_differential_user_id_played_on', table_name='handicap_differential', schema='public')
+    op.drop_table('handicap_differential', schema='public')
@@ -0,0 +1,43 @@
+"""add handicap history
+
+Revision ID: 5e8a2d4c7f10
+Revises: 3c1f5a9d2b7e
+Create Date: 2026-10-18 11:03:17.804211
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a2d4c7f10'
+down_revision = '3c1f5a9d2b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'handicap_history',
+        sa.Column('golf_round_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('played_on', sa.Date(), nullable=False),
+        sa.Column('differential', sa.Numeric(), nullable=False),
+        sa.Column('handicap_index', sa.Numeric(), nullable=True),
+        sa.ForeignKeyConstraint(['golf_round_id'], ['public.golf_round.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['public.user.id'], ),
+        sa.PrimaryKeyConstraint('golf_round_id'),
+        schema='public'
+    )
+
+    op.create_index(
+        'ix_handicap_history_user_id_played_on',
+        'handicap_history',
+        ['user_id', 'played_on', 'golf_round_id'],
+        schema='public'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_handicap_history_user_id_played_on', table_name='handicap_history', schema='public')
+    op.drop_table('handicap_history', schema='public')
@@ -0,0 +1,29 @@
+"""add keyset pagination indexes
+
+Revision ID: 7d3b9e1a4c62
+Revises: 5e8a2d4c7f10
+Create Date: 2026-10-18 13:40:06.118925
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7d3b9e1a4c62'
+down_revision = '5e8a2d4c7f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_golf_course_golf_club_id', 'golf_course', ['golf_club_id', 'id'], schema='public')
+    op.create_index('ix_tee_box_golf_course_id', 'tee_box', ['golf_course_id', 'id'], schema='public')
+    op.create_index('ix_hole_tee_box_id', 'hole', ['tee_box_id', 'id'], schema='public')
+    op.create_index('ix_golf_round_user_id_played_on', 'golf_round', ['user_id', 'played_on', 'id'], schema='public')
+
+
+def downgrade():
+    op.drop_index('ix_golf_round_user_id_played_on', table_name='golf_round', schema='public')
+    op.drop_index('ix_hole_tee_box_id', table_name='hole', schema='public')
+    op.drop_index('ix_tee_box_golf_course_id', table_name='tee_box', schema='public')
+    op.drop_index('ix_golf_course_golf_club_id', table_name='golf_course', schema='public')
@@ -0,0 +1,41 @@
+"""add indexes for the remaining repository lookups
+
+Revision ID: 9a4f6c2e8b31
+Revises: 7d3b9e1a4c62
+Create Date: 2026-10-18 15:02:41.530716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f6c2e8b31'
+down_revision = '7d3b9e1a4c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_handicap_user_id_active',
+        'handicap',
+        ['user_id'],
+        schema='public',
+        postgresql_where=sa.text('record_end_date IS NULL'),
+    )
+    op.create_index(
+        'ix_handicap_user_id_record_start_date',
+        'handicap',
+        ['user_id', 'record_start_date'],
+        schema='public',
+    )
+    op.create_index('ix_hole_golf_course_id', 'hole', ['golf_course_id'], schema='public')
+    op.create_index('ix_golf_round_stats_golf_round_id', 'golf_round_stats', ['golf_round_id'], schema='public')
+
+
+def downgrade():
+    op.drop_index('ix_golf_round_stats_golf_round_id', table_name='golf_round_stats', schema='public')
+    op.drop_index('ix_hole_golf_course_id', table_name='hole', schema='public')
+    op.drop_index('ix_handicap_user_id_record_start_date', table_name='handicap', schema='public')
+    op.drop_index('ix_handicap_user_id_active', table_name='handicap', schema='public')
@@ -0,0 +1,48 @@
+"""allow a single active handicap per user
+
+Revision ID: b6e1d7a3f920
+Revises: 9a4f6c2e8b31
+Create Date: 2026-10-18 16:21:09.447203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d7a3f920'
+down_revision = '9a4f6c2e8b31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # close every active handicap but the most recent one left behind by concurrent replacements
+    op.execute("""
+        UPDATE public.handicap SET record_end_date = newer.record_start_date
+        FROM public.handicap newer
+        WHERE handicap.record_end_date IS NULL
+          AND newer.record_end_date IS NULL
+          AND newer.user_id = handicap.user_id
+          AND (newer.record_start_date, newer.id) > (handicap.record_start_date, handicap.id)
+    """)
+    op.drop_index('ix_handicap_user_id_active', table_name='handicap', schema='public')
+    op.create_index(
+        'uq_handicap_user_id_active',
+        'handicap',
+        ['user_id'],
+        unique=True,
+        schema='public',
+        postgresql_where=sa.text('record_end_date IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_handicap_user_id_active', table_name='handicap', schema='public')
+    op.create_index(
+        'ix_handicap_user_id_active',
+        'handicap',
+        ['user_id'],
+        schema='public',
+        postgresql_where=sa.text('record_end_date IS NULL'),
+    )
@@ -0,0 +1,65 @@
+"""add stats totals
+
+Revision ID: d3a8c5f1e246
+Revises: b6e1d7a3f920
+Create Date: 2026-10-18 17:12:48.260931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a8c5f1e246'
+down_revision = 'b6e1d7a3f920'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stats_totals',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('period', sa.String(), nullable=False),
+        sa.Column('rounds', sa.Integer(), nullable=False),
+        sa.Column('holes', sa.Integer(), nullable=False),
+        sa.Column('putts', sa.Integer(), nullable=False),
+        sa.Column('fairways', sa.Integer(), nullable=False),
+        sa.Column('fairway_attempts', sa.Integer(), nullable=False),
+        sa.Column('greens_in_regulation', sa.Integer(), nullable=False),
+        sa.Column('up_and_downs', sa.Integer(), nullable=False),
+        sa.Column('up_and_down_attempts', sa.Integer(), nullable=False),
+        sa.Column('sand_saves', sa.Integer(), nullable=False),
+        sa.Column('sand_save_attempts', sa.Integer(), nullable=False),
+        sa.Column('touched_ts', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['public.user.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'period'),
+        schema='public'
+    )
+
+    # a golf round's stats are deleted with it, after they are taken out of the totals
+    op.drop_constraint('golf_round_stats_golf_round_id_fkey', 'golf_round_stats', schema='public', type_='foreignkey')
+    op.create_foreign_key(
+        'golf_round_stats_golf_round_id_fkey',
+        'golf_round_stats',
+        'golf_round',
+        ['golf_round_id'],
+        ['id'],
+        source_schema='public',
+        referent_schema='public',
+        ondelete='CASCADE',
+    )
+
+
+def downgrade():
+    op.drop_constraint('golf_round_stats_golf_round_id_fkey', 'golf_round_stats', schema='public', type_='foreignkey')
+    op.create_foreign_key(
+        'golf_round_stats_golf_round_id_fkey',
+        'golf_round_stats',
+        'golf_round',
+        ['golf_round_id'],
+        ['id'],
+        source_schema='public',
+        referent_schema='public',
+    )
+    op.drop_table('stats_totals', schema='public')
@@ -6,7 +6,7 @@ from werkzeug.security import (
 )
 
 from api.database import Base
-from sqlalchemy import Column, Boolean, Integer, String, Date, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Boolean, Integer, String, Date, DateTime, ForeignKey, Index, Numeric, text
 from sqlalchemy.orm import relationship
 
 DEFAULT_SCHEMA = 'public'
@@ -25,8 +25,8 @@ class User(Base):
     date_of_birth = Column(Date)
     gender = Column(String)
     role = Column(String, nullable=False, default='standard_user')
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
     handicaps = relationship('Handicap', backref='handicaps')
     profiles = relationship('Profile', backref='profiles')
 
@@ -39,7 +39,6 @@ class User(Base):
         self.phone_number = kwargs.get('phone_number')
         self.date_of_birth = kwargs.get('date_of_birth')
         self.gender = kwargs.get('gender')
-        self.role = kwargs.get('role')
         self.created_ts = kwargs.get('created_ts')
         self.touched_ts = kwargs.get('touched_ts')
 
@@ -58,18 +57,29 @@ class Profile(Base):
     user_id = Column(Integer, ForeignKey('public.user.id'), nullable=False)
     home_course = Column(String)
     dexterity = Column(String)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
 
 
 class Handicap(Base):
     __tablename__ = "handicap"
-    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    __table_args__ = (
+        # at most one active Handicap per User
+        Index(
+            'uq_handicap_user_id_active',
+            'user_id',
+            unique=True,
+            postgresql_where=text('record_end_date IS NULL'),
+            sqlite_where=text('record_end_date IS NULL'),
+        ),
+        Index('ix_handicap_user_id_record_start_date', 'user_id', 'record_start_date'),
+        {'schema': DEFAULT_SCHEMA},
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('public.user.id'), nullable=False)
     index = Column(Numeric, nullable=False)
     authorized_association = Column(String, default='USGA')
-    record_start_date = Column(DateTime, nullable=False, default=datetime.utcnow())
+    record_start_date = Column(DateTime, nullable=False, default=datetime.utcnow)
     record_end_date = Column(DateTime)
 
 
@@ -85,27 +95,33 @@ class GolfClub(Base):
     zip_code = Column(String)
     phone_number = Column(String)
     email = Column(String)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
     golf_courses = relationship('GolfCourse', backref='golf_courses')
 
 
 class GolfCourse(Base):
     __tablename__ = "golf_course"
-    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    __table_args__ = (
+        Index('ix_golf_course_golf_club_id', 'golf_club_id', 'id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     golf_club_id = Column(Integer, ForeignKey('public.golf_club.id'), nullable=False)
     name = Column(String, nullable=False)
     num_holes = Column(Integer)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
     tee_boxes = relationship('TeeBox', backref='tee_boxes')
     holes = relationship('Hole', backref='holes')
 
 
 class TeeBox(Base):
     __tablename__ = "tee_box"
-    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    __table_args__ = (
+        Index('ix_tee_box_golf_course_id', 'golf_course_id', 'id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     golf_course_id = Column(Integer, ForeignKey('public.golf_course.id'), nullable=False)
     tee_color = Column(String)
@@ -114,14 +130,18 @@ class TeeBox(Base):
     unit = Column(String, nullable=False)
     course_rating = Column(Numeric, nullable=False)
     slope = Column(Numeric, nullable=False)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
     golf_holes = relationship('Hole', backref='golf_holes')
 
 
 class Hole(Base):
     __tablename__ = "hole"
-    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    __table_args__ = (
+        Index('ix_hole_tee_box_id', 'tee_box_id', 'id'),
+        Index('ix_hole_golf_course_id', 'golf_course_id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     golf_course_id = Column(Integer, ForeignKey('public.golf_course.id'), nullable=False)
     tee_box_id = Column(Integer, ForeignKey('public.tee_box.id'), nullable=False)
@@ -131,14 +151,17 @@ class Hole(Base):
     handicap = Column(Integer, nullable=False)
     distance = Column(Integer, nullable=False)
     unit = Column(String, nullable=False)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
     round_stats = relationship('GolfRoundStats', backref='hole_round_stats')
 
 
 class GolfRound(Base):
     __tablename__ = "golf_round"
-    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    __table_args__ = (
+        Index('ix_golf_round_user_id_played_on', 'user_id', 'played_on', 'id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     golf_course_id = Column(Integer, ForeignKey('public.golf_course.id'), nullable=False)
     tee_box_id = Column(Integer, ForeignKey('public.tee_box.id'), nullable=False)
@@ -146,16 +169,60 @@ class GolfRound(Base):
     gross_score = Column(Integer, nullable=False)
     towards_handicap = Column(Boolean, nullable=False, default=True)
     played_on = Column(Date, nullable=False)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
     stats = relationship('GolfRoundStats', backref='round_stats')
 
 
+class HandicapDifferential(Base):
+    __tablename__ = "handicap_differential"
+    __table_args__ = (
+        Index('ix_handicap_differential_user_id_played_on', 'user_id', 'played_on', 'golf_round_id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
+    golf_round_id = Column(Integer, ForeignKey('public.golf_round.id'), primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey('public.user.id'), nullable=False)
+    golf_course_id = Column(Integer, nullable=False)
+    tee_box_id = Column(Integer, nullable=False)
+    gross_score = Column(Integer, nullable=False)
+    played_on = Column(Date, nullable=False)
+    course_rating = Column(Numeric, nullable=False)
+    slope = Column(Numeric, nullable=False)
+    differential = Column(Numeric, nullable=False)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    @property
+    def towards_handicap(self):
+        # only handicap eligible golf rounds are kept in the window
+        return True
+
+
+class HandicapHistory(Base):
+    __tablename__ = "handicap_history"
+    __table_args__ = (
+        Index('ix_handicap_history_user_id_played_on', 'user_id', 'played_on', 'golf_round_id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
+    golf_round_id = Column(
+        Integer,
+        ForeignKey('public.golf_round.id', ondelete='CASCADE'),
+        primary_key=True,
+        autoincrement=False,
+    )
+    user_id = Column(Integer, ForeignKey('public.user.id'), nullable=False)
+    played_on = Column(Date, nullable=False)
+    differential = Column(Numeric, nullable=False)
+    handicap_index = Column(Numeric)
+
+
 class GolfRoundStats(Base):
     __tablename__ = "golf_round_stats"
-    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    __table_args__ = (
+        Index('ix_golf_round_stats_golf_round_id', 'golf_round_id'),
+        {'schema': DEFAULT_SCHEMA},
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    golf_round_id = Column(Integer, ForeignKey('public.golf_round.id'), nullable=False)
+    golf_round_id = Column(Integer, ForeignKey('public.golf_round.id', ondelete='CASCADE'), nullable=False)
     hole_id = Column(Integer, ForeignKey('public.hole.id'), nullable=False)
     gross_score = Column(Integer, nullable=False)
     fairway_hit = Column(Boolean)
@@ -164,5 +231,24 @@ class GolfRoundStats(Base):
     chips = Column(Integer, nullable=False, default=0)
     greenside_sand_shots = Column(Integer, nullable=False, default=0)
     penalties = Column(Integer, nullable=False, default=0)
-    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow())
-    touched_ts = Column(DateTime)
+    created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
+
+
+class StatsTotals(Base):
+    __tablename__ = "stats_totals"
+    __table_args__ = {'schema': DEFAULT_SCHEMA}
+    user_id = Column(Integer, ForeignKey('public.user.id'), primary_key=True, autoincrement=False)
+    # 'career', or the year of a season
+    period = Column(String, primary_key=True)
+    rounds = Column(Integer, nullable=False, default=0)
+    holes = Column(Integer, nullable=False, default=0)
+    putts = Column(Integer, nullable=False, default=0)
+    fairways = Column(Integer, nullable=False, default=0)
+    fairway_attempts = Column(Integer, nullable=False, default=0)
+    greens_in_regulation = Column(Integer, nullable=False, default=0)
+    up_and_downs = Column(Integer, nullable=False, default=0)
+    up_and_down_attempts = Column(Integer, nullable=False, default=0)
+    sand_saves = Column(Integer, nullable=False, default=0)
+    sand_save_attempts = Column(Integer, nullable=False, default=0)
+    touched_ts = Column(DateTime, onupdate=datetime.utcnow)
@@ -0,0 +1,222 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import bindparam, tuple_
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+# rows fetched per round trip from the server side cursor of a streamed page
+STREAM_CHUNK_SIZE = 500
+STREAM_FORMATS = ('json', 'ndjson')
+
+Page = namedtuple('Page', ['items', 'next_cursor'])
+
+
+class InvalidPageRequest(ValueError):
+    """A cursor or limit query parameter that can't be used to fetch a page"""
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor"""
+    payload = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    """
+    Decode a cursor back into the sort key of the row it points after
+    :raise: InvalidPageRequest if the cursor wasn't created for these columns
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidPageRequest(f"Invalid cursor: '{cursor}'")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidPageRequest(f"Invalid cursor: '{cursor}'")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            else:
+                value = python_type(value)
+        except (TypeError, ValueError):
+            raise InvalidPageRequest(f"Invalid cursor: '{cursor}'")
+        decoded.append(value)
+    return decoded
+
+
+class PageRequest:
+    """
+    The page of a collection to fetch, a streamed page holds the same rows
+    but they're serialized as they're read rather than all at once
+    """
+
+    def __init__(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT, stream: Optional[str] = None):
+        self.cursor = cursor
+        self.limit = limit
+        self.stream = stream
+
+    @classmethod
+    def from_args(cls, args) -> 'PageRequest':
+        """
+        Read the cursor, limit and stream query parameters
+        :raise: InvalidPageRequest if limit isn't between 1 and MAX_PAGE_LIMIT or stream isn't a STREAM_FORMATS
+        """
+        stream = args.get('stream') or None
+        if stream is not None and stream not in STREAM_FORMATS:
+            raise InvalidPageRequest(f"stream must be one of {', '.join(STREAM_FORMATS)}, got: '{stream}'")
+        limit = args.get('limit', DEFAULT_PAGE_LIMIT)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise InvalidPageRequest(f"limit must be an integer, got: '{limit}'")
+        if not 1 <= limit <= MAX_PAGE_LIMIT:
+            raise InvalidPageRequest(f"limit must be between 1 and {MAX_PAGE_LIMIT}, got: {limit}")
+        return cls(cursor=args.get('cursor') or None, limit=limit, stream=stream)
+
+
+def paginate(query, order_by: Sequence, page_request: PageRequest = None, descending: bool = False) -> Page:
+    """
+    Fetch one page of a query by seeking past the sort key of the previous page's last row,
+    so a deep page costs the same as the first given an index on the filter and sort columns
+    :param: query
+    :param: order_by columns that uniquely order the rows, ending in the primary key
+    :param: page_request None to fetch every row as a single page
+    :param: descending sort every column descending rather than ascending
+    :return: Page of items and the cursor of the next page, None on the last page,
+             the items of a streamed page are a lazy iterator over a server side cursor
+    """
+    query = page_query(query, order_by, page_request=page_request, descending=descending)
+    if page_request is None:
+        return Page(items=query.all(), next_cursor=None)
+
+    if page_request.stream:
+        stream_end = query.with_entities(*order_by).offset(page_request.limit - 1).limit(2)
+        last = _stream_last_key(stream_end.all())
+        # page_query's extra row is only needed to find the next page, which is already known
+        query = query.limit(None)
+        if last is not None:
+            query = query.filter(_through(order_by, last, descending))
+        return Page(
+            items=query.limit(page_request.limit).yield_per(STREAM_CHUNK_SIZE),
+            next_cursor=encode_cursor(last) if last is not None else None,
+        )
+
+    return _page(query.all(), order_by, page_request)
+
+
+def page_query(query, order_by: Sequence, page_request: PageRequest = None, descending: bool = False):
+    """
+    Narrow a query to the rows of one page without running it, including the row after the page
+    that tells whether there's a next one. paginate takes the same arguments.
+    :raise: InvalidPageRequest if the cursor wasn't created for order_by
+    """
+    query = query.order_by(*_sort_columns(order_by, descending))
+    if page_request is None:
+        return query
+
+    if page_request.cursor:
+        after = decode_cursor(page_request.cursor, order_by)
+        query = query.filter(_seek(order_by, after, descending))
+
+    return query.limit(page_request.limit + 1)
+
+
+def paginate_baked(
+    baked_query, session, order_by: Sequence, page_request: PageRequest = None, descending: bool = False, **params
+) -> Page:
+    """
+    paginate a BakedQuery, the cursor and limit are bound parameters so every page shares one compiled statement
+    :param: baked_query
+    :param: session the Session to run it in
+    :param: order_by columns that uniquely order the rows, ending in the primary key
+    :param: page_request None to fetch every row as a single page
+    :param: descending sort every column descending rather than ascending
+    :param: params values of the bound parameters in baked_query
+    :return: Page of items and the cursor of the next page, None on the last page,
+             the items of a streamed page are a lazy iterator over a server side cursor
+    """
+    order_by = tuple(order_by)
+    baked_query = baked_query.with_criteria(
+        lambda q: q.order_by(*_sort_columns(order_by, descending)), order_by, descending,
+    )
+    if page_request is None:
+        return Page(items=baked_query(session).params(**params).all(), next_cursor=None)
+
+    if page_request.cursor:
+        after = decode_cursor(page_request.cursor, order_by)
+        params.update({f'cursor_{position}': value for position, value in enumerate(after)})
+        baked_query = baked_query.with_criteria(
+            lambda q: q.filter(_seek(order_by, [
+                bindparam(f'cursor_{position}', type_=column.type) for position, column in enumerate(order_by)
+            ], descending)),
+            order_by,
+            descending,
+        )
+
+    if page_request.stream:
+        stream_end = baked_query.with_criteria(
+            lambda q: q.with_entities(*order_by).offset(bindparam('page_offset')).limit(2), order_by,
+        )
+        last = _stream_last_key(stream_end(session).params(page_offset=page_request.limit - 1, **params).all())
+        if last is not None:
+            params.update({f'through_{position}': value for position, value in enumerate(last)})
+            baked_query = baked_query.with_criteria(
+                lambda q: q.filter(_through(order_by, [
+                    bindparam(f'through_{position}', type_=column.type) for position, column in enumerate(order_by)
+                ], descending)),
+                order_by,
+                descending,
+            )
+        chunk_size = STREAM_CHUNK_SIZE
+        baked_query = baked_query.with_criteria(
+            lambda q: q.limit(bindparam('page_limit')).yield_per(chunk_size), chunk_size,
+        )
+        return Page(
+            items=baked_query(session).params(page_limit=page_request.limit, **params),
+            next_cursor=encode_cursor(last) if last is not None else None,
+        )
+
+    baked_query = baked_query.with_criteria(lambda q: q.limit(bindparam('page_limit')))
+    items = baked_query(session).params(page_limit=page_request.limit + 1, **params).all()
+    return _page(items, order_by, page_request)
+
+
+def _sort_columns(order_by: Sequence, descending: bool) -> list:
+    return [column.desc() if descending else column for column in order_by]
+
+
+def _seek(order_by: Sequence, after: Sequence, descending: bool):
+    sort_key = tuple_(*order_by)
+    return sort_key < tuple_(*after) if descending else sort_key > tuple_(*after)
+
+
+def _through(order_by: Sequence, last: Sequence, descending: bool):
+    sort_key = tuple_(*order_by)
+    return sort_key >= tuple_(*last) if descending else sort_key <= tuple_(*last)
+
+
+def _stream_last_key(sort_keys: list) -> Optional[tuple]:
+    # a streamed page can't look past its last row before it's sent, so the sort keys
+    # of that row and the one after it are read up front to tell whether there's a next page
+    if len(sort_keys) < 2:
+        return None
+    return tuple(sort_keys[0])
+
+
+def _page(items: list, order_by: Sequence, page_request: PageRequest) -> Page:
+    if len(items) <= page_request.limit:
+        return Page(items=items, next_cursor=None)
+
+    items = items[:page_request.limit]
+    last = items[-1]
+    return Page(items=items, next_cursor=encode_cursor([getattr(last, column.key) for column in order_by]))
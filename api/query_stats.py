@@ -0,0 +1,106 @@
+"""
+Counts the SQL statements each request runs and the time spent in them, logging the totals and,
+with QUERY_STATS_HEADERS set, returning them as response headers. A statement that runs
+REPEATED_STATEMENT_THRESHOLD or more times in one request is logged as a likely N+1, and one
+that takes SLOW_QUERY_SECONDS or longer is handed to slow_queries.
+"""
+import json
+import logging
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from flask import Flask, Response, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api import slow_queries
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+QUERY_TIME_HEADER = 'X-Query-Time-Ms'
+REPEATED_STATEMENT_THRESHOLD = 5
+_START_TIMES_KEY = 'query_stats_start_times'
+
+
+class QueryStats:
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int = REPEATED_STATEMENT_THRESHOLD) -> Dict[str, int]:
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return g.get('query_stats') if has_app_context() else None
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info[_START_TIMES_KEY].pop()
+    query_stats = current_query_stats()
+    if query_stats is not None:
+        query_stats.record(statement, seconds)
+    if seconds >= settings.SLOW_QUERY_SECONDS:
+        slow_queries.capture(conn, statement, parameters, executemany, seconds)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _discard_timer(exception_context):
+    start_times = exception_context.connection.info.get(_START_TIMES_KEY) if exception_context.connection else None
+    if start_times:
+        start_times.pop()
+
+
+def _start_query_stats():
+    g.query_stats = QueryStats()
+
+
+def _report_query_stats(response: Response) -> Response:
+    query_stats = current_query_stats()
+    if query_stats is None:
+        return response
+
+    # a streamed body runs its queries after this, so they aren't included
+    db_ms = round(query_stats.seconds * 1000, 2)
+    logger.info(json.dumps({
+        'event': 'request_queries',
+        'method': request.method,
+        'endpoint': request.endpoint,
+        'path': request.path,
+        'status': response.status_code,
+        'queries': query_stats.count,
+        'db_ms': db_ms,
+    }))
+    for statement, count in query_stats.repeated_statements().items():
+        logger.warning(json.dumps({
+            'event': 'repeated_statement',
+            'endpoint': request.endpoint,
+            'path': request.path,
+            'count': count,
+            'statement': statement,
+        }))
+    if settings.QUERY_STATS_HEADERS:
+        response.headers[QUERY_COUNT_HEADER] = str(query_stats.count)
+        response.headers[QUERY_TIME_HEADER] = str(db_ms)
+    return response
+
+
+def init_app(app: Flask):
+    app.before_request(_start_query_stats)
+    app.after_request(_report_query_stats)
@@ -0,0 +1,8 @@
+import redis
+
+from api.settings import settings
+
+redis_client = redis.StrictRedis.from_url(
+    url=settings.REDIS_URI,
+    decode_responses=True
+)
@@ -1,9 +1,33 @@
+import csv
+import io
+from contextlib import contextmanager
 from typing import List, Type, TypeVar
 
+from marshmallow import Schema
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.ext import baked
+from sqlalchemy.orm import Session, scoped_session
+
 from api.database import db_session, Base
+from api.pagination import Page, PageRequest, page_query, paginate
+from api.repositories.loading import schema_loading_key, schema_loading_options
+from api.repositories.versions import Version, get_version
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# batches at least this large are loaded with COPY rather than a multi-row INSERT
+BULK_COPY_THRESHOLD = 1000
+COPY_NULL = r'\N'
+TRANSACTION_DEPTH_KEY = 'transaction_depth'
+# the Query objects and compiled SQL of baked queries, shared by every repository
+bakery = baked.bakery()
+
+
+def _default_value(default):
+    if default is None:
+        return None
+    return default.arg if default.is_scalar else default.arg(None)
+
 
 class BaseRepository:
 
@@ -11,36 +35,206 @@ class BaseRepository:
         self.model = model
         self.db_session = db_session
 
-    def get(self, model_id):
-        return self.db_session.query(self.model).filter(self.model.id == model_id).first()
+    def query(self, schema: Schema = None):
+        """
+        Start a query on the model, eager loading the relationships schema nests
+        :param: schema the schema the results will be dumped with, if any
+        """
+        query = self.db_session.query(self.model)
+        if schema is not None:
+            query = query.options(*schema_loading_options(self.model, schema))
+        return query
+
+    def baked_query(self, schema: Schema = None) -> baked.BakedQuery:
+        """
+        Start a query on the model that is built and compiled once, then reused with new bound parameters.
+        The model and schema are part of the cache key, so criteria added after may refer to self.model
+        but everything else that varies between calls has to be a bindparam or a cache key argument.
+        :param: schema the schema the results will be dumped with, if any
+        """
+        baked_query = bakery(lambda session: session.query(self.model), self.model)
+        if schema is not None:
+            options = schema_loading_options(self.model, schema)
+            baked_query += (lambda q: q.options(*options), schema_loading_key(self.model, schema))
+        return baked_query
+
+    def session(self) -> Session:
+        # a baked query has to run in the Session itself rather than the scoped_session proxying it
+        if isinstance(self.db_session, scoped_session):
+            return self.db_session()
+        return self.db_session
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit the writes of every repository call made inside the block together, or roll them
+        all back if it raises. Repositories share the session, so the block can span several.
+        """
+        info = self.db_session.info
+        info[TRANSACTION_DEPTH_KEY] = info.get(TRANSACTION_DEPTH_KEY, 0) + 1
+        # only the outermost block ends the session transaction, an inner block's error
+        # rolls everything back once it propagates out there
+        outermost = info[TRANSACTION_DEPTH_KEY] == 1
+        try:
+            yield
+            if outermost:
+                self.db_session.commit()
+        except Exception:
+            if outermost:
+                self.db_session.rollback()
+            raise
+        finally:
+            info[TRANSACTION_DEPTH_KEY] -= 1
+
+    def _commit(self):
+        # inside a transaction block the write is only flushed, so generated ids are still assigned
+        if self.db_session.info.get(TRANSACTION_DEPTH_KEY):
+            self.db_session.flush()
+        else:
+            self.db_session.commit()
+
+    def get(self, model_id, schema: Schema = None):
+        baked_query = self.baked_query(schema)
+        baked_query += lambda q: q.filter(self.model.id == bindparam('model_id'))
+        return baked_query(self.session()).params(model_id=model_id).first()
+
+    def get_all(self, schema: Schema = None, page_request: PageRequest = None) -> Page:
+        return paginate(self.query(schema), order_by=[self.model.id], page_request=page_request)
+
+    def get_by_ids(self, ids: List[int], schema: Schema = None):
+        return self.query(schema).filter(self.model.id.in_(ids)).all()
 
-    def get_all(self):
-        return self.db_session.query(self.model).all()
+    def get_version(self, model_ids: List[int], schema: Schema = None) -> Version:
+        """
+        Fingerprint records and whatever schema nests under them without loading any of them
+        :param: model_ids
+        :param: schema the schema the records are dumped with, if any
+        :return: Version
+        """
+        return get_version(self.db_session, self.model, ids=model_ids, schema=schema)
 
-    def get_by_ids(self, ids: List[int]):
-        return self.db_session.query(self.model).filter(self.model.id.in_(ids)).all()
+    def get_all_version(self, schema: Schema = None, page_request: PageRequest = None) -> Version:
+        return self._get_page_version(criteria=[], order_by=[self.model.id], schema=schema, page_request=page_request)
+
+    def _get_page_version(
+            self,
+            criteria: list,
+            order_by: list,
+            schema: Schema = None,
+            page_request: PageRequest = None,
+            descending: bool = False,
+    ) -> Version:
+        """
+        Fingerprint the page paginate fetches for a query with criteria and the same arguments
+        :raise: InvalidPageRequest if the cursor wasn't created for order_by
+        """
+        page = page_query(
+            self.db_session.query(self.model.id).filter(*criteria),
+            order_by=order_by,
+            page_request=page_request,
+            descending=descending,
+        ).subquery()
+        return get_version(self.db_session, self.model, ids=select([page.c.id]), schema=schema)
 
     def create(self, data: dict):
         model_obj = self.model(**data)
         self.db_session.add(model_obj)
-        self.db_session.commit()
-        self.db_session.refresh(model_obj)
+        self._commit()
         return model_obj
 
-    def bulk_create(self, records: List[dict]):
-        model_objs = [self.model(**record) for record in records]
-        self.db_session.add_all(model_objs)
-        self.db_session.commit()
-        return model_objs
+    def _with_defaults(self, records: List[dict]) -> List[dict]:
+        """
+        Give every record the same keys, in column order, filling in the Python side column
+        defaults that the ORM would otherwise have applied to each record missing the key
+        """
+        keys = {key for record in records for key in record}
+        columns = []
+        for column in self.model.__table__.columns:
+            default = column.default
+            if default is not None and (default.is_scalar or default.is_callable):
+                columns.append((column.key, default))
+            elif column.key in keys:
+                columns.append((column.key, None))
+        return [
+            {
+                key: record[key] if key in record else _default_value(default)
+                for key, default in columns
+            }
+            for record in records
+        ]
+
+    def _copy(self, connection, rows: List[dict]) -> list:
+        preparer = connection.dialect.identifier_preparer
+        table = preparer.format_table(self.model.__table__)
+        staging = preparer.quote(f'bulk_create_{self.model.__table__.name}')
+        columns = list(rows[0])
+        column_list = ', '.join(preparer.quote(column) for column in columns)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([COPY_NULL if row[column] is None else row[column] for column in columns])
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f'CREATE TEMPORARY TABLE {staging} AS SELECT {column_list} FROM {table} WITH NO DATA')
+            cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buffer)
+        finally:
+            cursor.close()
+        inserted = connection.execute(text(
+            f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} RETURNING *'
+        )).fetchall()
+        connection.execute(text(f'DROP TABLE {staging}'))
+        return inserted
+
+    def bulk_create(self, records: List[dict]) -> list:
+        """
+        Insert records with a single multi-row INSERT ... RETURNING, or with COPY once there are
+        BULK_COPY_THRESHOLD of them, so the returned rows can be dumped without being reloaded.
+        Databases other than Postgres add the records through the ORM.
+        :param: records
+        :return: list of rows with every column, including generated ids and defaults
+        """
+        if not records:
+            return []
+
+        table = self.model.__table__
+        insert = table.insert()
+        connection = self.db_session.connection(clause=insert)
+        if connection.dialect.name != 'postgresql':
+            model_objs = [self.model(**record) for record in records]
+            self.db_session.add_all(model_objs)
+            self._commit()
+            return model_objs
+
+        rows = self._with_defaults(records)
+        if len(rows) >= BULK_COPY_THRESHOLD:
+            inserted = self._copy(connection, rows)
+        else:
+            inserted = connection.execute(insert.values(rows).returning(*table.columns)).fetchall()
+        self._commit()
+        return inserted
 
     def update(self, data: dict):
-        model_obj = self.model(**data)
-        self.db_session.merge(model_obj)
-        self.db_session.commit()
-        self.db_session.refresh(model_obj)
+        # only loads the record if it isn't already in the session
+        model_obj = self.db_session.query(self.model).get(data['id'])
+        for key, value in data.items():
+            setattr(model_obj, key, value)
+        self._commit()
+        return model_obj
+
+    def save(self, model_obj):
+        """
+        Write the changes made to a record
+        :param: model_obj
+        :return: the record, still loaded
+        """
+        self.db_session.add(model_obj)
+        self._commit()
         return model_obj
 
     def delete(self, model_id) -> bool:
         is_deleted = self.db_session.query(self.model).filter(self.model.id == model_id).delete()
-        self.db_session.commit()
+        self._commit()
         return is_deleted
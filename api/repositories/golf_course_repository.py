@@ -1,18 +1,51 @@
-from typing import List
+from marshmallow import Schema
 
+from api.pagination import Page, PageRequest, paginate
 from api.repositories.base_repository import BaseRepository
+from api.repositories.versions import Version
 from api.models import GolfCourse
 
 
 class GolfCourseRepository(BaseRepository):
 
-    def get_by_golf_club_id(self, golf_club_id: int) -> List[GolfCourse]:
+    def get_by_golf_club_id(
+            self,
+            golf_club_id: int,
+            schema: Schema = None,
+            page_request: PageRequest = None,
+    ) -> Page:
         """
         Filter a GolfCourse by GolfClub id.
         :param: golf_course_id
-        :return: List(GolfCourse) or empty list
+        :param: schema eager load the relationships this schema nests
+        :param: page_request the page to fetch, every GolfCourse when None
+        :return: Page(GolfCourse)
         """
-        return self.db_session.query(self.model).filter_by(golf_club_id=golf_club_id).all()
+        return paginate(
+            self.query(schema).filter_by(golf_club_id=golf_club_id),
+            order_by=[self.model.id],
+            page_request=page_request,
+        )
+
+    def get_version_by_golf_club_id(
+            self,
+            golf_club_id: int,
+            schema: Schema = None,
+            page_request: PageRequest = None,
+    ) -> Version:
+        """
+        Fingerprint the page get_by_golf_club_id fetches without loading it
+        :param: golf_club_id
+        :param: schema fingerprint the relationships this schema nests too
+        :param: page_request
+        :return: Version
+        """
+        return self._get_page_version(
+            criteria=[self.model.golf_club_id == golf_club_id],
+            order_by=[self.model.id],
+            schema=schema,
+            page_request=page_request,
+        )
 
 
 golf_course_repo = GolfCourseRepository(model=GolfCourse)
@@ -1,18 +1,141 @@
-from typing import List
+from datetime import date
+from typing import List, Optional, Tuple
 
+from marshmallow import Schema
+from sqlalchemy import bindparam, func
+
+from api.handicap_window import HANDICAP_WINDOW_SIZE
+from api.pagination import Page, PageRequest, paginate_baked
 from api.repositories.base_repository import BaseRepository
-from api.models import GolfRound
+from api.repositories.versions import Version
+from api.models import GolfRound, TeeBox
 
 
 class GolfRoundRepository(BaseRepository):
 
-    def get_by_user_id(self, user_id: int) -> List[GolfRound]:
+    def get_by_user_id(self, user_id: int, schema: Schema = None, page_request: PageRequest = None) -> Page:
+        """
+        Retrieve GolfRound records by User id, most recent first
+        :param: user_id
+        :param: schema eager load the relationships this schema nests
+        :param: page_request the page to fetch, every GolfRound when None
+        :return: Page(GolfRound)
+        """
+        baked_query = self.baked_query(schema)
+        baked_query += lambda q: q.filter(self.model.user_id == bindparam('user_id'))
+        return paginate_baked(
+            baked_query,
+            self.session(),
+            order_by=[self.model.played_on, self.model.id],
+            page_request=page_request,
+            descending=True,
+            user_id=user_id,
+        )
+
+    def get_version_by_user_id(self, user_id: int, schema: Schema = None, page_request: PageRequest = None) -> Version:
         """
-        Retrieve all GolfRound records by User id
+        Fingerprint the page get_by_user_id fetches without loading it
         :param: user_id
-        :return: List(GolfRound) or empty list
+        :param: schema fingerprint the relationships this schema nests too
+        :param: page_request
+        :return: Version
+        """
+        return self._get_page_version(
+            criteria=[self.model.user_id == user_id],
+            order_by=[self.model.played_on, self.model.id],
+            schema=schema,
+            page_request=page_request,
+            descending=True,
+        )
+
+    def _handicap_rounds_query(self, user_id: int):
+        return self.db_session.query(
+            self.model.id,
+            self.model.golf_course_id,
+            self.model.tee_box_id,
+            self.model.user_id,
+            self.model.gross_score,
+            self.model.towards_handicap,
+            self.model.played_on,
+            TeeBox.course_rating,
+            TeeBox.slope,
+        ).join(TeeBox, TeeBox.id == self.model.tee_box_id)\
+            .filter(self.model.user_id == user_id)\
+            .filter(self.model.towards_handicap.is_(True))
+
+    def get_handicap_window(
+            self,
+            user_id: int,
+            window_size: int = HANDICAP_WINDOW_SIZE,
+            played_before: date = None,
+    ) -> list:
+        """
+        Retrieve a User's most recent handicap eligible GolfRounds joined to the TeeBox they were played from
+        :param: user_id, window_size
+        :param: played_before only consider GolfRounds played before this date
+        :return: List of rows with the GolfRound columns plus course_rating and slope, most recent first
         """
-        return self.db_session.query(self.model).filter_by(user_id=user_id).order_by(GolfRound.played_on.desc()).all()
+        query = self._handicap_rounds_query(user_id=user_id)
+        if played_before:
+            query = query.filter(self.model.played_on < played_before)
+        return query.order_by(self.model.played_on.desc(), self.model.id.desc())\
+            .limit(window_size)\
+            .all()
+
+    def get_handicap_rounds(self, user_id: int, played_on_from: date = None) -> list:
+        """
+        Retrieve a User's handicap eligible GolfRounds joined to the TeeBox they were played from
+        :param: user_id
+        :param: played_on_from only consider GolfRounds played on or after this date
+        :return: List of rows with the GolfRound columns plus course_rating and slope, oldest first
+        """
+        query = self._handicap_rounds_query(user_id=user_id)
+        if played_on_from:
+            query = query.filter(self.model.played_on >= played_on_from)
+        return query.order_by(self.model.played_on, self.model.id).all()
+
+    def get_user_ids(self) -> List[int]:
+        """
+        Retrieve the id of every User that has recorded a GolfRound
+        :return: List(int) or empty list
+        """
+        return [user_id for user_id, in self.db_session.query(self.model.user_id).distinct().order_by(self.model.user_id)]
+
+    def get_user_id_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Retrieve the lowest and highest User id that has recorded a GolfRound
+        :return: (min_user_id, max_user_id) or (None, None)
+        """
+        return self.db_session.query(func.min(self.model.user_id), func.max(self.model.user_id)).one()
+
+    def get_handicap_windows(self, min_user_id: int, max_user_id: int, window_size: int = HANDICAP_WINDOW_SIZE) -> list:
+        """
+        Retrieve the most recent handicap eligible GolfRounds, joined to the TeeBox they
+        were played from, for every User in a range of User ids with a single windowed query
+        :param: min_user_id, max_user_id, window_size
+        :return: List of rows (user_id, golf_round_id, gross_score, course_rating, slope, recency)
+                 ordered by user_id and then most recent first
+        """
+        recency = func.row_number().over(
+            partition_by=self.model.user_id,
+            order_by=(self.model.played_on.desc(), self.model.id.desc()),
+        ).label('recency')
+        windowed_rounds = self.db_session.query(
+            self.model.user_id,
+            self.model.id.label('golf_round_id'),
+            self.model.gross_score,
+            TeeBox.course_rating,
+            TeeBox.slope,
+            recency,
+        ).join(TeeBox, TeeBox.id == self.model.tee_box_id)\
+            .filter(self.model.towards_handicap.is_(True))\
+            .filter(self.model.user_id.between(min_user_id, max_user_id))\
+            .subquery()
+
+        return self.db_session.query(windowed_rounds)\
+            .filter(windowed_rounds.c.recency <= window_size)\
+            .order_by(windowed_rounds.c.user_id, windowed_rounds.c.recency)\
+            .all()
 
 
 golf_round_repo = GolfRoundRepository(model=GolfRound)
@@ -1,7 +1,13 @@
 from typing import List
 
+from sqlalchemy import and_, case, func
+
 from api.repositories.base_repository import BaseRepository
-from api.models import GolfRoundStats
+from api.models import GolfRound, GolfRoundStats, Hole
+
+
+def count_where(condition):
+    return func.sum(case([(condition, 1)], else_=0))
 
 
 class GolfRoundStatsRepository(BaseRepository):
@@ -14,5 +20,30 @@ class GolfRoundStatsRepository(BaseRepository):
         """
         return self.db_session.query(self.model).filter_by(golf_round_id=golf_round_id).all()
 
+    def get_summaries_by_user_id(self, user_id: int, num_holes: int = 18) -> list:
+        """
+        Total up the GolfRoundStats of every GolfRound a User has stats for on all num_holes holes,
+        in a single aggregate query
+        :param: user_id
+        :param: num_holes
+        :return: List of rows with golf_round_id, putts, fairways, greens_in_regulation,
+            up_and_downs and sand_saves
+        """
+        stats = self.model
+        saved_par = and_(stats.gross_score == Hole.par, stats.putts == 1)
+        return self.db_session.query(
+            stats.golf_round_id,
+            func.sum(stats.putts).label('putts'),
+            count_where(stats.fairway_hit.is_(True)).label('fairways'),
+            count_where(stats.green_in_regulation.is_(True)).label('greens_in_regulation'),
+            count_where(and_(saved_par, stats.chips == 1)).label('up_and_downs'),
+            count_where(and_(saved_par, stats.greenside_sand_shots == 1)).label('sand_saves'),
+        ).join(GolfRound, GolfRound.id == stats.golf_round_id)\
+            .join(Hole, Hole.id == stats.hole_id)\
+            .filter(GolfRound.user_id == user_id)\
+            .group_by(stats.golf_round_id)\
+            .having(func.count() == num_holes)\
+            .all()
+
 
 golf_round_stats_repo = GolfRoundStatsRepository(model=GolfRoundStats)
@@ -0,0 +1,46 @@
+from typing import List
+
+from api.repositories.base_repository import BaseRepository
+from api.models import HandicapDifferential
+
+
+class HandicapDifferentialRepository(BaseRepository):
+
+    def get_by_user_id(self, user_id: int, limit: int) -> List[HandicapDifferential]:
+        """
+        Retrieve a User's persisted handicap window, most recent first
+        :param: user_id, limit
+        :return: List(HandicapDifferential) or empty list
+        """
+        return self.db_session.query(self.model)\
+            .filter(self.model.user_id == user_id)\
+            .order_by(self.model.played_on.desc(), self.model.golf_round_id.desc())\
+            .limit(limit)\
+            .all()
+
+    def apply(self, added: List[HandicapDifferential], removed_golf_round_ids: List[int]):
+        """
+        Persist an incremental change to a User's handicap window in one transaction
+        :param: added HandicapDifferential records entering the window
+        :param: removed_golf_round_ids GolfRound ids leaving the window
+        """
+        if removed_golf_round_ids:
+            self.db_session.query(self.model)\
+                .filter(self.model.golf_round_id.in_(removed_golf_round_ids))\
+                .delete(synchronize_session=False)
+        self.db_session.add_all(added)
+        self._commit()
+
+    def replace_for_user(self, user_id: int, entries: List[HandicapDifferential]) -> List[HandicapDifferential]:
+        """
+        Replace a User's whole handicap window in one transaction
+        :param: user_id, entries
+        :return: List(HandicapDifferential)
+        """
+        self.db_session.query(self.model).filter(self.model.user_id == user_id).delete(synchronize_session=False)
+        self.db_session.add_all(entries)
+        self._commit()
+        return entries
+
+
+handicap_differential_repo = HandicapDifferentialRepository(model=HandicapDifferential)
@@ -0,0 +1,51 @@
+from datetime import date
+from typing import List
+
+from api.pagination import Page, PageRequest, paginate
+from api.repositories.base_repository import BaseRepository
+from api.models import HandicapHistory
+
+
+class HandicapHistoryRepository(BaseRepository):
+
+    def get_range(
+            self,
+            user_id: int,
+            start_date: date = None,
+            end_date: date = None,
+            page_request: PageRequest = None,
+    ) -> Page:
+        """
+        Retrieve a User's handicap history between two dates, inclusive
+        :param: user_id, start_date, end_date
+        :param: page_request the page to fetch, the whole range when None
+        :return: Page(HandicapHistory) oldest first
+        """
+        query = self.db_session.query(self.model).filter(self.model.user_id == user_id)
+        if start_date:
+            query = query.filter(self.model.played_on >= start_date)
+        if end_date:
+            query = query.filter(self.model.played_on <= end_date)
+        return paginate(
+            query,
+            order_by=[self.model.played_on, self.model.golf_round_id],
+            page_request=page_request,
+        )
+
+    def replace_from(self, user_id: int, entries: List[HandicapHistory], played_on_from: date = None) -> int:
+        """
+        Replace a User's handicap history from a date onwards in one transaction
+        :param: user_id, entries
+        :param: played_on_from replace the whole history when None
+        :return: number of HandicapHistory records written
+        """
+        query = self.db_session.query(self.model).filter(self.model.user_id == user_id)
+        if played_on_from:
+            query = query.filter(self.model.played_on >= played_on_from)
+        query.delete(synchronize_session=False)
+        self.db_session.add_all(entries)
+        self._commit()
+        return len(entries)
+
+
+handicap_history_repo = HandicapHistoryRepository(model=HandicapHistory)
@@ -1,23 +1,98 @@
 from datetime import datetime
-from typing import List
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import bindparam
 
 from api.repositories.base_repository import BaseRepository
-from api.models import Handicap
+from api.models import Handicap, User
 
 
 class HandicapRepository(BaseRepository):
 
-    def close(self, model_obj: Handicap):
+    def bulk_replace(self, indexes: Dict[int, Decimal], authorized_association: str = 'USGA') -> int:
+        """
+        Close out the active Handicap of every User in indexes and insert their new Handicap,
+        using one UPDATE and one multi-row INSERT inside a single transaction. The Users are locked
+        first, so concurrent replacements for a User run one after the other and each one's UPDATE
+        sees the Handicap the previous one inserted. The unique index on active Handicaps rejects
+        any writer that skips the lock.
+        :param: indexes mapping of user_id to new handicap index
+        :param: authorized_association
+        :return: number of Handicap records inserted
+        """
+        if not indexes:
+            return 0
+
+        self._lock_users(user_ids=list(indexes))
+        now = datetime.now()
+        self._close_active(user_ids=list(indexes), now=now)
+        new_handicaps = [
+            {
+                'user_id': user_id,
+                'index': index,
+                'authorized_association': authorized_association,
+                'record_start_date': now,
+            }
+            for user_id, index in indexes.items()
+        ]
+        self.db_session.execute(self.model.__table__.insert().values(new_handicaps))
+        self._commit()
+        return len(new_handicaps)
+
+    def _lock_users(self, user_ids: List[int]):
+        # locked in id order so overlapping bulk replacements can't deadlock
+        self.db_session.query(User.id)\
+            .filter(User.id.in_(user_ids))\
+            .order_by(User.id)\
+            .with_for_update(key_share=True)\
+            .all()
+
+    def _close_active(self, user_ids: List[int], now: datetime) -> int:
+        return self.db_session.query(self.model)\
+            .filter(self.model.user_id.in_(user_ids))\
+            .filter(self.model.record_end_date.is_(None))\
+            .update({self.model.record_end_date: now}, synchronize_session=False)
+
+    def close_active(self, user_id: int) -> int:
+        """
+        Close out a User's active Handicap, for when they no longer have enough rounds for one
+        :param: user_id
+        :return: number of Handicap records closed
+        """
+        self._lock_users(user_ids=[user_id])
+        num_closed = self._close_active(user_ids=[user_id], now=datetime.now())
+        self._commit()
+        return num_closed
+
+    def close_active_range(self, min_user_id: int, max_user_id: int, keep_user_ids: List[int]) -> int:
+        """
+        Close out the active Handicap of every User in an inclusive range of User ids that is not in
+        keep_user_ids, for the Users a bulk recalculation left without enough rounds for one
+        :param: min_user_id, max_user_id
+        :param: keep_user_ids Users whose active Handicap was just replaced
+        :return: number of Handicap records closed
+        """
+        keep_user_ids = set(keep_user_ids)
+        active_user_ids = self.db_session.query(self.model.user_id)\
+            .filter(self.model.user_id.between(min_user_id, max_user_id))\
+            .filter(self.model.record_end_date.is_(None))\
+            .all()
+        user_ids = [user_id for user_id, in active_user_ids if user_id not in keep_user_ids]
+        if not user_ids:
+            return 0
+
+        self._lock_users(user_ids=user_ids)
+        num_closed = self._close_active(user_ids=user_ids, now=datetime.now())
+        self._commit()
+        return num_closed
+
+    def replace_active(self, user_id: int, index: Decimal, authorized_association: str = 'USGA'):
         """
-        Close out an old Handicap record
-        :param:
-        :return: Handicap record just closed
+        Replace a User's active Handicap
+        :param: user_id, index, authorized_association
         """
-        model_obj.record_end_date = datetime.now()
-        self.db_session.merge(model_obj)
-        self.db_session.commit()
-        self.db_session.refresh(model_obj)
-        return model_obj
+        self.bulk_replace(indexes={user_id: index}, authorized_association=authorized_association)
 
     def get_active(self, user_id: int) -> Handicap:
         """
@@ -25,10 +100,12 @@ class HandicapRepository(BaseRepository):
         :param: user_id
         :return: Handicap or None
         """
-        return self.db_session.query(self.model)\
-            .filter_by(record_end_date=None)\
-            .filter(self.model.user_id == user_id)\
-            .first()
+        baked_query = self.baked_query()
+        baked_query += lambda q: q.filter(
+            self.model.record_end_date.is_(None),
+            self.model.user_id == bindparam('user_id'),
+        )
+        return baked_query(self.session()).params(user_id=user_id).first()
 
     def get_by_date(self, user_id: int, start_date: datetime) -> List[Handicap]:
         """
@@ -1,6 +1,8 @@
 from typing import List
 
+from api.pagination import Page, PageRequest, paginate
 from api.repositories.base_repository import BaseRepository
+from api.repositories.versions import Version
 from api.models import Hole
 
 
@@ -14,13 +16,31 @@ class HoleRepository(BaseRepository):
         """
         return self.db_session.query(self.model).filter_by(golf_course_id=golf_course_id).all()
 
-    def get_by_tee_box_id(self, tee_box_id: int) -> list:
+    def get_by_tee_box_id(self, tee_box_id: int, page_request: PageRequest = None) -> Page:
         """
-        Retrieve all Hole records by TeeBox id
+        Retrieve Hole records by TeeBox id
         :param: tee_box_id
-        :return: List(Hole) or empty list
+        :param: page_request the page to fetch, every Hole when None
+        :return: Page(Hole)
+        """
+        return paginate(
+            self.query().filter_by(tee_box_id=tee_box_id),
+            order_by=[self.model.id],
+            page_request=page_request,
+        )
+
+    def get_version_by_tee_box_id(self, tee_box_id: int, page_request: PageRequest = None) -> Version:
+        """
+        Fingerprint the page get_by_tee_box_id fetches without loading it
+        :param: tee_box_id
+        :param: page_request
+        :return: Version
         """
-        return self.db_session.query(self.model).filter_by(tee_box_id=tee_box_id).all()
+        return self._get_page_version(
+            criteria=[self.model.tee_box_id == tee_box_id],
+            order_by=[self.model.id],
+            page_request=page_request,
+        )
 
     # TODO: bulk save?
 
@@ -0,0 +1,58 @@
+from typing import Iterator, List, Tuple
+
+from marshmallow import Schema, fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import RelationshipProperty, selectinload
+
+_loading_options_cache = {}
+
+
+def _nested_schema(field: fields.Field):
+    if isinstance(field, fields.List):
+        field = field.inner
+    if isinstance(field, fields.Nested):
+        return field.schema
+    return None
+
+
+def nested_relationships(model, schema: Schema) -> Iterator[Tuple[RelationshipProperty, Schema]]:
+    """
+    The relationships of model that schema dumps with a nested schema
+    :return: iterator of each relationship and the schema nested for it
+    """
+    relationships = inspect(model).relationships
+    for name, field in schema.dump_fields.items():
+        nested_schema = _nested_schema(field)
+        relationship = relationships.get(field.attribute or name)
+        if nested_schema is not None and relationship is not None:
+            yield relationship, nested_schema
+
+
+def _loading_options(model, schema: Schema, parent=None) -> list:
+    options = []
+    for relationship, nested_schema in nested_relationships(model, schema):
+        loader = selectinload(relationship.class_attribute) if parent is None \
+            else parent.selectinload(relationship.class_attribute)
+        nested_options = _loading_options(relationship.mapper.class_, nested_schema, parent=loader)
+        options.extend(nested_options or [loader])
+    return options
+
+
+def schema_loading_key(model, schema: Schema) -> tuple:
+    """Identifies the loading options of a model and schema, schemas dumping the same fields share them"""
+    return model, type(schema), tuple(schema.dump_fields)
+
+
+def schema_loading_options(model, schema: Schema) -> List:
+    """
+    Derive eager loading options from the relationships a schema nests, so dumping a list
+    of models loads each nested relationship with one batched SELECT ... IN query instead
+    of lazily loading it one row at a time
+    :param: model the mapped class being queried
+    :param: schema the schema the results will be dumped with
+    :return: list of loader options for Query.options
+    """
+    key = schema_loading_key(model, schema)
+    if key not in _loading_options_cache:
+        _loading_options_cache[key] = _loading_options(model, schema)
+    return _loading_options_cache[key]
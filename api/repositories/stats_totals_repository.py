@@ -0,0 +1,175 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import DateTime, String, and_, cast, distinct, extract, func, literal, select, union_all
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased
+
+from api.repositories.base_repository import BaseRepository
+from api.repositories.golf_round_stats_repository import count_where
+from api.models import GolfRound, GolfRoundStats, Hole, StatsTotals
+
+CAREER_PERIOD = 'career'
+# in the column order of the aggregates _hole_totals selects, after rounds
+COUNTER_COLUMNS = (
+    'rounds',
+    'holes',
+    'putts',
+    'fairways',
+    'fairway_attempts',
+    'greens_in_regulation',
+    'up_and_downs',
+    'up_and_down_attempts',
+    'sand_saves',
+    'sand_save_attempts',
+)
+
+
+def _hole_totals() -> list:
+    stats = GolfRoundStats
+    saved_par = and_(stats.gross_score == Hole.par, stats.putts == 1)
+    return [
+        func.count(stats.id).label('holes'),
+        func.sum(stats.putts).label('putts'),
+        count_where(stats.fairway_hit.is_(True)).label('fairways'),
+        count_where(stats.fairway_hit.isnot(None)).label('fairway_attempts'),
+        count_where(stats.green_in_regulation.is_(True)).label('greens_in_regulation'),
+        count_where(and_(saved_par, stats.chips == 1)).label('up_and_downs'),
+        count_where(stats.chips > 0).label('up_and_down_attempts'),
+        count_where(and_(saved_par, stats.greenside_sand_shots == 1)).label('sand_saves'),
+        count_where(stats.greenside_sand_shots > 0).label('sand_save_attempts'),
+    ]
+
+
+def season_period(year: int) -> str:
+    return str(year)
+
+
+class StatsTotalsRepository(BaseRepository):
+
+    def get_for_period(self, user_id: int, period: str = CAREER_PERIOD) -> Optional[StatsTotals]:
+        """
+        Retrieve a User's StatsTotals for their career or a season
+        :param: user_id
+        :param: period CAREER_PERIOD or a season_period
+        :return: StatsTotals or None
+        """
+        return self.db_session.query(self.model).get((user_id, period))
+
+    def _round_deltas(self, golf_round_id: int, stats_ids: List[int] = None, sign: int = 1) -> List[dict]:
+        stats = GolfRoundStats
+        round_stats = aliased(GolfRoundStats)
+        round_holes = self.db_session.query(func.count(round_stats.id))\
+            .filter(round_stats.golf_round_id == golf_round_id)\
+            .as_scalar()
+        query = self.db_session.query(
+            GolfRound.user_id,
+            GolfRound.played_on,
+            round_holes.label('round_holes'),
+            *_hole_totals(),
+        ).select_from(stats)\
+            .join(GolfRound, GolfRound.id == stats.golf_round_id)\
+            .join(Hole, Hole.id == stats.hole_id)\
+            .filter(stats.golf_round_id == golf_round_id)
+        if stats_ids is not None:
+            query = query.filter(stats.id.in_(stats_ids))
+        totals = query.group_by(GolfRound.user_id, GolfRound.played_on).first()
+        if totals is None:
+            return []
+
+        # the round itself counts once its first stats are added and until it is removed
+        rounds = 1 if totals.holes == totals.round_holes else 0
+        counters = {
+            column: sign * (rounds if column == 'rounds' else getattr(totals, column))
+            for column in COUNTER_COLUMNS
+        }
+        touched_ts = datetime.now()
+        return [
+            {'user_id': totals.user_id, 'period': period, **counters, 'touched_ts': touched_ts}
+            for period in (CAREER_PERIOD, season_period(totals.played_on.year))
+        ]
+
+    def _apply(self, deltas: List[dict]):
+        """
+        Add deltas to the User's StatsTotals, Postgres upserts them all with a single
+        INSERT ... ON CONFLICT DO UPDATE, other databases through the ORM
+        """
+        if not deltas:
+            return
+
+        table = self.model.__table__
+        insert = postgresql.insert(table)
+        connection = self.db_session.connection(clause=insert)
+        if connection.dialect.name != 'postgresql':
+            for delta in deltas:
+                totals = self.get_for_period(user_id=delta['user_id'], period=delta['period'])
+                if totals is None:
+                    totals = self.model(user_id=delta['user_id'], period=delta['period'])
+                    self.db_session.add(totals)
+                for column in COUNTER_COLUMNS:
+                    setattr(totals, column, (getattr(totals, column) or 0) + delta[column])
+                totals.touched_ts = delta['touched_ts']
+            return
+
+        connection.execute(insert.values(deltas).on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.period],
+            set_={
+                **{column: table.c[column] + insert.excluded[column] for column in COUNTER_COLUMNS},
+                'touched_ts': insert.excluded.touched_ts,
+            },
+        ))
+
+    def add_round_stats(self, golf_round_id: int, stats_ids: List[int]):
+        """
+        Add newly recorded GolfRoundStats to the career and season totals of the GolfRound's User
+        :param: golf_round_id
+        :param: stats_ids ids of the GolfRoundStats just added to the GolfRound
+        """
+        self._apply(self._round_deltas(golf_round_id=golf_round_id, stats_ids=stats_ids))
+        self._commit()
+
+    def remove_round(self, golf_round_id: int):
+        """
+        Take a GolfRound that is about to be deleted out of its User's career and season totals
+        :param: golf_round_id
+        """
+        self._apply(self._round_deltas(golf_round_id=golf_round_id, sign=-1))
+        self._commit()
+
+    def rebuild(self) -> int:
+        """
+        Recompute every User's totals from their GolfRoundStats in one transaction, used to backfill
+        the totals of rounds recorded before they were maintained
+        :return: number of StatsTotals records written
+        """
+        stats = GolfRoundStats
+        season = cast(extract('year', GolfRound.played_on), String)
+        touched_ts = literal(datetime.now(), DateTime)
+
+        def totals_by(period, *group_by):
+            return select([
+                GolfRound.user_id,
+                period.label('period'),
+                func.count(distinct(stats.golf_round_id)).label('rounds'),
+                *_hole_totals(),
+                touched_ts.label('touched_ts'),
+            ]).select_from(
+                stats.__table__
+                .join(GolfRound.__table__, GolfRound.id == stats.golf_round_id)
+                .join(Hole.__table__, Hole.id == stats.hole_id)
+            ).group_by(GolfRound.user_id, *group_by)
+
+        self.db_session.query(self.model).delete(synchronize_session=False)
+        insert = self.model.__table__.insert().from_select(
+            ['user_id', 'period', *COUNTER_COLUMNS, 'touched_ts'],
+            union_all(
+                totals_by(literal(CAREER_PERIOD, String)),
+                totals_by(season, season),
+            ),
+        )
+        num_totals = self.db_session.execute(insert).rowcount
+        self._commit()
+        return num_totals
+
+
+stats_totals_repo = StatsTotalsRepository(model=StatsTotals)
@@ -1,18 +1,49 @@
-from typing import List
+from typing import Optional
 
+from api.pagination import Page, PageRequest, paginate
 from api.repositories.base_repository import BaseRepository
-from api.models import TeeBox
+from api.repositories.versions import Version
+from api.models import GolfCourse, TeeBox
 
 
 class TeeBoxRepository(BaseRepository):
 
-    def get_by_golf_course_id(self, golf_course_id: int) -> List[TeeBox]:
+    def get_by_golf_course_id(self, golf_course_id: int, page_request: PageRequest = None) -> Page:
         """
         Filter a TeeBox by GolfCourse id.
         :param: golf_course_id
-        :return: List(TeeBox) or empty list
+        :param: page_request the page to fetch, every TeeBox when None
+        :return: Page(TeeBox)
         """
-        return self.db_session.query(self.model).filter_by(golf_course_id=golf_course_id).all()
+        return paginate(
+            self.query().filter_by(golf_course_id=golf_course_id),
+            order_by=[self.model.id],
+            page_request=page_request,
+        )
+
+    def get_version_by_golf_course_id(self, golf_course_id: int, page_request: PageRequest = None) -> Version:
+        """
+        Fingerprint the page get_by_golf_course_id fetches without loading it
+        :param: golf_course_id
+        :param: page_request
+        :return: Version
+        """
+        return self._get_page_version(
+            criteria=[self.model.golf_course_id == golf_course_id],
+            order_by=[self.model.id],
+            page_request=page_request,
+        )
+
+    def get_golf_club_id(self, tee_box_id: int) -> Optional[int]:
+        """
+        Look up the GolfClub a TeeBox is at
+        :param: tee_box_id
+        :return: golf_club_id or None if there's no such TeeBox
+        """
+        return self.db_session.query(GolfCourse.golf_club_id)\
+            .join(self.model, self.model.golf_course_id == GolfCourse.id)\
+            .filter(self.model.id == tee_box_id)\
+            .scalar()
 
 
 tee_box_repo = TeeBoxRepository(model=TeeBox)
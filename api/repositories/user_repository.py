@@ -1,8 +1,7 @@
+from sqlalchemy import bindparam
+
 from api.repositories.base_repository import BaseRepository
 from api.models import User
-from api.schemas import UserSchema
-
-user_schema = UserSchema()
 
 
 class UserRepository(BaseRepository):
@@ -13,7 +12,9 @@ class UserRepository(BaseRepository):
         :param: email
         :return: User or None
         """
-        return self.db_session.query(self.model).filter_by(email=email).first()
+        baked_query = self.baked_query()
+        baked_query += lambda q: q.filter(self.model.email == bindparam('email'))
+        return baked_query(self.session()).params(email=email).first()
 
     def reset_password(self, user_obj: User, new_password: str) -> User:
         """
@@ -23,8 +24,7 @@ class UserRepository(BaseRepository):
         :return: User
         """
         user_obj.password_hash = User.hash_password(password=new_password)
-        user_data = user_schema.dump(user_obj)
-        return self.update(data=user_data)
+        return self.save(user_obj)
 
 
 user_repo = UserRepository(model=User)
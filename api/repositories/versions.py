@@ -0,0 +1,59 @@
+"""
+Fingerprints of the rows a response is built from, for its ETag. They're computed
+by a single aggregate statement, so a conditional GET can be answered without loading the rows.
+"""
+import hashlib
+from collections import namedtuple
+from typing import Iterator, Tuple
+
+from marshmallow import Schema
+from sqlalchemy import and_, func, select
+
+from api.repositories.loading import nested_relationships
+
+Version = namedtuple('Version', ['etag'])
+
+
+def row_version(model):
+    """When a row last changed, its touched_ts or else its created_ts"""
+    return func.coalesce(model.touched_ts, model.created_ts)
+
+
+def _row_sets(model, criterion, schema: Schema = None) -> Iterator[Tuple]:
+    """The model and criterion of each set of rows a dump with schema reads, starting with model's own"""
+    yield model, criterion
+    if schema is None:
+        return
+    for relationship, nested_schema in nested_relationships(model, schema):
+        nested_criterion = and_(*[
+            remote.in_(select([local]).where(criterion)) for local, remote in relationship.local_remote_pairs
+        ])
+        yield from _row_sets(relationship.mapper.class_, nested_criterion, nested_schema)
+
+
+def _aggregate(model, criterion):
+    # one row however many rows match, so every set can be aggregated in the same SELECT
+    return select([
+        func.count(model.id).label('rows'),
+        func.coalesce(func.sum(model.id), 0).label('id_sum'),
+        func.max(row_version(model)).label('last_modified'),
+    ]).where(criterion).alias()
+
+
+def get_version(session, model, ids, schema: Schema = None) -> Version:
+    """
+    Fingerprint the rows of model with ids, and those of each relationship schema nests under them, by how
+    many there are, the sum of their ids and when the latest of them changed. Adding, deleting or touching
+    any of those rows changes the fingerprint.
+    :param: session
+    :param: model
+    :param: ids a list of ids or a SELECT of them
+    :param: schema the schema the rows are dumped with, if any
+    :return: Version of a strong etag
+    """
+    aggregates = [
+        _aggregate(row_model, criterion) for row_model, criterion in _row_sets(model, model.id.in_(ids), schema)
+    ]
+    row = session.query(*[column for aggregate in aggregates for column in aggregate.c]).one()
+
+    return Version(etag=hashlib.sha1(repr(tuple(row)).encode('utf-8')).hexdigest())
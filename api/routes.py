@@ -1,6 +1,7 @@
 import logging
 
 from api.controllers import (
+    admin,
     auth,
     health,
     user,
@@ -20,6 +21,7 @@ ROUTES = {
     '/api/golf-rounds': golf_round.blueprint,
     '/api/golf-clubs': golf_club.blueprint,
     '/api/golf-courses': golf_course.blueprint,
+    '/api/admin': admin.blueprint,
 }
 
 
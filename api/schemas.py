@@ -7,7 +7,7 @@ class HandicapSchema(Schema):
     index = fields.Decimal(required=True, as_string=True)
     authorized_association = fields.Str()
     record_start_date = fields.DateTime(dump_only=True)
-    record_end_date = fields.DateTime()
+    record_end_date = fields.DateTime(dump_only=True)
 
 
 class TeeBoxSchema(Schema):
@@ -77,6 +77,47 @@ class GolfRoundStatsSchema(Schema):
     touched_ts = fields.DateTime()
 
 
+def _rate(numerator: int, denominator: int, scale: int = 100, places: int = 1):
+    if not denominator:
+        return None
+    return round(numerator * scale / denominator, places)
+
+
+class StatsTotalsSchema(Schema):
+    user_id = fields.Int(dump_only=True)
+    period = fields.Str(dump_only=True)
+    rounds = fields.Int(dump_only=True)
+    holes = fields.Int(dump_only=True)
+    putts = fields.Int(dump_only=True)
+    fairways = fields.Int(dump_only=True)
+    fairway_attempts = fields.Int(dump_only=True)
+    greens_in_regulation = fields.Int(dump_only=True)
+    up_and_downs = fields.Int(dump_only=True)
+    up_and_down_attempts = fields.Int(dump_only=True)
+    sand_saves = fields.Int(dump_only=True)
+    sand_save_attempts = fields.Int(dump_only=True)
+    putts_per_round = fields.Method('get_putts_per_round')
+    fairway_pct = fields.Method('get_fairway_pct')
+    greens_in_regulation_pct = fields.Method('get_greens_in_regulation_pct')
+    up_and_down_pct = fields.Method('get_up_and_down_pct')
+    sand_save_pct = fields.Method('get_sand_save_pct')
+
+    def get_putts_per_round(self, totals):
+        return _rate(totals.putts, totals.rounds, scale=1, places=2)
+
+    def get_fairway_pct(self, totals):
+        return _rate(totals.fairways, totals.fairway_attempts)
+
+    def get_greens_in_regulation_pct(self, totals):
+        return _rate(totals.greens_in_regulation, totals.holes)
+
+    def get_up_and_down_pct(self, totals):
+        return _rate(totals.up_and_downs, totals.up_and_down_attempts)
+
+    def get_sand_save_pct(self, totals):
+        return _rate(totals.sand_saves, totals.sand_save_attempts)
+
+
 class GolfRoundSchema(Schema):
     id = fields.Int(dump_only=True)
     golf_course_id = fields.Int(required=True)
@@ -90,6 +131,27 @@ class GolfRoundSchema(Schema):
     touched_ts = fields.DateTime()
 
 
+class HandicapWindowRoundSchema(Schema):
+    id = fields.Int(attribute='golf_round_id', dump_only=True)
+    golf_course_id = fields.Int()
+    tee_box_id = fields.Int()
+    user_id = fields.Int()
+    gross_score = fields.Int()
+    towards_handicap = fields.Boolean()
+    played_on = fields.Date()
+    course_rating = fields.Decimal(as_string=True)
+    slope = fields.Decimal(as_string=True)
+    differential = fields.Decimal(as_string=True)
+
+
+class HandicapHistorySchema(Schema):
+    golf_round_id = fields.Int(dump_only=True)
+    user_id = fields.Int()
+    played_on = fields.Date()
+    differential = fields.Decimal(as_string=True)
+    handicap_index = fields.Decimal(as_string=True, allow_none=True)
+
+
 class UserSchema(Schema):
     id = fields.Int(dump_only=True)
     email = fields.Str(required=True)
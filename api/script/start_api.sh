@@ -1,4 +1,5 @@
 #!/usr/bin/env bash
 
+# API_SERVING_MODE=gevent serves each request on a greenlet, see api/gunicorn_config.py
 export PORT=8000
-exec gunicorn api.index:app --name footwedge-api -b 0.0.0.0:$PORT -w 1 --threads 2 -t 60
\ No newline at end of file
+exec gunicorn api.index:app -c api/gunicorn_config.py
@@ -7,32 +7,58 @@ from flask import (
 )
 from marshmallow import ValidationError
 
+from api.catalog_cache import CatalogCache, UNCACHED, golf_club_tag
+from api.pagination import PageRequest
 from api.repositories.golf_club_repository import GolfClubRepository
+from api.repositories.versions import Version
 from api.schemas import GolfClubSchema
 from api.services.search_service import SearchService
+from api.streaming import stream_response
 
 
 class GolfClubService:
 
-    def __init__(self, repo: GolfClubRepository, schema: GolfClubSchema):
+    def __init__(self, repo: GolfClubRepository, schema: GolfClubSchema, catalog_cache: CatalogCache = UNCACHED):
         self._golf_club_repo = repo
         self._golf_club_schema = schema
+        self._catalog_cache = catalog_cache
+
+    @staticmethod
+    def _cache_entry(_id: int) -> dict:
+        return {'name': 'golf_club', 'key': str(_id), 'tags': [golf_club_tag(_id)]}
 
     def get(self, _id: int) -> Response:
-        golf_club = self._golf_club_repo.get(_id)
-        result = self._golf_club_schema.dump(golf_club)
+        result = self._catalog_cache.get_or_load(
+            **self._cache_entry(_id),
+            load=lambda: self._golf_club_schema.dump(self._golf_club_repo.get(_id, schema=self._golf_club_schema)),
+        )
         response_body = {
             'status': 'success',
             'result': result
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_all(self) -> Response:
-        clubs = self._golf_club_repo.get_all()
-        results = self._golf_club_schema.dump(clubs, many=True)
+    def get_version(self, _id: int) -> Version:
+        return self._catalog_cache.get_version(
+            **self._cache_entry(_id),
+            fallback=lambda: self._golf_club_repo.get_version(model_ids=[_id], schema=self._golf_club_schema),
+        )
+
+    def get_all(self, page_request: PageRequest = None) -> Response:
+        page = self._golf_club_repo.get_all(schema=self._golf_club_schema, page_request=page_request)
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._golf_club_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._golf_club_schema.dump(page.items, many=True)
         response_body = {
             'status': 'success',
-            'result': results
+            'result': results,
+            'next_cursor': page.next_cursor,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
@@ -47,6 +73,8 @@ class GolfClubService:
             return make_response(jsonify(response_body), HTTPStatus.UNPROCESSABLE_ENTITY)
 
         golf_club_model = self._golf_club_repo.create(data=golf_club_data)
+        # a read of the new id before it existed may be cached
+        self._catalog_cache.invalidate([golf_club_tag(golf_club_model.id)])
         golf_club = self._golf_club_schema.dump(golf_club_model)
         # TODO: Is this the best way, maybe make an async future
         SearchService.add_golf_club(
@@ -70,4 +98,5 @@ class GolfClubService:
             }
             return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
 
+        self._catalog_cache.invalidate([golf_club_tag(_id)])
         return make_response("", HTTPStatus.NO_CONTENT)
@@ -8,19 +8,24 @@ from flask import (
 )
 from marshmallow import ValidationError
 
+from api.catalog_cache import CatalogCache, UNCACHED, golf_club_tag, page_key
+from api.pagination import PageRequest
 from api.repositories.golf_course_repository import GolfCourseRepository
+from api.repositories.versions import Version
 from api.schemas import GolfCourseSchema
 from api.services.search_service import SearchService
+from api.streaming import stream_response
 
 
 class GolfCourseService:
 
-    def __init__(self, repo: GolfCourseRepository, schema: GolfCourseSchema):
+    def __init__(self, repo: GolfCourseRepository, schema: GolfCourseSchema, catalog_cache: CatalogCache = UNCACHED):
         self._golf_course_repo = repo
         self._golf_course_schema = schema
+        self._catalog_cache = catalog_cache
 
     def get(self, _id: int) -> Response:
-        golf_course = self._golf_course_repo.get(_id)
+        golf_course = self._golf_course_repo.get(_id, schema=self._golf_course_schema)
         result = self._golf_course_schema.dump(golf_course)
         response_body = {
             'status': 'success',
@@ -29,7 +34,7 @@ class GolfCourseService:
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
     def get_by_ids(self, ids: List[int]) -> Response:
-        golf_courses = self._golf_course_repo.get_by_ids(ids=ids)
+        golf_courses = self._golf_course_repo.get_by_ids(ids=ids, schema=self._golf_course_schema)
         results = self._golf_course_schema.dump(golf_courses, many=True)
         response_body = {
             'status': 'success',
@@ -37,24 +42,79 @@ class GolfCourseService:
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_all(self) -> Response:
-        courses = self._golf_course_repo.get_all()
-        results = self._golf_course_schema.dump(courses, many=True)
+    def get_all(self, page_request: PageRequest = None) -> Response:
+        page = self._golf_course_repo.get_all(schema=self._golf_course_schema, page_request=page_request)
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._golf_course_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._golf_course_schema.dump(page.items, many=True)
         response_body = {
             'status': 'success',
-            'result': results
+            'result': results,
+            'next_cursor': page.next_cursor,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_by_golf_club_id(self, golf_club_id: int):
-        courses = self._golf_course_repo.get_by_golf_club_id(golf_club_id=golf_club_id)
-        results = self._golf_course_schema.dump(courses, many=True)
+    def _get_page_by_golf_club_id(self, golf_club_id: int, page_request: PageRequest = None) -> dict:
+        page = self._golf_course_repo.get_by_golf_club_id(
+            golf_club_id=golf_club_id,
+            schema=self._golf_course_schema,
+            page_request=page_request,
+        )
+        return {
+            'result': self._golf_course_schema.dump(page.items, many=True),
+            'next_cursor': page.next_cursor,
+        }
+
+    @staticmethod
+    def _cache_entry(golf_club_id: int, page_request: PageRequest = None) -> dict:
+        return {
+            'name': 'golf_courses_by_golf_club',
+            'key': f'{golf_club_id}:{page_key(page_request)}',
+            'tags': [golf_club_tag(golf_club_id)],
+        }
+
+    def get_by_golf_club_id(self, golf_club_id: int, page_request: PageRequest = None):
+        if page_request and page_request.stream:
+            page = self._golf_course_repo.get_by_golf_club_id(
+                golf_club_id=golf_club_id,
+                schema=self._golf_course_schema,
+                page_request=page_request,
+            )
+            return stream_response(
+                page.items,
+                schema=self._golf_course_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        page = self._catalog_cache.get_or_load(
+            **self._cache_entry(golf_club_id, page_request),
+            load=lambda: self._get_page_by_golf_club_id(golf_club_id=golf_club_id, page_request=page_request),
+        )
         response_body = {
             'status': 'success',
-            'result': results
+            **page,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
+    def get_version_by_golf_club_id(self, golf_club_id: int, page_request: PageRequest = None) -> Version:
+        def fallback():
+            return self._golf_course_repo.get_version_by_golf_club_id(
+                golf_club_id=golf_club_id,
+                schema=self._golf_course_schema,
+                page_request=page_request,
+            )
+
+        if page_request and page_request.stream:
+            return fallback()
+        return self._catalog_cache.get_version(**self._cache_entry(golf_club_id, page_request), fallback=fallback)
+
     def add(self, payload: dict) -> Response:
         try:
             golf_course_data = self._golf_course_schema.load(payload)
@@ -68,6 +128,7 @@ class GolfCourseService:
         golf_course_model = self._golf_course_repo.create(data=golf_course_data)
         golf_course = self._golf_course_schema.dump(golf_course_model)
         golf_club_id = golf_course_model.golf_club_id
+        self._catalog_cache.invalidate([golf_club_tag(golf_club_id)])
         # TODO: Is this the best way, maybe make an async future
         SearchService.add_golf_course(
             golf_club_id=golf_club_id,
@@ -82,6 +143,7 @@ class GolfCourseService:
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
     def delete(self, _id: int):
+        golf_course = self._golf_course_repo.get(_id)
         is_deleted = self._golf_course_repo.delete(model_id=_id)
         if not is_deleted:
             response_body = {
@@ -90,4 +152,5 @@ class GolfCourseService:
             }
             return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
 
+        self._catalog_cache.invalidate([golf_club_tag(golf_course.golf_club_id)])
         return make_response("", HTTPStatus.NO_CONTENT)
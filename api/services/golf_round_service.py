@@ -1,8 +1,6 @@
-import json
 import logging
 from http import HTTPStatus
 
-import boto3
 from flask import (
     Response,
     make_response,
@@ -10,24 +8,39 @@ from flask import (
 )
 from marshmallow import ValidationError
 
+from api.handicap_queue import handicap_queue
+from api.pagination import PageRequest
 from api.repositories.golf_round_repository import GolfRoundRepository
-from api.schemas import GolfRoundSchema
-from api.settings import settings
+from api.repositories.stats_totals_repository import StatsTotalsRepository
+from api.schemas import GolfRoundSchema, HandicapWindowRoundSchema
+from api.services.handicap_history_service import HandicapHistoryService
+from api.services.handicap_window_service import HandicapWindowService
+from api.streaming import stream_response
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-sqs_client = boto3.client('sqs')
+handicap_window_round_schema = HandicapWindowRoundSchema()
 
 
 class GolfRoundService:
 
-    def __init__(self, repo: GolfRoundRepository, schema: GolfRoundSchema):
+    def __init__(
+            self,
+            repo: GolfRoundRepository,
+            schema: GolfRoundSchema,
+            handicap_window_service: HandicapWindowService = None,
+            handicap_history_service: HandicapHistoryService = None,
+            stats_totals_repo: StatsTotalsRepository = None,
+    ):
         self._golf_round_repo = repo
         self._golf_round_schema = schema
+        self._handicap_window_service = handicap_window_service
+        self._handicap_history_service = handicap_history_service
+        self._stats_totals_repo = stats_totals_repo
 
     def get(self, _id: int) -> Response:
-        golf_round = self._golf_round_repo.get(_id)
+        golf_round = self._golf_round_repo.get(_id, schema=self._golf_round_schema)
         result = self._golf_round_schema.dump(golf_round)
         response_body = {
             'status': 'success',
@@ -35,9 +48,31 @@ class GolfRoundService:
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_by_user_id(self, user_id: int) -> Response:
-        rounds = self._golf_round_repo.get_by_user_id(user_id=user_id)
-        results = self._golf_round_schema.dump(rounds, many=True)
+    def get_by_user_id(self, user_id: int, page_request: PageRequest = None) -> Response:
+        page = self._golf_round_repo.get_by_user_id(
+            user_id=user_id,
+            schema=self._golf_round_schema,
+            page_request=page_request,
+        )
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._golf_round_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._golf_round_schema.dump(page.items, many=True)
+        response_body = {
+            'status': 'success',
+            'result': results,
+            'next_cursor': page.next_cursor,
+        }
+        return make_response(jsonify(response_body), HTTPStatus.OK)
+
+    def get_handicap_window(self, user_id: int) -> Response:
+        rounds = self._handicap_window_service.get_window(user_id=user_id)
+        results = handicap_window_round_schema.dump(rounds, many=True)
         response_body = {
             'status': 'success',
             'result': results,
@@ -55,8 +90,14 @@ class GolfRoundService:
             }
             return make_response(jsonify(response_body), HTTPStatus.UNPROCESSABLE_ENTITY)
 
-        new_round = self._golf_round_repo.create(data=golf_round_data)
+        # the round and its place in the handicap window are committed together
+        with self._golf_round_repo.transaction():
+            new_round = self._golf_round_repo.create(data=golf_round_data)
+            if self._handicap_window_service:
+                self._handicap_window_service.add_round(golf_round=new_round)
         logger.info(f"Successfully created a new golf round with id: {new_round.id}")
+        if self._handicap_history_service and new_round.towards_handicap:
+            self._handicap_history_service.refresh(user_id=user_id, played_on_from=new_round.played_on)
         self._queue_handicap_calculation(user_id=user_id)
 
         golf_round_id = new_round.id
@@ -71,16 +112,16 @@ class GolfRoundService:
 
     @staticmethod
     def _queue_handicap_calculation(user_id: int):
-        logger.info("queueing handicap calculation...")
-        payload = json.dumps({"user_id": user_id}, default=str)
-        sqs_resp = sqs_client.send_message(
-            QueueUrl=settings.HANDICAP_QUEUE_URL,
-            MessageBody=payload,
-        )
-        logger.info(f"sqs resp: {sqs_resp}")
+        handicap_queue.request_recompute(user_id=user_id)
 
     def delete(self, _id: int):
-        is_deleted = self._golf_round_repo.delete(model_id=_id)
+        golf_round = self._golf_round_repo.get(_id)
+        with self._golf_round_repo.transaction():
+            if golf_round and self._handicap_window_service:
+                self._handicap_window_service.remove_round(golf_round=golf_round)
+            if golf_round and self._stats_totals_repo:
+                self._stats_totals_repo.remove_round(golf_round_id=_id)
+            is_deleted = self._golf_round_repo.delete(model_id=_id)
         if not is_deleted:
             response_body = {
                 'status': 'fail',
@@ -88,4 +129,7 @@ class GolfRoundService:
             }
             return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
 
+        if self._handicap_history_service and golf_round.towards_handicap:
+            self._handicap_history_service.refresh(user_id=golf_round.user_id, played_on_from=golf_round.played_on)
+        self._queue_handicap_calculation(user_id=golf_round.user_id)
         return make_response("", HTTPStatus.NO_CONTENT)
@@ -1,5 +1,4 @@
 from http import HTTPStatus
-from typing import List
 
 from flask import (
     Response,
@@ -8,17 +7,30 @@ from flask import (
 )
 from marshmallow import ValidationError
 
-from api.services.hole_service import HoleService
+from api.models import StatsTotals
 from api.repositories.golf_round_stats_repository import GolfRoundStatsRepository
-from api.schemas import GolfRoundStatsSchema
-from api.models import GolfRound, GolfRoundStats
+from api.repositories.stats_totals_repository import (
+    CAREER_PERIOD,
+    COUNTER_COLUMNS,
+    StatsTotalsRepository,
+    season_period,
+)
+from api.schemas import GolfRoundStatsSchema, StatsTotalsSchema
+
+stats_totals_schema = StatsTotalsSchema()
 
 
 class GolfRoundStatsService:
 
-    def __init__(self, repo: GolfRoundStatsRepository, schema: GolfRoundStatsSchema):
+    def __init__(
+            self,
+            repo: GolfRoundStatsRepository,
+            schema: GolfRoundStatsSchema,
+            stats_totals_repo: StatsTotalsRepository = None,
+    ):
         self._golf_round_stats_repo = repo
         self._golf_round_stats_schema = schema
+        self._stats_totals_repo = stats_totals_repo
 
     def get_by_golf_round_id(self, golf_round_id: int) -> Response:
         rounds = self._golf_round_stats_repo.get_by_golf_round_id(golf_round_id=golf_round_id)
@@ -50,7 +62,13 @@ class GolfRoundStatsService:
                 return make_response(jsonify(response_body), HTTPStatus.UNPROCESSABLE_ENTITY)
             round_stats.append(round_stat_data)
 
-        new_stats = self._golf_round_stats_repo.bulk_create(records=round_stats)
+        with self._golf_round_stats_repo.transaction():
+            new_stats = self._golf_round_stats_repo.bulk_create(records=round_stats)
+            if self._stats_totals_repo:
+                self._stats_totals_repo.add_round_stats(
+                    golf_round_id=golf_round_id,
+                    stats_ids=[stat.id for stat in new_stats],
+                )
         results = self._golf_round_stats_schema.dump(new_stats, many=True)
         message = f"GolfRoundStats records were successfully added for GolfRound id: '{golf_round_id}'"
         response_body = {
@@ -61,50 +79,34 @@ class GolfRoundStatsService:
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    @staticmethod
-    def calculate_stats_summary(stats: List[GolfRoundStats], hole_ids_to_par: dict) -> dict:
-        total_putts = 0
-        total_fairways = 0
-        total_greens_in_regulation = 0
-        up_and_downs = 0
-        sand_saves = 0
-        for stat in stats:
-            total_putts += stat.putts
-            if stat.fairway_hit:
-                total_fairways += 1
-            if stat.green_in_regulation:
-                total_greens_in_regulation += 1
-            par = hole_ids_to_par.get(stat.hole_id)
-            if stat.gross_score == par:
-                if stat.putts == 1 and stat.chips == 1:
-                    up_and_downs += 1
-                if stat.putts == 1 and stat.greenside_sand_shots == 1:
-                    sand_saves += 1
-        stats_summary = {
-            'putts': total_putts,
-            'fairways': total_fairways,
-            'greens_in_regulation': total_greens_in_regulation,
-            'up_and_downs': up_and_downs,
-            'sand_saves': sand_saves,
+    def stats_summary(self, user_id: int) -> Response:
+        # TODO: this is a hack, num_holes should be a property of golf_round
+        summaries = self._golf_round_stats_repo.get_summaries_by_user_id(user_id=user_id, num_holes=18)
+        data = {
+            summary.golf_round_id: {
+                'putts': summary.putts,
+                'fairways': summary.fairways,
+                'greens_in_regulation': summary.greens_in_regulation,
+                'up_and_downs': summary.up_and_downs,
+                'sand_saves': summary.sand_saves,
+            }
+            for summary in summaries
         }
-        return stats_summary
-
-    def stats_summary_by_round_id(self, golf_rounds: List[GolfRound], hole_service: HoleService) -> Response:
-        data = {}
-        for golf_round in golf_rounds:
-            hole_ids = [stat.hole_id for stat in golf_round.stats]
-            hole_ids_to_par = hole_service.map_hole_ids_to_par(hole_ids=hole_ids)
-            # TODO: this is a hack, num_holes should be a property of golf_round
-            if len(golf_round.stats) == 18:
-                stats_summary = self.calculate_stats_summary(
-                    stats=golf_round.stats,
-                    hole_ids_to_par=hole_ids_to_par,
-                )
-                data[golf_round.id] = stats_summary
-
         response_body = {
             'status': 'success',
             'uri': f'/golf-round-stats/summary',
             'result': data,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
+
+    def totals(self, user_id: int, season: int = None) -> Response:
+        period = CAREER_PERIOD if season is None else season_period(season)
+        totals = self._stats_totals_repo.get_for_period(user_id=user_id, period=period)
+        if totals is None:
+            totals = StatsTotals(user_id=user_id, period=period, **{column: 0 for column in COUNTER_COLUMNS})
+        response_body = {
+            'status': 'success',
+            'uri': f'/golf-round-stats/totals',
+            'result': stats_totals_schema.dump(totals),
+        }
+        return make_response(jsonify(response_body), HTTPStatus.OK)
@@ -0,0 +1,109 @@
+import logging
+from datetime import date
+from http import HTTPStatus
+
+from flask import (
+    Response,
+    make_response,
+    jsonify,
+)
+
+from api.handicap_history import handicap_history
+from api.handicap_math import calculate_differential
+from api.handicap_window import HANDICAP_WINDOW_SIZE
+from api.models import HandicapHistory
+from api.pagination import PageRequest
+from api.repositories.golf_round_repository import GolfRoundRepository
+from api.repositories.handicap_history_repository import HandicapHistoryRepository
+from api.schemas import HandicapHistorySchema
+from api.streaming import stream_response
+
+logger = logging.getLogger(__name__)
+
+
+class HandicapHistoryService:
+
+    def __init__(
+            self,
+            repo: HandicapHistoryRepository,
+            golf_round_repo: GolfRoundRepository,
+            schema: HandicapHistorySchema,
+    ):
+        self._handicap_history_repo = repo
+        self._golf_round_repo = golf_round_repo
+        self._handicap_history_schema = schema
+
+    def get_range(
+            self,
+            user_id: int,
+            start_date: date = None,
+            end_date: date = None,
+            page_request: PageRequest = None,
+    ) -> Response:
+        page = self._handicap_history_repo.get_range(
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            page_request=page_request,
+        )
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._handicap_history_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._handicap_history_schema.dump(page.items, many=True)
+        response_body = {
+            'status': 'success',
+            'result': results,
+            'next_cursor': page.next_cursor,
+        }
+        return make_response(jsonify(response_body), HTTPStatus.OK)
+
+    @staticmethod
+    def _to_history(golf_round) -> HandicapHistory:
+        return HandicapHistory(
+            golf_round_id=golf_round.id,
+            user_id=golf_round.user_id,
+            played_on=golf_round.played_on,
+            differential=calculate_differential(
+                gross_score=golf_round.gross_score,
+                course_rating=golf_round.course_rating,
+                slope=golf_round.slope,
+            ),
+        )
+
+    def refresh(self, user_id: int, played_on_from: date = None) -> int:
+        """
+        Recompute a User's handicap history from the date a GolfRound was added or removed onwards,
+        seeding the sliding window with the rounds played before it
+        :param: user_id
+        :param: played_on_from recompute the whole history when None
+        :return: number of HandicapHistory records written
+        """
+        seed = []
+        if played_on_from:
+            seed = [
+                self._to_history(golf_round)
+                for golf_round in self._golf_round_repo.get_handicap_window(
+                    user_id=user_id,
+                    window_size=HANDICAP_WINDOW_SIZE - 1,
+                    played_before=played_on_from,
+                )
+            ]
+        golf_rounds = self._golf_round_repo.get_handicap_rounds(user_id=user_id, played_on_from=played_on_from)
+
+        entries = []
+        for entry, handicap_index in handicap_history(entries=map(self._to_history, golf_rounds), seed=seed):
+            entry.handicap_index = handicap_index
+            entries.append(entry)
+
+        num_entries = self._handicap_history_repo.replace_from(
+            user_id=user_id,
+            entries=entries,
+            played_on_from=played_on_from,
+        )
+        logger.info(f"Refreshed {num_entries} handicap history records for user_id: {user_id} from: {played_on_from}")
+        return num_entries
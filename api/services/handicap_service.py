@@ -36,13 +36,15 @@ class HandicapService:
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def _close_active(self, user_id: int):
-        current_handicap = self._handicap_repo.get_active(user_id=user_id)
-        if current_handicap:
-            self._handicap_repo.close(current_handicap)
+    def close_active(self, user_id: int) -> Response:
+        num_closed = self._handicap_repo.close_active(user_id=user_id)
+        response_body = {
+            'status': 'success',
+            'message': f"Closed {num_closed} active handicap for user_id: '{user_id}'",
+        }
+        return make_response(jsonify(response_body), HTTPStatus.OK)
 
     def add(self, user_id: int, payload: dict) -> Response:
-        self._close_active(user_id=user_id)
         payload['user_id'] = user_id
         try:
             handicap_data = self._handicap_schema.load(payload)
@@ -53,7 +55,11 @@ class HandicapService:
             }
             return make_response(jsonify(response_body), HTTPStatus.UNPROCESSABLE_ENTITY)
 
-        self._handicap_repo.create(data=handicap_data)
+        self._handicap_repo.replace_active(
+            user_id=user_id,
+            index=handicap_data['index'],
+            authorized_association=handicap_data.get('authorized_association', 'USGA'),
+        )
         response_body = {
             'status': 'success',
             'message': f"Handicap was successfully added for user_id: '{user_id}'",
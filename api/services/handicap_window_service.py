@@ -0,0 +1,146 @@
+import logging
+from decimal import Decimal
+from typing import List, Optional
+
+from api.handicap_math import calculate_differential
+from api.handicap_window import (
+    DifferentialWindow,
+    HANDICAP_WINDOW_CAPACITY,
+    HANDICAP_WINDOW_SIZE,
+)
+from api.models import GolfRound, HandicapDifferential
+from api.repositories.golf_round_repository import GolfRoundRepository
+from api.repositories.handicap_differential_repository import HandicapDifferentialRepository
+from api.repositories.tee_box_repository import TeeBoxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class HandicapWindowService:
+    """ Keeps each User's persisted window of handicap differentials in step with their golf rounds """
+
+    def __init__(
+            self,
+            repo: HandicapDifferentialRepository,
+            golf_round_repo: GolfRoundRepository,
+            tee_box_repo: TeeBoxRepository,
+    ):
+        self._handicap_differential_repo = repo
+        self._golf_round_repo = golf_round_repo
+        self._tee_box_repo = tee_box_repo
+
+    def load(self, user_id: int) -> DifferentialWindow:
+        entries = self._handicap_differential_repo.get_by_user_id(
+            user_id=user_id,
+            limit=HANDICAP_WINDOW_CAPACITY,
+        )
+        if not entries:
+            return self.rebuild(user_id=user_id)
+        return DifferentialWindow(entries=entries, complete=False)
+
+    def get_window(self, user_id: int) -> List[HandicapDifferential]:
+        """
+        :return: the handicap eligible rounds counted towards a User's handicap, most recent first
+        """
+        window = self._handicap_differential_repo.get_by_user_id(
+            user_id=user_id,
+            limit=HANDICAP_WINDOW_SIZE,
+        )
+        if not window:
+            return self.rebuild(user_id=user_id).window
+        return window
+
+    def handicap_index(self, user_id: int) -> Optional[Decimal]:
+        return self.load(user_id=user_id).handicap_index()
+
+    def add_round(self, golf_round: GolfRound) -> Optional[Decimal]:
+        """
+        Add a newly recorded GolfRound to its User's window
+        :return: the User's new handicap index or None if they have too few rounds
+        """
+        window = self.load(user_id=golf_round.user_id)
+        if not golf_round.towards_handicap:
+            return window.handicap_index()
+
+        tee_box = self._tee_box_repo.get(golf_round.tee_box_id)
+        entry = HandicapDifferential(
+            golf_round_id=golf_round.id,
+            user_id=golf_round.user_id,
+            golf_course_id=golf_round.golf_course_id,
+            tee_box_id=golf_round.tee_box_id,
+            gross_score=golf_round.gross_score,
+            played_on=golf_round.played_on,
+            course_rating=tee_box.course_rating,
+            slope=tee_box.slope,
+            differential=calculate_differential(
+                gross_score=golf_round.gross_score,
+                course_rating=tee_box.course_rating,
+                slope=tee_box.slope,
+            ),
+        )
+        if any(existing.golf_round_id == entry.golf_round_id for existing in window.entries):
+            return window.handicap_index()
+
+        dropped = window.add(entry)
+        if entry in dropped and window.is_short:
+            logger.info(f"handicap window for user_id: {golf_round.user_id} is missing older rounds, rebuilding")
+            return self.rebuild(user_id=golf_round.user_id).handicap_index()
+
+        handicap_index = window.handicap_index()
+        self._handicap_differential_repo.apply(
+            added=[entry] if entry not in dropped else [],
+            removed_golf_round_ids=[dropped_entry.golf_round_id for dropped_entry in dropped if dropped_entry is not entry],
+        )
+        return handicap_index
+
+    def remove_round(self, golf_round: GolfRound) -> Optional[Decimal]:
+        """
+        Remove a GolfRound that is about to be deleted from its User's window
+        :return: the User's new handicap index or None if they have too few rounds
+        """
+        window = self.load(user_id=golf_round.user_id)
+        removed = window.remove(golf_round_id=golf_round.id, played_on=golf_round.played_on)
+        if not removed:
+            return window.handicap_index()
+
+        self._handicap_differential_repo.apply(added=[], removed_golf_round_ids=[golf_round.id])
+        if window.is_short:
+            logger.info(f"handicap window for user_id: {golf_round.user_id} ran out of backfill, rebuilding")
+            window = self.rebuild(user_id=golf_round.user_id, exclude_golf_round_id=golf_round.id)
+        return window.handicap_index()
+
+    def rebuild(self, user_id: int, exclude_golf_round_id: int = None) -> DifferentialWindow:
+        """
+        Rebuild a User's window from their recorded golf rounds, used to seed and repair it
+        :param: user_id
+        :param: exclude_golf_round_id a GolfRound that is being deleted
+        """
+        golf_rounds = self._golf_round_repo.get_handicap_window(
+            user_id=user_id,
+            window_size=HANDICAP_WINDOW_CAPACITY + 1,
+        )
+        entries = [
+            HandicapDifferential(
+                golf_round_id=golf_round.id,
+                user_id=golf_round.user_id,
+                golf_course_id=golf_round.golf_course_id,
+                tee_box_id=golf_round.tee_box_id,
+                gross_score=golf_round.gross_score,
+                played_on=golf_round.played_on,
+                course_rating=golf_round.course_rating,
+                slope=golf_round.slope,
+                differential=calculate_differential(
+                    gross_score=golf_round.gross_score,
+                    course_rating=golf_round.course_rating,
+                    slope=golf_round.slope,
+                ),
+            )
+            for golf_round in golf_rounds
+            if golf_round.id != exclude_golf_round_id
+        ]
+        window = DifferentialWindow(entries=entries, complete=len(golf_rounds) <= HANDICAP_WINDOW_CAPACITY)
+        self._handicap_differential_repo.replace_for_user(
+            user_id=user_id,
+            entries=window.entries,
+        )
+        return window
@@ -8,15 +8,20 @@ from flask import (
 )
 from marshmallow import ValidationError
 
+from api.catalog_cache import CatalogCache, UNCACHED, page_key, tee_box_holes_tag
+from api.pagination import PageRequest
 from api.repositories.hole_repository import HoleRepository
+from api.repositories.versions import Version
 from api.schemas import HoleSchema
+from api.streaming import stream_response
 
 
 class HoleService:
 
-    def __init__(self, repo: HoleRepository, schema: HoleSchema):
+    def __init__(self, repo: HoleRepository, schema: HoleSchema, catalog_cache: CatalogCache = UNCACHED):
         self._hole_repo = repo
         self._hole_schema = schema
+        self._catalog_cache = catalog_cache
 
     def get(self, _id: int) -> Response:
         hole = self._hole_repo.get(_id)
@@ -27,24 +32,67 @@ class HoleService:
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_all(self) -> Response:
-        holes = self._hole_repo.get_all()
-        results = self._hole_schema.dump(holes, many=True)
+    def get_all(self, page_request: PageRequest = None) -> Response:
+        page = self._hole_repo.get_all(page_request=page_request)
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._hole_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._hole_schema.dump(page.items, many=True)
         response_body = {
             'status': 'success',
-            'result': results
+            'result': results,
+            'next_cursor': page.next_cursor,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_by_tee_box_id(self, tee_box_id: int):
-        holes = self._hole_repo.get_by_tee_box_id(tee_box_id=tee_box_id)
-        results = self._hole_schema.dump(holes, many=True)
+    def _get_page_by_tee_box_id(self, tee_box_id: int, page_request: PageRequest = None) -> dict:
+        page = self._hole_repo.get_by_tee_box_id(tee_box_id=tee_box_id, page_request=page_request)
+        return {
+            'result': self._hole_schema.dump(page.items, many=True),
+            'next_cursor': page.next_cursor,
+        }
+
+    @staticmethod
+    def _cache_entry(tee_box_id: int, page_request: PageRequest = None) -> dict:
+        return {
+            'name': 'holes_by_tee_box',
+            'key': f'{tee_box_id}:{page_key(page_request)}',
+            'tags': [tee_box_holes_tag(tee_box_id)],
+        }
+
+    def get_by_tee_box_id(self, tee_box_id: int, page_request: PageRequest = None):
+        if page_request and page_request.stream:
+            page = self._hole_repo.get_by_tee_box_id(tee_box_id=tee_box_id, page_request=page_request)
+            return stream_response(
+                page.items,
+                schema=self._hole_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        page = self._catalog_cache.get_or_load(
+            **self._cache_entry(tee_box_id, page_request),
+            load=lambda: self._get_page_by_tee_box_id(tee_box_id=tee_box_id, page_request=page_request),
+        )
         response_body = {
             'status': 'success',
-            'result': results
+            **page,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
+    def get_version_by_tee_box_id(self, tee_box_id: int, page_request: PageRequest = None) -> Version:
+        def fallback():
+            return self._hole_repo.get_version_by_tee_box_id(tee_box_id=tee_box_id, page_request=page_request)
+
+        if page_request and page_request.stream:
+            return fallback()
+        return self._catalog_cache.get_version(**self._cache_entry(tee_box_id, page_request), fallback=fallback)
+
     def add(self, golf_course_id: int, tee_box_id: int, payload: dict):
         if not payload.get('holes'):
             response_body = {
@@ -68,6 +116,7 @@ class HoleService:
                 return make_response(jsonify(response_body), HTTPStatus.UNPROCESSABLE_ENTITY)
 
         self._hole_repo.bulk_create(records=holes_data)
+        self._catalog_cache.invalidate([tee_box_holes_tag(tee_box_id)])
         message = "Hole records were successfully added for " \
                   f"GolfCourse id: {golf_course_id} and TeeBox id: {tee_box_id}"
         response_body = {
@@ -7,40 +7,75 @@ from flask import (
 )
 from marshmallow import ValidationError
 
+from api.catalog_cache import CatalogCache, UNCACHED, golf_club_tag, tee_box_holes_tag, tee_box_tag
+from api.pagination import PageRequest
 from api.repositories.tee_box_repository import TeeBoxRepository
+from api.repositories.versions import Version
 from api.schemas import TeeBoxSchema
+from api.streaming import stream_response
 
 
 class TeeBoxService:
 
-    def __init__(self, repo: TeeBoxRepository, schema: TeeBoxSchema):
+    def __init__(self, repo: TeeBoxRepository, schema: TeeBoxSchema, catalog_cache: CatalogCache = UNCACHED):
         self._tee_box_repo = repo
         self._tee_box_schema = schema
+        self._catalog_cache = catalog_cache
+
+    @staticmethod
+    def _cache_entry(_id: int) -> dict:
+        return {'name': 'tee_box', 'key': str(_id), 'tags': [tee_box_tag(_id)]}
 
     def get(self, _id: int) -> Response:
-        tee_box = self._tee_box_repo.get(_id)
-        result = self._tee_box_schema.dump(tee_box)
+        result = self._catalog_cache.get_or_load(
+            **self._cache_entry(_id),
+            load=lambda: self._tee_box_schema.dump(self._tee_box_repo.get(_id)),
+        )
         response_body = {
             'status': 'success',
             'result': result
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_all(self) -> Response:
-        tee_boxes = self._tee_box_repo.get_all()
-        results = self._tee_box_schema.dump(tee_boxes, many=True)
+    def get_version(self, _id: int) -> Version:
+        return self._catalog_cache.get_version(
+            **self._cache_entry(_id),
+            fallback=lambda: self._tee_box_repo.get_version(model_ids=[_id]),
+        )
+
+    def get_all(self, page_request: PageRequest = None) -> Response:
+        page = self._tee_box_repo.get_all(page_request=page_request)
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._tee_box_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._tee_box_schema.dump(page.items, many=True)
         response_body = {
             'status': 'success',
-            'result': results
+            'result': results,
+            'next_cursor': page.next_cursor,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
-    def get_by_golf_course_id(self, golf_course_id: int):
-        tee_boxes = self._tee_box_repo.get_by_golf_course_id(golf_course_id=golf_course_id)
-        results = self._tee_box_schema.dump(tee_boxes, many=True)
+    def get_by_golf_course_id(self, golf_course_id: int, page_request: PageRequest = None):
+        page = self._tee_box_repo.get_by_golf_course_id(golf_course_id=golf_course_id, page_request=page_request)
+        if page_request and page_request.stream:
+            return stream_response(
+                page.items,
+                schema=self._tee_box_schema,
+                stream_format=page_request.stream,
+                next_cursor=page.next_cursor,
+            )
+
+        results = self._tee_box_schema.dump(page.items, many=True)
         response_body = {
             'status': 'success',
-            'result': results
+            'result': results,
+            'next_cursor': page.next_cursor,
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
@@ -58,6 +93,7 @@ class TeeBoxService:
         tee_box_model = self._tee_box_repo.create(data=tee_box_data)
         tee_box = self._tee_box_schema.dump(tee_box_model)
         tee_box_id = tee_box_model.id
+        self._catalog_cache.invalidate(self._catalog_tags(tee_box_id))
         response_body = {
             'status': 'success',
             'message': f"Tee Box: '{tee_box_model.tee_color}' was successfully added",
@@ -66,7 +102,16 @@ class TeeBoxService:
         }
         return make_response(jsonify(response_body), HTTPStatus.OK)
 
+    def _catalog_tags(self, tee_box_id: int) -> list:
+        # golf club reads nest the tee boxes of each golf course
+        return [
+            golf_club_tag(self._tee_box_repo.get_golf_club_id(tee_box_id=tee_box_id)),
+            tee_box_tag(tee_box_id),
+            tee_box_holes_tag(tee_box_id),
+        ]
+
     def delete(self, _id: int):
+        catalog_tags = self._catalog_tags(_id)
         is_deleted = self._tee_box_repo.delete(model_id=_id)
         if not is_deleted:
             response_body = {
@@ -75,4 +120,5 @@ class TeeBoxService:
             }
             return make_response(jsonify(response_body), HTTPStatus.BAD_REQUEST)
 
+        self._catalog_cache.invalidate(catalog_tags)
         return make_response("", HTTPStatus.NO_CONTENT)
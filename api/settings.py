@@ -1,11 +1,43 @@
-from pydantic import BaseSettings, AnyHttpUrl
+from typing import List, Optional
+
+from pydantic import BaseSettings, AnyHttpUrl, root_validator
 
 
 class Settings(BaseSettings):
-    HANDICAP_QUEUE_URL: AnyHttpUrl
+    HANDICAP_QUEUE_URL: Optional[AnyHttpUrl] = None
     SEARCH_SERVICE_API_BASE_URL: AnyHttpUrl
     FOOTWEDGE_DATABASE_URI: str
+    # a JSON list, reads are spread across these when set
+    FOOTWEDGE_REPLICA_DATABASE_URIS: List[str] = []
+    # how long a User's reads stay on the primary after they write
+    REPLICA_STICKY_SECONDS: int = 10
     REDIS_URI: str
+    # the handicap service sends this as its Bearer token, service endpoints refuse every request when it's unset
+    SERVICE_API_TOKEN: Optional[str] = None
+    HANDICAP_COALESCE_SECONDS: int = 30
+    # one of sqs, redis or in_process
+    JOB_QUEUE_BACKEND: str = 'sqs'
+    JOB_QUEUE_BATCH_SIZE: int = 10
+    JOB_QUEUE_FLUSH_SECONDS: float = 0.05
+    # returns each request's statement count and DB time as headers, for non-production environments
+    QUERY_STATS_HEADERS: bool = False
+    # statements at least this slow are logged and kept for /api/admin/slow-queries
+    SLOW_QUERY_SECONDS: float = 0.5
+    # share of slow SELECTs run again under EXPLAIN (ANALYZE, BUFFERS) for their plan
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.05
+    SLOW_QUERY_TOP_N: int = 50
+    # serves golf club, golf course, tee box and hole reads from Redis
+    CATALOG_CACHE_ENABLED: bool = False
+    CATALOG_CACHE_TTL_SECONDS: int = 3600
+    # how long one worker may hold the load of a missed entry, and how long the others wait on it
+    CATALOG_CACHE_LOCK_SECONDS: float = 5
+    CATALOG_CACHE_LOCK_WAIT_SECONDS: float = 0.5
+
+    @root_validator(skip_on_failure=True)
+    def sqs_backend_requires_queue_url(cls, values):
+        if values.get('JOB_QUEUE_BACKEND') == 'sqs' and not values.get('HANDICAP_QUEUE_URL'):
+            raise ValueError("HANDICAP_QUEUE_URL is required when JOB_QUEUE_BACKEND is 'sqs'")
+        return values
 
 
 settings = Settings(_env_file='./api/.env', _env_file_encoding='utf-8')
@@ -0,0 +1,145 @@
+"""
+Captures statements that take SLOW_QUERY_SECONDS or longer, logging them with their normalized SQL
+and the repository method and endpoint that ran them. A SLOW_QUERY_EXPLAIN_RATE sample of slow
+Postgres SELECTs is run again under EXPLAIN (ANALYZE, BUFFERS) for its plan, which is only logged
+since it can quote the statement's parameters. The slowest SLOW_QUERY_TOP_N statements are kept
+for /api/admin/slow-queries, per worker process.
+"""
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from flask import has_request_context, request
+
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+_BIND_PARAMETER = re.compile(r"%\(\w+\)s|%s|\?|\$\d+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_REPEATED_ROWS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?UPDATE\b", re.IGNORECASE)
+
+
+def normalize(statement: str) -> str:
+    """
+    Reduce a statement to its shape, so runs with different parameters, IN lists of different
+    lengths and multi-row VALUES of different sizes are counted as the same statement
+    """
+    sql = _BIND_PARAMETER.sub('?', statement)
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (?)', sql)
+    sql = _REPEATED_ROWS.sub(r'\1', sql)
+    return ' '.join(sql.split())
+
+
+def repository_method() -> Optional[str]:
+    """The outermost repository method on the stack, the one the service called"""
+    method = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get('__name__', '').startswith('api.repositories.'):
+            owner = frame.f_locals.get('self')
+            name = frame.f_code.co_name
+            method = f'{type(owner).__name__}.{name}' if owner is not None else name
+        frame = frame.f_back
+    return method
+
+
+def explainable(conn, statement: str, executemany: bool) -> bool:
+    # ANALYZE runs the statement again, so only reads are explained
+    words = statement.split(None, 1)
+    return (
+        conn.dialect.name == 'postgresql'
+        and not executemany
+        and bool(words) and words[0].upper() in ('SELECT', 'WITH')
+        and not _WRITE.search(_LOCKING_CLAUSE.sub('', statement))
+    )
+
+
+def explain(conn, statement: str, parameters) -> Optional[str]:
+    """
+    Run statement under EXPLAIN (ANALYZE, BUFFERS) on the DBAPI connection inside a savepoint,
+    so a failure doesn't abort the transaction it ran in and no engine events fire
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        try:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute(f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            logger.warning(f"Unable to explain slow statement, reason: {e}")
+            return None
+        cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        return plan
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """The top_n normalized statements with the slowest single run, and their totals"""
+
+    def __init__(self, top_n: int):
+        self._top_n = top_n
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, seconds: float, repository_method: str = None, endpoint: str = None):
+        with self._lock:
+            entry = self._entries.get(sql)
+            if entry is None:
+                if len(self._entries) >= self._top_n:
+                    fastest = min(self._entries.values(), key=lambda e: e['max_seconds'])
+                    if fastest['max_seconds'] >= seconds:
+                        return
+                    del self._entries[fastest['sql']]
+                entry = self._entries[sql] = {'sql': sql, 'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+            entry['count'] += 1
+            entry['total_seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+            entry['last_seen'] = time.time()
+            entry['repository_method'] = repository_method
+            entry['endpoint'] = endpoint
+
+    def top(self) -> List[dict]:
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        return sorted(entries, key=lambda entry: entry['max_seconds'], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(top_n=settings.SLOW_QUERY_TOP_N)
+
+
+def capture(conn, statement: str, parameters, executemany: bool, seconds: float):
+    sql = normalize(statement)
+    method = repository_method()
+    endpoint = request.endpoint if has_request_context() else None
+    plan = None
+    if random.random() < settings.SLOW_QUERY_EXPLAIN_RATE and explainable(conn, statement, executemany):
+        plan = explain(conn, statement, parameters)
+
+    logger.warning(json.dumps({
+        'event': 'slow_query',
+        'seconds': round(seconds, 4),
+        'sql': sql,
+        'repository_method': method,
+        'endpoint': endpoint,
+        'plan': plan,
+    }))
+    slow_query_log.record(sql, seconds, repository_method=method, endpoint=endpoint)
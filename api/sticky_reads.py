@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+
+from flask import has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from redis.exceptions import RedisError
+
+from api.redis_client import redis_client
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = 'replica:sticky'
+
+
+def current_user_id() -> Optional[int]:
+    """
+    The User a request reads for, the identity of its access token or else the user_id in its path
+    :return: user_id or None outside of a request or if the request isn't for a User
+    """
+    if not has_request_context():
+        return None
+    return get_jwt_identity() or (request.view_args or {}).get('user_id')
+
+
+class StickyReads:
+    """
+    Remembers which Users wrote recently so their reads go to the primary until the
+    replicas have had sticky_seconds to replay the write.
+    """
+
+    def __init__(self, redis, sticky_seconds: int):
+        self._redis_client = redis
+        self._sticky_seconds = sticky_seconds
+
+    @staticmethod
+    def _sticky_key(user_id: int) -> str:
+        return f'{STICKY_KEY_PREFIX}:{user_id}'
+
+    def mark(self, user_id: Optional[int]):
+        """
+        Send a User's reads to the primary for the next sticky_seconds
+        :param: user_id
+        """
+        if user_id is None or not self._sticky_seconds:
+            return
+        try:
+            self._redis_client.set(self._sticky_key(user_id), '1', ex=self._sticky_seconds)
+        except RedisError as exc:
+            logger.warning(f"Unable to mark reads sticky for user_id: {user_id}, reason: {exc}")
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        """
+        :param: user_id
+        :return: True if the User's reads should go to the primary
+        """
+        if user_id is None or not self._sticky_seconds:
+            return False
+        try:
+            return bool(self._redis_client.exists(self._sticky_key(user_id)))
+        except RedisError as exc:
+            # fail safe, a read from the primary is never stale
+            logger.warning(f"Unable to check sticky reads for user_id: {user_id}, reason: {exc}")
+            return True
+
+
+sticky_reads = StickyReads(redis=redis_client, sticky_seconds=settings.REPLICA_STICKY_SECONDS)
@@ -0,0 +1,66 @@
+from http import HTTPStatus
+from typing import Iterable, Iterator, Optional
+
+from flask import Response, json, stream_with_context
+from marshmallow import Schema
+
+from api.pagination import STREAM_CHUNK_SIZE
+
+STREAM_MIMETYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _chunked(lines: Iterator[str], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    # one write per chunk of rows rather than per row
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _ndjson_lines(items: Iterable, schema: Schema) -> Iterator[str]:
+    for item in items:
+        yield json.dumps(schema.dump(item)) + '\n'
+
+
+def _json_lines(items: Iterable, schema: Schema, next_cursor: Optional[str]) -> Iterator[str]:
+    yield '{"status": "success", "next_cursor": ' + json.dumps(next_cursor) + ', "result": ['
+    for position, item in enumerate(items):
+        yield (', ' if position else '') + json.dumps(schema.dump(item))
+    yield ']}'
+
+
+def stream_response(
+        items: Iterable,
+        schema: Schema,
+        stream_format: str,
+        next_cursor: Optional[str] = None,
+) -> Response:
+    """
+    Serialize a collection one row at a time into a chunked response, so the rows are never
+    all held in memory at once. A json stream has the same body as the unstreamed response,
+    an ndjson stream is one serialized row per line with the next page's cursor in a header.
+    :param: items typically a streamed Page's items
+    :param: schema
+    :param: stream_format one of STREAM_MIMETYPES
+    :param: next_cursor the cursor of the next page, None on the last page
+    :return: Response
+    """
+    if stream_format == 'ndjson':
+        lines = _ndjson_lines(items, schema)
+    else:
+        lines = _json_lines(items, schema, next_cursor)
+    response = Response(
+        stream_with_context(_chunked(lines)),
+        status=HTTPStatus.OK,
+        mimetype=STREAM_MIMETYPES[stream_format],
+    )
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
@@ -1,13 +1,38 @@
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
+from itertools import groupby
+from typing import Dict, List, Sequence, Tuple
 
 from celery import Celery
 
-from api.models import (
-    GolfRound,
-    TeeBox,
-    Handicap
+from api.database import db_session, engine
+from api.handicap_kernel import (
+    from_tenths,
+    handicap_indexes,
+    in_tenths,
+    to_tenths,
 )
-from api import index
+from api.handicap_math import (
+    MIN_HANDICAP_ROUNDS,
+    calculate_differential,
+    handicap,
+)
+from api.repositories.golf_round_repository import golf_round_repo
+from api.repositories.handicap_differential_repository import handicap_differential_repo
+from api.repositories.handicap_history_repository import handicap_history_repo
+from api.repositories.handicap_repository import handicap_repo
+from api.repositories.stats_totals_repository import stats_totals_repo
+from api.repositories.tee_box_repository import tee_box_repo
+from api.schemas import HandicapHistorySchema
+from api.services.handicap_history_service import HandicapHistoryService
+from api.services.handicap_window_service import HandicapWindowService
+
+logger = logging.getLogger(__name__)
+
+BULK_USER_BATCH_SIZE = 5000
 
 
 class CeleryConfig:
@@ -28,74 +53,173 @@ celery_app = Celery('tasks')
 celery_app.config_from_object(CeleryConfig)
 
 
-def calculate_differential(gross_score, course_rating, slope):
-    differential = ((gross_score - course_rating) * 113) / slope
-    return differential
-
-
-def sample_size(num_rounds: int):
-    if num_rounds < 5:
-        print('sample size is too small, need atleast 5 rounds recorded')
-        return
-    if num_rounds <= 10:
-        size = 1
-    elif num_rounds <= 19:
-        size = 5
-    else:
-        size = 10
-
-    return size
-
-
-def determine_lowest_differentials(differentials, size):
-    num_differentials = len(differentials)
-    if size > num_differentials:
-        raise Exception('Size greater than the number of differentials')
-    elif size == num_differentials:
-        return differentials
-    else:
-        sorted_differentials = sorted(differentials)
-        lowest_differentials = sorted_differentials[:size]
-        return lowest_differentials
-
+def calculate_handicap_indexes(handicap_windows: Sequence) -> Dict[int, Decimal]:
+    """
+    Calculate the handicap index of every User in a batch of handicap windows
+    :param: handicap_windows rows from GolfRoundRepository.get_handicap_windows, grouped by user_id
+    :return: mapping of user_id to handicap index, Users with too few rounds are left out
+    """
+    # the kernel works in tenths, Users with a more precise course rating or slope take the Decimal path
+    decimal_user_ids = {
+        row.user_id for row in handicap_windows if not (in_tenths(row.course_rating) and in_tenths(row.slope))
+    }
+    kernel_rows = [row for row in handicap_windows if row.user_id not in decimal_user_ids]
+    user_ids, index_tenths = handicap_indexes(
+        user_ids=[row.user_id for row in kernel_rows],
+        gross_scores=[row.gross_score for row in kernel_rows],
+        course_ratings=to_tenths(row.course_rating for row in kernel_rows),
+        slopes=to_tenths(row.slope for row in kernel_rows),
+    )
+    indexes = {int(user_id): from_tenths(tenths) for user_id, tenths in zip(user_ids, index_tenths)}
 
-def handicap(differentials):
-    size = sample_size(num_rounds=len(differentials))
-    lowest_differentials = determine_lowest_differentials(
-        differentials=differentials,
-        size=size,
+    decimal_rows = (row for row in handicap_windows if row.user_id in decimal_user_ids)
+    for user_id, golf_rounds in groupby(decimal_rows, key=lambda row: row.user_id):
+        differentials = [
+            calculate_differential(
+                gross_score=golf_round.gross_score,
+                course_rating=golf_round.course_rating,
+                slope=golf_round.slope,
+            )
+            for golf_round in golf_rounds
+        ]
+        if len(differentials) >= MIN_HANDICAP_ROUNDS:
+            indexes[user_id] = round(handicap(differentials=differentials), 1)
+    return indexes
+
+
+def split_user_id_range(min_user_id: int, max_user_id: int, num_parts: int) -> List[Tuple[int, int]]:
+    """
+    Split an inclusive range of User ids into at most num_parts contiguous ranges
+    """
+    num_user_ids = max_user_id - min_user_id + 1
+    part_size = -(-num_user_ids // max(num_parts, 1))
+    return [
+        (start, min(start + part_size - 1, max_user_id))
+        for start in range(min_user_id, max_user_id + 1, part_size)
+    ]
+
+
+def recalculate_handicap_range(min_user_id: int, max_user_id: int, batch_size: int = BULK_USER_BATCH_SIZE) -> dict:
+    """
+    Recalculate the handicap of every User in an inclusive range of User ids,
+    one windowed read and one bulk replace per batch of User ids. Users in a batch left without
+    enough rounds for a handicap have their active Handicap closed in the same transaction
+    """
+    num_rounds = 0
+    num_handicaps = 0
+    try:
+        for batch_start in range(min_user_id, max_user_id + 1, batch_size):
+            batch_end = min(batch_start + batch_size - 1, max_user_id)
+            handicap_windows = golf_round_repo.get_handicap_windows(
+                min_user_id=batch_start,
+                max_user_id=batch_end,
+            )
+            num_rounds += len(handicap_windows)
+            indexes = calculate_handicap_indexes(handicap_windows=handicap_windows)
+            with handicap_repo.transaction():
+                num_handicaps += handicap_repo.bulk_replace(indexes=indexes)
+                handicap_repo.close_active_range(
+                    min_user_id=batch_start,
+                    max_user_id=batch_end,
+                    keep_user_ids=list(indexes),
+                )
+    finally:
+        db_session.remove()
+
+    return {'rounds': num_rounds, 'handicaps': num_handicaps}
+
+
+def _init_bulk_worker():
+    # connections inherited from the parent process can not be shared across a fork
+    engine.dispose()
+
+
+def _recalculate_handicap_range(user_id_range: Tuple[int, int]) -> dict:
+    min_user_id, max_user_id = user_id_range
+    return recalculate_handicap_range(min_user_id=min_user_id, max_user_id=max_user_id)
+
+
+def bulk_recalculate_handicaps(num_workers: int = None) -> dict:
+    """
+    Recalculate the handicap of every User, splitting the User id range across CPU cores
+    :param: num_workers number of worker processes, defaults to the number of CPUs
+    :return: totals of rounds read and handicaps written, and their throughput
+    """
+    min_user_id, max_user_id = golf_round_repo.get_user_id_range()
+    db_session.remove()
+    if min_user_id is None:
+        logger.info("No golf rounds recorded, no handicaps to recalculate")
+        return {'rounds': 0, 'handicaps': 0, 'seconds': 0.0}
+
+    num_workers = num_workers or os.cpu_count() or 1
+    user_id_ranges = split_user_id_range(min_user_id, max_user_id, num_workers)
+    engine.dispose()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_bulk_worker) as executor:
+        results = list(executor.map(_recalculate_handicap_range, user_id_ranges))
+    elapsed = time.perf_counter() - start
+
+    totals = {
+        'rounds': sum(result['rounds'] for result in results),
+        'handicaps': sum(result['handicaps'] for result in results),
+        'seconds': elapsed,
+    }
+    logger.info(
+        f"Recalculated {totals['handicaps']} handicaps from {totals['rounds']} golf rounds "
+        f"in {elapsed:.2f}s with {num_workers} workers: "
+        f"{totals['rounds'] / elapsed:.0f} rounds/sec, {totals['handicaps'] / elapsed:.0f} handicaps/sec"
+    )
+    return totals
+
+
+def rebuild_handicap_histories() -> int:
+    """
+    Rebuild the handicap history of every User that has recorded a GolfRound,
+    used to backfill the history of rounds recorded before it was maintained
+    :return: number of HandicapHistory records written
+    """
+    service = HandicapHistoryService(
+        repo=handicap_history_repo,
+        golf_round_repo=golf_round_repo,
+        schema=HandicapHistorySchema(),
     )
-    return (sum(lowest_differentials)/len(lowest_differentials)) * Decimal('0.96')
+    num_entries = 0
+    try:
+        for user_id in golf_round_repo.get_user_ids():
+            num_entries += service.refresh(user_id=user_id)
+    finally:
+        db_session.remove()
+    return num_entries
+
+
+def rebuild_stats_totals() -> int:
+    """
+    Rebuild the career and season stats totals of every User from their GolfRoundStats,
+    used to backfill the totals of rounds recorded before they were maintained
+    :return: number of StatsTotals records written
+    """
+    try:
+        num_totals = stats_totals_repo.rebuild()
+    finally:
+        db_session.remove()
+    logger.info(f"Rebuilt {num_totals} stats totals")
+    return num_totals
 
 
 @celery_app.task
 def calculate_usga_handicap(*args, **kwargs):
     user_id, *_ = args
-    differentials = []
-    with index.app.app_context():
-        ordered_golf_rounds = GolfRound.get_by_user_id(user_id=user_id)
-        if len(ordered_golf_rounds) > 20:
-            golf_rounds = ordered_golf_rounds[:20]
+    service = HandicapWindowService(
+        repo=handicap_differential_repo,
+        golf_round_repo=golf_round_repo,
+        tee_box_repo=tee_box_repo,
+    )
+    try:
+        handicap_index = service.handicap_index(user_id=user_id)
+        if handicap_index is None:
+            handicap_repo.close_active(user_id=user_id)
         else:
-            golf_rounds = ordered_golf_rounds
-
-        for golf_round in golf_rounds:
-            tee_box = TeeBox.get_by_id(tee_box_id=golf_round.tee_box_id)
-            differential = calculate_differential(
-                gross_score=golf_round.gross_score,
-                course_rating=tee_box.course_rating,
-                slope=tee_box.slope,
-            )
-            differentials.append(differential)
-
-        handicap_index = handicap(differentials=differentials)
-
-        current_handicap = Handicap.get_active(user_id=user_id)
-        if current_handicap:
-            current_handicap.close()
-
-        Handicap(
-            user_id=user_id,
-            index=handicap_index,
-            authorized_association='USGA'
-        ).save()
+            handicap_repo.bulk_replace(indexes={user_id: handicap_index})
+    finally:
+        db_session.remove()
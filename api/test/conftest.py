@@ -1,7 +1,11 @@
 from datetime import datetime, date
 
 import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
 
+from api.database import Base, db_session, engine
 from api.index import create_app
 from api.models import (
     Hole,
@@ -9,12 +13,29 @@ from api.models import (
     GolfCourse,
     GolfClub,
     GolfRound,
+    GolfRoundStats,
+    Handicap,
+    HandicapDifferential,
+    HandicapHistory,
+    StatsTotals,
+    User,
 )
+from api.query_stats import QUERY_COUNT_HEADER
+from api.settings import settings
+
+PAR_3_HOLES = (3, 7, 12, 16)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "integration"
+    )
 
 
 class TestAppConfig:
     TESTING = True
     APP_NAME = "test-footwedge"
+    JWT_SECRET_KEY = "test-footwedge-secret"
 
 
 @pytest.fixture
@@ -543,3 +564,157 @@ def golf_round_post_body_factory(golf_course_id, tee_box_id):
             "played_on": played_on,
         }
     return _golf_round_post_body_factory
+
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine('sqlite://')
+
+    @event.listens_for(engine, 'connect')
+    def attach_public_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    tables = [model.__table__ for model in (
+        User,
+        GolfClub,
+        GolfCourse,
+        TeeBox,
+        Hole,
+        GolfRound,
+        GolfRoundStats,
+        Handicap,
+        HandicapDifferential,
+        HandicapHistory,
+        StatsTotals,
+    )]
+    Base.metadata.create_all(engine, tables=tables)
+    # configured like db_session
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def count_queries(sqlite_session):
+    queries = []
+    event.listen(sqlite_session.bind, 'before_cursor_execute', lambda *args: queries.append(args[2]))
+    return queries
+
+
+@pytest.fixture
+def sqlite_db(sqlite_session):
+    """Points db_session, and so every repository, at the database of sqlite_session"""
+    db_session.remove()
+    db_session.configure(bind=sqlite_session.bind)
+    yield sqlite_session
+    db_session.remove()
+    db_session.configure(bind=engine)
+
+
+@pytest.fixture
+def access_token(app):
+    def _access_token(user_id: int) -> dict:
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+    return _access_token
+
+
+@pytest.fixture
+def service_token(monkeypatch) -> dict:
+    """The headers of a request from another service"""
+    monkeypatch.setattr(settings, 'SERVICE_API_TOKEN', 'test-service-token')
+    return {'Authorization': 'Bearer test-service-token'}
+
+
+@pytest.fixture
+def query_budget(monkeypatch):
+    """
+    Asserts a response's request ran at most max_queries SQL statements
+
+        query_budget(client.get('/api/golf-clubs/'), max_queries=3)
+    """
+    monkeypatch.setattr(settings, 'QUERY_STATS_HEADERS', True)
+
+    def _query_budget(response, max_queries: int):
+        num_queries = int(response.headers[QUERY_COUNT_HEADER])
+        assert num_queries <= max_queries, \
+            f"Expecting at most {max_queries} queries, the request ran {num_queries}"
+        return num_queries
+    return _query_budget
+
+
+@pytest.fixture
+def golf_course(sqlite_session):
+    """Two Users and an 18 hole course with its par 3s on PAR_3_HOLES, hole ids are the hole numbers"""
+    sqlite_session.add(GolfClub(name='Olympia Fields', golf_courses=[GolfCourse(name='North', num_holes=18)]))
+    sqlite_session.add(TeeBox(
+        golf_course_id=1, tee_color='blue', par=70, distance=6800, unit='yards', course_rating=72, slope=130,
+    ))
+    sqlite_session.add_all([
+        User(email=f'golfer{n}@footwedge.com', password='password', first_name='Golfer', last_name=f'Number {n}')
+        for n in (1, 2)
+    ])
+    sqlite_session.commit()
+    sqlite_session.execute(Hole.__table__.insert(), [
+        {
+            'golf_course_id': 1,
+            'tee_box_id': 1,
+            'hole_number': hole_number,
+            'par': 3 if hole_number in PAR_3_HOLES else 4,
+            'handicap': hole_number,
+            'distance': 400,
+            'unit': 'yards',
+        }
+        for hole_number in range(1, 19)
+    ])
+    sqlite_session.commit()
+
+
+def hole_stats(golf_round_id: int, hole_number: int) -> dict:
+    # pars on the first 4 holes, one putt each, after 2 chips and a greenside bunker shot
+    par = 3 if hole_number in PAR_3_HOLES else 4
+    return {
+        'golf_round_id': golf_round_id,
+        'hole_id': hole_number,
+        'gross_score': par if hole_number <= 4 else par + 1,
+        'fairway_hit': None if par == 3 else hole_number % 2 == 0,
+        'green_in_regulation': hole_number > 4,
+        'putts': 1 if hole_number <= 4 else 2,
+        'chips': 1 if hole_number in (1, 2) else 0,
+        'greenside_sand_shots': 1 if hole_number == 3 else 0,
+        'penalties': 0,
+    }
+
+
+@pytest.fixture
+def add_stats(sqlite_session, golf_course):
+    """Adds the hole_stats of hole_numbers to a GolfRound, returning their ids"""
+    def _add_stats(golf_round_id: int, hole_numbers=range(1, 19)) -> list:
+        return [
+            sqlite_session.execute(
+                GolfRoundStats.__table__.insert().values(hole_stats(golf_round_id=golf_round_id, hole_number=number))
+            ).inserted_primary_key[0]
+            for number in hole_numbers
+        ]
+    return _add_stats
+
+
+@pytest.fixture
+def add_rounds(sqlite_session, add_stats):
+    """Adds GolfRounds with the hole_stats of hole_numbers, returning their ids"""
+    def _add_rounds(
+            user_id: int,
+            num_rounds: int = 1,
+            hole_numbers=range(1, 19),
+            played_on: date = date(2021, 5, 1),
+    ) -> list:
+        golf_round_ids = []
+        for _ in range(num_rounds):
+            golf_round_id = sqlite_session.execute(GolfRound.__table__.insert().values(
+                golf_course_id=1, tee_box_id=1, user_id=user_id, gross_score=86, played_on=played_on,
+            )).inserted_primary_key[0]
+            add_stats(golf_round_id=golf_round_id, hole_numbers=hole_numbers)
+            golf_round_ids.append(golf_round_id)
+        sqlite_session.commit()
+        return golf_round_ids
+    return _add_rounds
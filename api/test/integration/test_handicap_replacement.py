@@ -0,0 +1,80 @@
+"""
+Hammers HandicapRepository.replace_active for one User from many threads and checks the User is
+left with exactly one active Handicap, without any replacement failing. Needs
+FOOTWEDGE_TEST_DATABASE_URI to point at a Postgres database the handicap tables can be created in.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from api.models import Handicap, User
+from api.repositories.handicap_repository import HandicapRepository
+
+TEST_DATABASE_URI = os.environ.get('FOOTWEDGE_TEST_DATABASE_URI')
+NUM_THREADS = 16
+REPLACEMENTS_PER_THREAD = 25
+# replacements per second the threads together have to sustain
+MIN_THROUGHPUT = float(os.environ.get('FOOTWEDGE_TEST_MIN_HANDICAP_THROUGHPUT', 50))
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not TEST_DATABASE_URI, reason="FOOTWEDGE_TEST_DATABASE_URI is not set"),
+]
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = create_engine(TEST_DATABASE_URI, pool_size=NUM_THREADS)
+    User.__table__.create(engine, checkfirst=True)
+    Handicap.__table__.create(engine, checkfirst=True)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def user_id(engine):
+    user_id = engine.execute(
+        User.__table__.insert().values(
+            email=f'replace-active-{time.time_ns()}@footwedge.com',
+            password_hash='hash',
+            first_name='Golfer',
+            last_name='Stress',
+            role='standard_user',
+            created_ts=datetime.utcnow(),
+        ).returning(User.id)
+    ).scalar()
+    yield user_id
+    engine.execute(Handicap.__table__.delete().where(Handicap.user_id == user_id))
+    engine.execute(User.__table__.delete().where(User.id == user_id))
+
+
+def test_concurrent_replacements_leave_one_active_handicap(engine, user_id):
+    session = scoped_session(sessionmaker(bind=engine, autoflush=False, expire_on_commit=False))
+    handicap_repo = HandicapRepository(model=Handicap)
+    handicap_repo.db_session = session
+
+    def replace(thread_number: int):
+        try:
+            for n in range(REPLACEMENTS_PER_THREAD):
+                handicap_repo.replace_active(user_id=user_id, index=Decimal(f'{thread_number}.{n}'))
+        finally:
+            session.remove()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        # list() re-raises the first failed replacement
+        list(executor.map(replace, range(NUM_THREADS)))
+    throughput = NUM_THREADS * REPLACEMENTS_PER_THREAD / (time.perf_counter() - started)
+
+    handicaps = engine.execute(
+        Handicap.__table__.select().where(Handicap.user_id == user_id)
+    ).fetchall()
+    assert len(handicaps) == NUM_THREADS * REPLACEMENTS_PER_THREAD
+    assert len([handicap for handicap in handicaps if handicap.record_end_date is None]) == 1
+    assert throughput >= MIN_THROUGHPUT, f"Only {throughput:.0f} replacements per second"
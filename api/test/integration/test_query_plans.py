@@ -0,0 +1,243 @@
+"""
+Runs EXPLAIN on the SQL every repository lookup issues and fails if Postgres would answer
+any of it with a sequential scan. Needs FOOTWEDGE_TEST_DATABASE_URI to point at an empty
+Postgres database, the tables are created and seeded inside a transaction that is rolled back.
+"""
+import json
+import os
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from api.database import Base
+from api.pagination import PageRequest
+from api.repositories.golf_club_repository import GolfClubRepository
+from api.repositories.golf_course_repository import GolfCourseRepository
+from api.repositories.golf_round_repository import GolfRoundRepository
+from api.repositories.golf_round_stats_repository import GolfRoundStatsRepository
+from api.repositories.handicap_differential_repository import HandicapDifferentialRepository
+from api.repositories.handicap_history_repository import HandicapHistoryRepository
+from api.repositories.handicap_repository import HandicapRepository
+from api.repositories.hole_repository import HoleRepository
+from api.repositories.stats_totals_repository import StatsTotalsRepository
+from api.repositories.tee_box_repository import TeeBoxRepository
+from api.repositories.user_repository import UserRepository
+from api.models import (
+    GolfClub,
+    GolfCourse,
+    GolfRound,
+    GolfRoundStats,
+    Handicap,
+    HandicapDifferential,
+    HandicapHistory,
+    Hole,
+    StatsTotals,
+    TeeBox,
+    User,
+)
+
+TEST_DATABASE_URI = os.environ.get('FOOTWEDGE_TEST_DATABASE_URI')
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not TEST_DATABASE_URI, reason="FOOTWEDGE_TEST_DATABASE_URI is not set"),
+]
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO public."user" (email, password_hash, first_name, last_name, role, created_ts)
+    SELECT 'golfer' || n || '@footwedge.com', 'hash', 'Golfer', 'Number ' || n, 'standard_user', now()
+    FROM generate_series(1, 500) n
+    """,
+    """
+    INSERT INTO public.golf_club (name, created_ts)
+    SELECT 'Golf Club ' || n, now() FROM generate_series(1, 100) n
+    """,
+    """
+    INSERT INTO public.golf_course (golf_club_id, name, num_holes, created_ts)
+    SELECT golf_club.id, 'Course ' || n, 18, now()
+    FROM public.golf_club CROSS JOIN generate_series(1, 2) n
+    """,
+    """
+    INSERT INTO public.tee_box (golf_course_id, tee_color, par, distance, unit, course_rating, slope, created_ts)
+    SELECT golf_course.id, tee_color, 72, 6800, 'yards', 72.1, 130, now()
+    FROM public.golf_course CROSS JOIN unnest(ARRAY['blue', 'white']) tee_color
+    """,
+    """
+    INSERT INTO public.hole (golf_course_id, tee_box_id, hole_number, par, handicap, distance, unit, created_ts)
+    SELECT tee_box.golf_course_id, tee_box.id, n, 4, n, 400, 'yards', now()
+    FROM public.tee_box CROSS JOIN generate_series(1, 18) n
+    """,
+    """
+    WITH tee_boxes AS (
+        SELECT array_agg(id ORDER BY id) AS ids, array_agg(golf_course_id ORDER BY id) AS golf_course_ids,
+               count(*)::int AS num_tee_boxes
+        FROM public.tee_box
+    )
+    INSERT INTO public.golf_round (golf_course_id, tee_box_id, user_id, gross_score, towards_handicap, played_on, created_ts)
+    SELECT tee_boxes.golf_course_ids[1 + (u.id + n) % num_tee_boxes], tee_boxes.ids[1 + (u.id + n) % num_tee_boxes],
+           u.id, 70 + n % 30, n % 10 <> 0, date '2020-01-01' + n * 7, now()
+    FROM public."user" u CROSS JOIN generate_series(1, 40) n CROSS JOIN tee_boxes
+    """,
+    """
+    INSERT INTO public.golf_round_stats (golf_round_id, hole_id, gross_score, green_in_regulation, putts, chips,
+                                         greenside_sand_shots, penalties, created_ts)
+    SELECT golf_round.id, hole.id, 4, true, 2, 0, 0, 0, now()
+    FROM public.golf_round JOIN public.hole ON hole.tee_box_id = golf_round.tee_box_id
+    WHERE golf_round.user_id IN (SELECT id FROM public."user" ORDER BY id LIMIT 50)
+    """,
+    """
+    INSERT INTO public.handicap (user_id, index, authorized_association, record_start_date, record_end_date)
+    SELECT u.id, 10.0, 'USGA', timestamp '2020-01-01' + n * interval '30 days',
+           CASE WHEN n < 10 THEN timestamp '2020-01-01' + (n + 1) * interval '30 days' END
+    FROM public."user" u CROSS JOIN generate_series(1, 10) n
+    """,
+    """
+    INSERT INTO public.handicap_differential (golf_round_id, user_id, golf_course_id, tee_box_id, gross_score,
+                                              played_on, course_rating, slope, differential, created_ts)
+    SELECT id, user_id, golf_course_id, tee_box_id, gross_score, played_on, 72.1, 130,
+           round((gross_score - 72.1) * 113 / 130, 1), now()
+    FROM public.golf_round WHERE towards_handicap
+    """,
+    """
+    INSERT INTO public.handicap_history (golf_round_id, user_id, played_on, differential)
+    SELECT golf_round_id, user_id, played_on, differential FROM public.handicap_differential
+    """,
+]
+TABLES = [
+    model.__table__
+    for model in (
+        User,
+        GolfClub,
+        GolfCourse,
+        TeeBox,
+        Hole,
+        GolfRound,
+        GolfRoundStats,
+        Handicap,
+        HandicapDifferential,
+        HandicapHistory,
+        StatsTotals,
+    )
+]
+
+
+@pytest.fixture(scope='module')
+def connection():
+    engine = create_engine(TEST_DATABASE_URI)
+    connection = engine.connect()
+    transaction = connection.begin()
+    Base.metadata.create_all(connection, tables=TABLES)
+    for statement in SEED_STATEMENTS:
+        connection.execute(text(statement))
+    connection.execute(text('ANALYZE'))
+    # a sequential scan is then only planned when no index can answer the query
+    connection.execute(text('SET LOCAL enable_seqscan = off'))
+    yield connection
+    transaction.rollback()
+    connection.close()
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def ids(connection) -> dict:
+    user_id, golf_round_id = connection.execute(
+        'SELECT golf_round.user_id, golf_round.id FROM public.golf_round '
+        'JOIN public.golf_round_stats ON golf_round_stats.golf_round_id = golf_round.id LIMIT 1'
+    ).first()
+    tee_box_id, golf_course_id, golf_club_id = connection.execute(
+        'SELECT tee_box.id, golf_course.id, golf_course.golf_club_id FROM public.tee_box '
+        'JOIN public.golf_course ON golf_course.id = tee_box.golf_course_id ORDER BY tee_box.id DESC LIMIT 1'
+    ).first()
+    return {
+        'user_id': user_id,
+        'golf_round_id': golf_round_id,
+        'tee_box_id': tee_box_id,
+        'golf_course_id': golf_course_id,
+        'golf_club_id': golf_club_id,
+    }
+
+
+def repository(repository_class, model, session):
+    repo = repository_class(model=model)
+    repo.db_session = session
+    return repo
+
+
+LOOKUPS = {
+    'user.get_by_email': lambda session, ids: repository(UserRepository, User, session).get_by_email(
+        email='golfer250@footwedge.com'),
+    'golf_club.get_all': lambda session, ids: repository(GolfClubRepository, GolfClub, session).get_all(
+        page_request=PageRequest(limit=10)),
+    'golf_course.get_by_golf_club_id': lambda session, ids: repository(
+        GolfCourseRepository, GolfCourse, session).get_by_golf_club_id(
+        golf_club_id=ids['golf_club_id'], page_request=PageRequest()),
+    'tee_box.get_by_golf_course_id': lambda session, ids: repository(
+        TeeBoxRepository, TeeBox, session).get_by_golf_course_id(
+        golf_course_id=ids['golf_course_id'], page_request=PageRequest()),
+    'hole.get_by_tee_box_id': lambda session, ids: repository(HoleRepository, Hole, session).get_by_tee_box_id(
+        tee_box_id=ids['tee_box_id'], page_request=PageRequest()),
+    'hole.get_by_golf_course_id': lambda session, ids: repository(
+        HoleRepository, Hole, session).get_by_golf_course_id(golf_course_id=ids['golf_course_id']),
+    'golf_round.get_by_user_id': lambda session, ids: repository(
+        GolfRoundRepository, GolfRound, session).get_by_user_id(user_id=ids['user_id'], page_request=PageRequest()),
+    'golf_round.get_handicap_window': lambda session, ids: repository(
+        GolfRoundRepository, GolfRound, session).get_handicap_window(user_id=ids['user_id']),
+    'golf_round.get_handicap_rounds': lambda session, ids: repository(
+        GolfRoundRepository, GolfRound, session).get_handicap_rounds(
+        user_id=ids['user_id'], played_on_from=date(2020, 6, 1)),
+    'golf_round.get_handicap_windows': lambda session, ids: repository(
+        GolfRoundRepository, GolfRound, session).get_handicap_windows(
+        min_user_id=ids['user_id'], max_user_id=ids['user_id'] + 10),
+    'golf_round_stats.get_by_golf_round_id': lambda session, ids: repository(
+        GolfRoundStatsRepository, GolfRoundStats, session).get_by_golf_round_id(golf_round_id=ids['golf_round_id']),
+    'golf_round_stats.get_summaries_by_user_id': lambda session, ids: repository(
+        GolfRoundStatsRepository, GolfRoundStats, session).get_summaries_by_user_id(user_id=ids['user_id']),
+    'stats_totals.get_for_period': lambda session, ids: repository(
+        StatsTotalsRepository, StatsTotals, session).get_for_period(user_id=ids['user_id'], period='2021'),
+    'handicap.get_active': lambda session, ids: repository(
+        HandicapRepository, Handicap, session).get_active(user_id=ids['user_id']),
+    'handicap.get_by_date': lambda session, ids: repository(
+        HandicapRepository, Handicap, session).get_by_date(user_id=ids['user_id'], start_date=datetime(2020, 6, 1)),
+    'handicap.get_all_by_user': lambda session, ids: repository(
+        HandicapRepository, Handicap, session).get_all_by_user(user_id=ids['user_id']),
+    'handicap_differential.get_by_user_id': lambda session, ids: repository(
+        HandicapDifferentialRepository, HandicapDifferential, session).get_by_user_id(user_id=ids['user_id'], limit=20),
+    'handicap_history.get_range': lambda session, ids: repository(
+        HandicapHistoryRepository, HandicapHistory, session).get_range(
+        user_id=ids['user_id'], start_date=date(2020, 6, 1), page_request=PageRequest()),
+}
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+@pytest.mark.parametrize('lookup', sorted(LOOKUPS))
+def test_repository_lookup_uses_an_index(connection, ids, lookup):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    session = Session(bind=connection)
+    event.listen(connection, 'before_cursor_execute', capture)
+    try:
+        LOOKUPS[lookup](session, ids)
+    finally:
+        event.remove(connection, 'before_cursor_execute', capture)
+        session.close()
+
+    assert statements, f"Expecting {lookup} to query the database"
+    for statement, parameters in statements:
+        # statement is already in the driver's paramstyle, so it is executed as a plain string
+        explain = connection.execute(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+        plan = explain if isinstance(explain, list) else json.loads(explain)
+        seq_scans = [
+            node.get('Relation Name') for node in plan_nodes(plan[0]['Plan']) if node['Node Type'] == 'Seq Scan'
+        ]
+        assert not seq_scans, f"{lookup} sequentially scans {', '.join(seq_scans)}:\n{statement}"
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.catalog_cache import CatalogCache
+from api.models import User
+from api.slow_queries import slow_query_log
+
+
+@pytest.fixture
+def admin_user_id(sqlite_db, golf_course):
+    admin = User(email='admin@footwedge.com', password='password', first_name='Club', last_name='Admin')
+    admin.role = 'admin'
+    sqlite_db.add(admin)
+    sqlite_db.commit()
+    return admin.id
+
+
+@pytest.fixture
+def slow_queries():
+    slow_query_log.clear()
+    slow_query_log.record('SELECT * FROM public.hole WHERE tee_box_id = ?', 0.9, 'HoleRepository.get_by_tee_box_id')
+    slow_query_log.record('SELECT * FROM public.golf_club', 1.4, 'GolfClubRepository.get_all')
+    yield
+    slow_query_log.clear()
+
+
+def test_slow_queries_are_slowest_first(client, access_token, admin_user_id, slow_queries):
+    resp = client.get('/api/admin/slow-queries', headers=access_token(admin_user_id))
+
+    assert resp.status_code == HTTPStatus.OK
+    assert [entry['repository_method'] for entry in resp.get_json()['result']] == [
+        'GolfClubRepository.get_all',
+        'HoleRepository.get_by_tee_box_id',
+    ]
+
+
+def test_slow_queries_can_be_cleared(client, access_token, admin_user_id, slow_queries):
+    resp = client.delete('/api/admin/slow-queries', headers=access_token(admin_user_id))
+
+    assert resp.status_code == HTTPStatus.OK
+    assert slow_query_log.top() == []
+
+
+def test_slow_queries_are_for_admins_only(client, access_token, admin_user_id, slow_queries):
+    resp = client.get('/api/admin/slow-queries', headers=access_token(1))
+
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+    assert len(slow_query_log.top()) == 2
+
+
+def test_slow_queries_require_a_token(client, slow_queries):
+    assert client.get('/api/admin/slow-queries').status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_catalog_cache_stats(client, access_token, admin_user_id, monkeypatch):
+    cache = CatalogCache(redis=None, ttl_seconds=60)
+    cache._count('golf_club', 'hit')
+    monkeypatch.setattr('api.controllers.admin.catalog_cache', cache)
+
+    resp = client.get('/api/admin/catalog-cache', headers=access_token(admin_user_id))
+
+    assert resp.get_json()['result'] == {'golf_club': {'hit': 1}}
+    assert client.get('/api/admin/catalog-cache', headers=access_token(1)).status_code == HTTPStatus.FORBIDDEN
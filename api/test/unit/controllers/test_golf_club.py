@@ -1,7 +1,7 @@
 import json
 import copy
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from http import HTTPStatus
 
 from api.schemas import (
@@ -9,6 +9,8 @@ from api.schemas import (
     GolfCourseSchema,
 )
 from api.models import GolfCourse
+from api.pagination import Page
+from api.controllers.golf_club import golf_club_schema, golf_course_schema
 
 GOLF_CLUB_REPO_IMPORT_PATH = "api.controllers.golf_club.golf_club_repo"
 GOLF_COURSE_REPO_IMPORT_PATH = "api.controllers.golf_club.golf_course_repo"
@@ -25,10 +27,10 @@ class TestGolfClubController:
             random_golf_club_model_with_golf_course,
             golf_club_model_no_golf_course,
     ):
-        mock_golf_club_repo.get_all.return_value = [
-            random_golf_club_model_with_golf_course,
-            golf_club_model_no_golf_course
-        ]
+        mock_golf_club_repo.get_all.return_value = Page(
+            items=[random_golf_club_model_with_golf_course, golf_club_model_no_golf_course],
+            next_cursor=None,
+        )
 
         resp = client.get("/api/golf-clubs/")
 
@@ -38,6 +40,86 @@ class TestGolfClubController:
         assert len(resp.json['result']) == 2, "Expecting there to be 2 golf clubs returned"
         assert mock_golf_club_repo.get_all.called, "Expecting golf_club_repo.get_all to be called"
 
+    @patch(GOLF_CLUB_REPO_IMPORT_PATH)
+    def test_get_golf_clubs_page(
+            self,
+            mock_golf_club_repo,
+            client,
+            golf_club_model_no_golf_course,
+    ):
+        mock_golf_club_repo.get_all.return_value = Page(items=[golf_club_model_no_golf_course], next_cursor='next')
+
+        resp = client.get("/api/golf-clubs/?limit=1&cursor=current")
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json['next_cursor'] == 'next'
+        page_request = mock_golf_club_repo.get_all.call_args.kwargs['page_request']
+        assert (page_request.cursor, page_request.limit) == ('current', 1)
+
+    @patch(GOLF_CLUB_REPO_IMPORT_PATH)
+    def test_get_golf_clubs_invalid_limit(self, mock_golf_club_repo, client):
+        resp = client.get("/api/golf-clubs/?limit=0")
+
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+        assert resp.json['status'] == 'fail'
+        assert not mock_golf_club_repo.get_all.called, "Expecting golf_club_repo.get_all not to be called"
+
+    @patch(GOLF_CLUB_REPO_IMPORT_PATH)
+    def test_stream_golf_clubs(
+            self,
+            mock_golf_club_repo,
+            client,
+            random_golf_club_model_with_golf_course,
+            golf_club_model_no_golf_course,
+    ):
+        golf_clubs = [random_golf_club_model_with_golf_course, golf_club_model_no_golf_course]
+        mock_golf_club_repo.get_all.return_value = Page(items=iter(golf_clubs), next_cursor=None)
+
+        resp = client.get("/api/golf-clubs/?stream=json")
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.is_streamed, "Expecting the golf clubs to be streamed"
+        assert resp.json == {
+            'status': 'success',
+            'result': golf_club_schema.dump(golf_clubs, many=True),
+            'next_cursor': None,
+        }
+
+    @patch(GOLF_CLUB_REPO_IMPORT_PATH)
+    def test_stream_golf_clubs_ndjson(
+            self,
+            mock_golf_club_repo,
+            client,
+            random_golf_club_model_with_golf_course,
+            golf_club_model_no_golf_course,
+    ):
+        golf_clubs = [random_golf_club_model_with_golf_course, golf_club_model_no_golf_course]
+        mock_golf_club_repo.get_all.return_value = Page(items=iter(golf_clubs), next_cursor=None)
+
+        resp = client.get("/api/golf-clubs/?stream=ndjson")
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.mimetype == 'application/x-ndjson'
+        lines = resp.get_data(as_text=True).splitlines()
+        assert [json.loads(line) for line in lines] == golf_club_schema.dump(golf_clubs, many=True)
+
+    @patch(GOLF_CLUB_REPO_IMPORT_PATH)
+    def test_stream_golf_clubs_next_page(self, mock_golf_club_repo, client, golf_club_model_no_golf_course):
+        mock_golf_club_repo.get_all.return_value = Page(items=iter([golf_club_model_no_golf_course]), next_cursor='abc')
+
+        json_resp = client.get("/api/golf-clubs/?stream=json&limit=1")
+        ndjson_resp = client.get("/api/golf-clubs/?stream=ndjson&limit=1")
+
+        assert json_resp.json['next_cursor'] == 'abc'
+        assert ndjson_resp.headers['X-Next-Cursor'] == 'abc'
+        page_request = mock_golf_club_repo.get_all.call_args.kwargs['page_request']
+        assert page_request.limit == 1
+
+    def test_stream_golf_clubs_unknown_format(self, client):
+        resp = client.get("/api/golf-clubs/?stream=xml")
+
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+
     @patch(GOLF_CLUB_REPO_IMPORT_PATH)
     def test_get_golf_clubs_by_id(
             self,
@@ -54,7 +136,7 @@ class TestGolfClubController:
             f"GET {path} failed with status_code = {resp.status_code}, " \
             f"expected to receive a status_code: {HTTPStatus.OK}"
         assert mock_golf_club_repo.get.called, "Expecting golf_club_repo.get to be called"
-        mock_golf_club_repo.get.assert_called_with(golf_club_id)
+        mock_golf_club_repo.get.assert_called_with(golf_club_id, schema=golf_club_schema)
 
     @patch(f"{SEARCH_SERVICE_IMPORT_PATH}.add_golf_club")
     @patch(GOLF_CLUB_REPO_IMPORT_PATH)
@@ -115,7 +197,7 @@ class TestGolfClubController:
             golf_course_model,
             client,
     ):
-        mock_golf_course_repo.get_by_golf_club_id.return_value = [golf_course_model]
+        mock_golf_course_repo.get_by_golf_club_id.return_value = Page(items=[golf_course_model], next_cursor=None)
         path = f"/api/golf-clubs/{golf_club_id}/golf-courses"
         resp = client.get(path)
 
@@ -127,6 +209,8 @@ class TestGolfClubController:
             "Expecting golf_course_repo.get_by_golf_club_id to be called"
         mock_golf_course_repo.get_by_golf_club_id.assert_called_with(
             golf_club_id=golf_club_id,
+            schema=golf_course_schema,
+            page_request=ANY,
         )
 
     @patch(GOLF_COURSE_REPO_IMPORT_PATH)
@@ -138,10 +222,10 @@ class TestGolfClubController:
             olympia_fields_south_course,
             client,
     ):
-        mock_golf_course_repo.get_by_golf_club_id.return_value = [
-            olympia_fields_north_course,
-            olympia_fields_south_course,
-        ]
+        mock_golf_course_repo.get_by_golf_club_id.return_value = Page(
+            items=[olympia_fields_north_course, olympia_fields_south_course],
+            next_cursor=None,
+        )
         path = f"/api/golf-clubs/{olympia_fields_golf_club_id}/golf-courses"
         resp = client.get(path)
 
@@ -153,6 +237,8 @@ class TestGolfClubController:
             "Expecting golf_course_repo.get_by_golf_club_id to be called"
         mock_golf_course_repo.get_by_golf_club_id.assert_called_with(
             golf_club_id=olympia_fields_golf_club_id,
+            schema=golf_course_schema,
+            page_request=ANY,
         )
 
     @patch(f"{SEARCH_SERVICE_IMPORT_PATH}.add_golf_course")
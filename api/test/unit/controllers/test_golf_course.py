@@ -1,10 +1,13 @@
 import json
 import copy
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from http import HTTPStatus
 
 import pytest
 
+from api.controllers.golf_course import golf_course_schema
+from api.pagination import Page
+
 GOLF_COURSE_REPO_IMPORT_PATH = "api.controllers.golf_course.golf_course_repo"
 TEE_BOX_REPO_IMPORT_PATH = "api.controllers.golf_course.tee_box_repo"
 HOLE_REPO_IMPORT_PATH = "api.controllers.golf_course.hole_repo"
@@ -19,7 +22,7 @@ class TestGolfCourseController:
             client,
             golf_course_model,
     ):
-        mock_golf_course_repo.get_all.return_value = [golf_course_model]
+        mock_golf_course_repo.get_all.return_value = Page(items=[golf_course_model], next_cursor=None)
 
         path = "/api/golf-courses/"
         resp = client.get(path)
@@ -52,7 +55,7 @@ class TestGolfCourseController:
             f"expected to receive a status_code: {HTTPStatus.OK}"
         assert mock_golf_course_repo.get_by_ids.called, "Expecting golf_course_repo.get_by_ids to be called"
         expected_ids = [str(olympia_fields_north_course_id), str(olympia_fields_south_course_id)]
-        mock_golf_course_repo.get_by_ids.assert_called_with(ids=expected_ids)
+        mock_golf_course_repo.get_by_ids.assert_called_with(ids=expected_ids, schema=golf_course_schema)
 
     @patch(GOLF_COURSE_REPO_IMPORT_PATH)
     def test_get_golf_courses_by_id(
@@ -70,7 +73,7 @@ class TestGolfCourseController:
             f"GET {path} failed with status_code = {resp.status_code}, " \
             f"expected to receive a status_code: {HTTPStatus.OK}"
         assert mock_golf_course_repo.get.called, "Expecting golf_course_repo.get_by_ids to be called"
-        mock_golf_course_repo.get.assert_called_with(olympia_fields_north_course_id)
+        mock_golf_course_repo.get.assert_called_with(olympia_fields_north_course_id, schema=golf_course_schema)
 
     @patch(GOLF_COURSE_REPO_IMPORT_PATH)
     def test_delete_golf_courses_by_id(
@@ -97,7 +100,7 @@ class TestGolfCourseController:
             golf_course_id,
             blue_tee_box,
     ):
-        mock_tee_box_repo.get_by_golf_course_id.return_value = [blue_tee_box]
+        mock_tee_box_repo.get_by_golf_course_id.return_value = Page(items=[blue_tee_box], next_cursor=None)
         path = f"/api/golf-courses/{golf_course_id}/tee-boxes"
         resp = client.get(path)
 
@@ -107,7 +110,7 @@ class TestGolfCourseController:
         assert len(resp.json['result']) == 1, "Expecting there to be 1 tee-box returned"
         assert mock_tee_box_repo.get_by_golf_course_id.called, \
             "Expecting tee_box_repo.get_by_golf_course_id to be called"
-        mock_tee_box_repo.get_by_golf_course_id.assert_called_with(golf_course_id=golf_course_id)
+        mock_tee_box_repo.get_by_golf_course_id.assert_called_with(golf_course_id=golf_course_id, page_request=ANY)
 
     def test_add_tee_box_no_content_header(
             self,
@@ -226,7 +229,7 @@ class TestGolfCourseController:
             tee_box_id,
             holes_18,
     ):
-        mock_hole_repo.get_by_tee_box_id.return_value = holes_18
+        mock_hole_repo.get_by_tee_box_id.return_value = Page(items=holes_18, next_cursor=None)
         path = f"/api/golf-courses/{golf_course_id}/tee-boxes/{tee_box_id}/holes"
         resp = client.get(path)
 
@@ -236,7 +239,7 @@ class TestGolfCourseController:
         assert len(resp.json['result']) == 18, "Expecting there to be 18 holes returned"
         assert mock_hole_repo.get_by_tee_box_id.called, \
             "Expecting hole_repo.get_by_tee_box_id to be called"
-        mock_hole_repo.get_by_tee_box_id.assert_called_with(tee_box_id=tee_box_id)
+        mock_hole_repo.get_by_tee_box_id.assert_called_with(tee_box_id=tee_box_id, page_request=ANY)
 
     @patch(HOLE_REPO_IMPORT_PATH)
     def test_add_holes(
@@ -1,15 +1,24 @@
 import json
 import copy
-from unittest.mock import patch
+from decimal import Decimal
+from unittest.mock import ANY, patch
 from http import HTTPStatus
 
-from api.models import GolfRound
+import pytest
+
+from api.controllers.golf_round import golf_round_schema
+from api.models import GolfRound, HandicapDifferential, StatsTotals
+from api.pagination import Page
 
 GOLF_ROUND_REPO_IMPORT_PATH = "api.controllers.golf_round.golf_round_repo"
 GOLF_ROUND_SERVICE_IMPORT_PATH = "api.controllers.golf_round.golf_round_service"
 VERIFY_JWT_IN_REQUEST_IMPORT_PATH = "flask_jwt_extended.view_decorators.verify_jwt_in_request"
 GET_JWT_IDENTITY_REQUIRED_IMPORT_PATH = "api.controllers.golf_round.get_jwt_identity"
-BOTO_IMPORT_PATH = "api.controllers.golf_round.golf_round_service.boto3"
+BOTO_IMPORT_PATH = "api.job_queue.boto3"
+HANDICAP_DIFFERENTIAL_REPO_IMPORT_PATH = "api.controllers.golf_round.handicap_differential_repo"
+HANDICAP_WINDOW_SERVICE_IMPORT_PATH = "api.controllers.golf_round.handicap_window_service"
+HANDICAP_HISTORY_SERVICE_IMPORT_PATH = "api.controllers.golf_round.handicap_history_service"
+STATS_TOTALS_REPO_IMPORT_PATH = "api.controllers.golf_round.stats_totals_repo"
 
 
 class TestGolfRoundController:
@@ -30,7 +39,7 @@ class TestGolfRoundController:
         mock_get_jwt_identity.return_value = user_id
         num_of_rounds = 2
         golf_rounds = [golf_round_factory(user_id=user_id) for _ in range(num_of_rounds)]
-        mock_golf_round_repo.get_by_user_id.return_value = golf_rounds
+        mock_golf_round_repo.get_by_user_id.return_value = Page(items=golf_rounds, next_cursor=None)
 
         path = "/api/golf-rounds/"
         headers = {'Authorization': 'Bearer token'}
@@ -41,7 +50,11 @@ class TestGolfRoundController:
             f"expected to receive a status_code: {HTTPStatus.OK}"
         assert len(resp.json['result']) == num_of_rounds, f"Expecting there to be {num_of_rounds} golf rounds returned"
         assert mock_golf_round_repo.get_by_user_id.called, "Expecting golf_round_repo.get_by_user_id to be called"
-        mock_golf_round_repo.get_by_user_id.assert_called_with(user_id=user_id)
+        mock_golf_round_repo.get_by_user_id.assert_called_with(
+            user_id=user_id,
+            schema=golf_round_schema,
+            page_request=ANY,
+        )
 
     def test_get_golf_rounds_invalid_token(
             self,
@@ -68,7 +81,7 @@ class TestGolfRoundController:
         mock_verify_jwt_in_request.return_value = None
         user_id = 1
         mock_get_jwt_identity.return_value = user_id
-        mock_golf_round_repo.get_by_user_id.return_value = []
+        mock_golf_round_repo.get_by_user_id.return_value = Page(items=[], next_cursor=None)
 
         path = "/api/golf-rounds/"
         headers = {'Authorization': 'Bearer token'}
@@ -78,8 +91,14 @@ class TestGolfRoundController:
             f"GET /golf-rounds failed with status_code = {resp.status_code}, " \
             f"expected to receive a status_code: {HTTPStatus.OK}"
         assert len(resp.json['result']) == 0, "Expecting there to be 0 golf rounds returned"
-        mock_golf_round_repo.get_by_user_id.assert_called_with(user_id=user_id)
+        mock_golf_round_repo.get_by_user_id.assert_called_with(
+            user_id=user_id,
+            schema=golf_round_schema,
+            page_request=ANY,
+        )
 
+    @patch(f"{HANDICAP_HISTORY_SERVICE_IMPORT_PATH}.HandicapHistoryService.refresh")
+    @patch(f"{HANDICAP_WINDOW_SERVICE_IMPORT_PATH}.HandicapWindowService.add_round")
     @patch(f"{GOLF_ROUND_SERVICE_IMPORT_PATH}.GolfRoundService._queue_handicap_calculation")
     @patch(VERIFY_JWT_IN_REQUEST_IMPORT_PATH)
     @patch(GET_JWT_IDENTITY_REQUIRED_IMPORT_PATH)
@@ -90,6 +109,8 @@ class TestGolfRoundController:
             mock_get_jwt_identity,
             mock_verify_jwt_in_request,
             mock_queue_handicap_calculation,
+            mock_add_round,
+            mock_refresh_handicap_history,
             client,
             test_user_id,
             content_type_header,
@@ -101,11 +122,12 @@ class TestGolfRoundController:
         mock_queue_handicap_calculation.return_value = None
 
         golf_round_post_body = golf_round_post_body_factory()
-        mock_golf_round_repo.create.return_value = GolfRound(
+        new_round = GolfRound(
             id=-1,
             user_id=test_user_id,
             **golf_round_post_body
         )
+        mock_golf_round_repo.create.return_value = new_round
 
         path = "/api/golf-rounds/"
         auth_header = {'Authorization': 'Bearer token'}
@@ -125,6 +147,8 @@ class TestGolfRoundController:
         )
         assert mock_queue_handicap_calculation.called
         mock_queue_handicap_calculation.assert_called_with(user_id=test_user_id)
+        mock_add_round.assert_called_with(golf_round=new_round)
+        mock_refresh_handicap_history.assert_called_with(user_id=test_user_id, played_on_from=new_round.played_on)
 
     @patch(VERIFY_JWT_IN_REQUEST_IMPORT_PATH)
     @patch(GET_JWT_IDENTITY_REQUIRED_IMPORT_PATH)
@@ -148,3 +172,120 @@ class TestGolfRoundController:
         assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, \
             f"GET /golf-rounds failed with status_code = {resp.status_code}, " \
             f"expected to receive a status_code: {HTTPStatus.UNPROCESSABLE_ENTITY}"
+
+    @patch(HANDICAP_DIFFERENTIAL_REPO_IMPORT_PATH)
+    def test_get_handicap_window(
+            self,
+            mock_handicap_differential_repo,
+            client,
+            golf_round_factory,
+            blue_tee_box,
+            service_token,
+    ):
+        user_id = 1
+        golf_round = golf_round_factory(user_id=user_id, tee_box_id=blue_tee_box.id)
+        handicap_differential = HandicapDifferential(
+            golf_round_id=-1,
+            user_id=user_id,
+            golf_course_id=golf_round.golf_course_id,
+            tee_box_id=golf_round.tee_box_id,
+            gross_score=golf_round.gross_score,
+            played_on=golf_round.played_on,
+            course_rating=blue_tee_box.course_rating,
+            slope=blue_tee_box.slope,
+            differential=Decimal('9.9'),
+        )
+        mock_handicap_differential_repo.get_by_user_id.return_value = [handicap_differential]
+
+        path = f"/api/golf-rounds/{user_id}/handicap-window"
+        resp = client.get(path, headers=service_token)
+
+        assert resp.status_code == HTTPStatus.OK, \
+            f"GET {path} failed with status_code = {resp.status_code}, " \
+            f"expected to receive a status_code: {HTTPStatus.OK}"
+        result, *_ = resp.json['result']
+        assert result['id'] == handicap_differential.golf_round_id
+        assert result['course_rating'] == str(blue_tee_box.course_rating)
+        assert result['slope'] == str(blue_tee_box.slope)
+        assert result['differential'] == '9.9'
+        assert result['towards_handicap'] is True
+        assert 'stats' not in result, "The handicap window should not include nested stats"
+        mock_handicap_differential_repo.get_by_user_id.assert_called_with(user_id=user_id, limit=20)
+
+    @pytest.mark.parametrize('headers', [{}, {'Authorization': 'Bearer some-user-token'}])
+    @patch(HANDICAP_DIFFERENTIAL_REPO_IMPORT_PATH)
+    def test_get_handicap_window_requires_service_token(
+            self,
+            mock_handicap_differential_repo,
+            client,
+            service_token,
+            headers,
+    ):
+        resp = client.get("/api/golf-rounds/1/handicap-window", headers=headers)
+
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+        mock_handicap_differential_repo.get_by_user_id.assert_not_called()
+
+    @patch(VERIFY_JWT_IN_REQUEST_IMPORT_PATH)
+    @patch(GET_JWT_IDENTITY_REQUIRED_IMPORT_PATH)
+    @patch(STATS_TOTALS_REPO_IMPORT_PATH)
+    def test_get_stats_totals(
+            self,
+            mock_stats_totals_repo,
+            mock_get_jwt_identity,
+            mock_verify_jwt_in_request,
+            client,
+    ):
+        mock_verify_jwt_in_request.return_value = None
+        user_id = 1
+        mock_get_jwt_identity.return_value = user_id
+        mock_stats_totals_repo.get_for_period.return_value = StatsTotals(
+            user_id=user_id,
+            period='2021',
+            rounds=3,
+            holes=54,
+            putts=95,
+            fairways=20,
+            fairway_attempts=42,
+            greens_in_regulation=27,
+            up_and_downs=4,
+            up_and_down_attempts=9,
+            sand_saves=1,
+            sand_save_attempts=0,
+        )
+
+        path = "/api/golf-rounds/golf-round-stats/totals?season=2021"
+        headers = {'Authorization': 'Bearer token'}
+        resp = client.get(path, headers=headers)
+
+        assert resp.status_code == HTTPStatus.OK, \
+            f"GET {path} failed with status_code = {resp.status_code}, " \
+            f"expected to receive a status_code: {HTTPStatus.OK}"
+        result = resp.json['result']
+        assert result['putts_per_round'] == 31.67
+        assert result['fairway_pct'] == 47.6
+        assert result['greens_in_regulation_pct'] == 50.0
+        assert result['up_and_down_pct'] == 44.4
+        assert result['sand_save_pct'] is None, "Expecting no rate without any attempts"
+        mock_stats_totals_repo.get_for_period.assert_called_once_with(user_id=user_id, period='2021')
+
+    @patch(VERIFY_JWT_IN_REQUEST_IMPORT_PATH)
+    @patch(GET_JWT_IDENTITY_REQUIRED_IMPORT_PATH)
+    @patch(STATS_TOTALS_REPO_IMPORT_PATH)
+    @pytest.mark.parametrize('season', ['abc', '2021.5', ''])
+    def test_get_stats_totals_invalid_season(
+            self,
+            mock_stats_totals_repo,
+            mock_get_jwt_identity,
+            mock_verify_jwt_in_request,
+            client,
+            season,
+    ):
+        mock_verify_jwt_in_request.return_value = None
+        mock_get_jwt_identity.return_value = 1
+
+        resp = client.get(f"/api/golf-rounds/golf-round-stats/totals?season={season}")
+
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+        assert resp.json['status'] == 'fail'
+        mock_stats_totals_repo.get_for_period.assert_not_called()
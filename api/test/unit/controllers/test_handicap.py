@@ -0,0 +1,52 @@
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.parametrize('query', ['start=2021-05-01', 'start=2021-05-01&end=2021-06-01', ''])
+def test_get_handicap_history(client, sqlite_db, golf_course, access_token, query):
+    resp = client.get(f'/api/handicaps/history?{query}', headers=access_token(user_id=1))
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.get_json()['result'] == []
+
+
+@pytest.mark.parametrize('query', ['start=05/01/2021', 'end=2021-13-01', 'start=yesterday'])
+def test_get_handicap_history_invalid_date(client, sqlite_db, golf_course, access_token, query):
+    resp = client.get(f'/api/handicaps/history?{query}', headers=access_token(user_id=1))
+
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
+    assert 'YYYY-MM-DD' in resp.get_json()['message']
+
+
+def test_add_handicap(client, sqlite_db, golf_course, access_token):
+    resp = client.post('/api/handicaps/', json={'index': '12.4'}, headers=access_token(user_id=1))
+
+    assert resp.status_code == HTTPStatus.OK
+    active = client.get('/api/handicaps/', headers=access_token(user_id=1)).get_json()['result']
+    assert Decimal(active['index']) == Decimal('12.4')
+    assert active['record_end_date'] is None
+
+
+def test_add_handicap_rejects_record_end_date(client, sqlite_db, golf_course, access_token):
+    payload = {'index': '12.4', 'record_end_date': '2021-05-01T00:00:00'}
+    resp = client.post('/api/handicaps/', json=payload, headers=access_token(user_id=1))
+
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert 'record_end_date' in resp.get_json()['message']
+
+
+def test_close_active_handicap(client, sqlite_db, golf_course, access_token, service_token):
+    client.post('/api/handicaps/', json={'index': '12.4'}, headers=access_token(user_id=1))
+
+    resp = client.delete('/api/handicaps/1/active', headers=service_token)
+
+    assert resp.status_code == HTTPStatus.OK
+    assert client.get('/api/handicaps/', headers=access_token(user_id=1)).get_json()['result'] == {}
+
+
+def test_close_active_handicap_requires_the_service_token(client, sqlite_db, golf_course, access_token):
+    resp = client.delete('/api/handicaps/1/active', headers=access_token(user_id=1))
+
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.models import GolfClub, GolfCourse, TeeBox
+
+NUM_GOLF_CLUBS = 10
+NUM_GOLF_ROUNDS = 20
+# the most SQL statements each GET may run, however many records it returns, conditional GETs
+# run one more for the ETag of what they return
+QUERY_BUDGETS = {
+    '/api/golf-clubs/': 4,
+    '/api/golf-clubs/1': 4,
+    '/api/golf-clubs/1/golf-courses': 3,
+    '/api/golf-courses/': 3,
+    '/api/golf-courses/1': 3,
+    '/api/golf-courses/1/tee-boxes': 2,
+    '/api/golf-courses/tee-boxes/1': 2,
+    '/api/golf-courses/1/tee-boxes/1/holes': 2,
+    '/api/golf-rounds/': 3,
+    '/api/golf-rounds/1': 3,
+    # the first read of a window rebuilds and stores it
+    '/api/golf-rounds/1/handicap-window': 4,
+    '/api/golf-rounds/1/golf-round-stats': 1,
+    '/api/golf-rounds/golf-round-stats/summary': 1,
+    '/api/golf-rounds/golf-round-stats/totals': 1,
+    '/api/handicaps/': 1,
+    '/api/handicaps/history': 1,
+}
+
+
+@pytest.fixture
+def golf_clubs(sqlite_db, golf_course):
+    sqlite_db.add_all([
+        GolfClub(
+            name=f'Golf Club {club_number}',
+            golf_courses=[
+                GolfCourse(
+                    name=f'Course {course_number}',
+                    num_holes=18,
+                    tee_boxes=[
+                        TeeBox(tee_color=color, par=72, distance=6800, unit='yards', course_rating=72, slope=130)
+                        for color in ('blue', 'white')
+                    ],
+                )
+                for course_number in range(2)
+            ],
+        )
+        for club_number in range(NUM_GOLF_CLUBS)
+    ])
+    sqlite_db.commit()
+
+
+@pytest.mark.parametrize('path', sorted(QUERY_BUDGETS))
+def test_get_stays_within_its_query_budget(
+        client, golf_clubs, add_rounds, access_token, service_token, query_budget, path):
+    add_rounds(user_id=1, num_rounds=NUM_GOLF_ROUNDS)
+
+    headers = service_token if path.endswith('/handicap-window') else access_token(user_id=1)
+    resp = client.get(path, headers=headers)
+
+    assert resp.status_code == HTTPStatus.OK, f"GET {path} failed with status_code = {resp.status_code}"
+    query_budget(resp, max_queries=QUERY_BUDGETS[path])
@@ -0,0 +1,22 @@
+from http import HTTPStatus
+from unittest.mock import patch
+
+from api.models import User
+
+REDIS_CLIENT_IMPORT_PATH = 'api.controllers.auth.redis_client'
+
+
+@patch(REDIS_CLIENT_IMPORT_PATH)
+def test_register_user_cannot_choose_their_role(mock_redis_client, client, sqlite_db):
+    payload = {
+        'email': 'golfer@footwedge.com',
+        'password': 'password',
+        'first_name': 'Jack',
+        'last_name': 'Nicklaus',
+        'role': 'admin',
+    }
+    resp = client.post('/api/user/register', json=payload)
+
+    assert resp.status_code == HTTPStatus.OK
+    user = sqlite_db.query(User).get(resp.get_json()['user_id'])
+    assert (user.email, user.role) == ('golfer@footwedge.com', 'standard_user')
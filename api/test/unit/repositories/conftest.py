@@ -0,0 +1,11 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+
+@pytest.fixture
+def postgres_session():
+    session = MagicMock(info={})
+    session.connection.return_value.dialect = postgresql.dialect()
+    return session
@@ -0,0 +1,198 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from api.models import GolfClub, GolfCourse, GolfRoundStats, Hole
+from api.repositories.golf_club_repository import GolfClubRepository
+from api.repositories.golf_course_repository import GolfCourseRepository
+from api.repositories.golf_round_stats_repository import GolfRoundStatsRepository
+from api.repositories.hole_repository import HoleRepository
+from api.schemas import GolfClubSchema
+
+
+def scorecard(golf_round_id: int) -> list:
+    # fairway_hit is left out on the par 3s
+    return [
+        {
+            'golf_round_id': golf_round_id,
+            'hole_id': hole_id,
+            'gross_score': 4,
+            'green_in_regulation': True,
+            **({'fairway_hit': False} if hole_id % 3 else {}),
+        }
+        for hole_id in range(1, 19)
+    ]
+
+
+def test_bulk_create_inserts_a_scorecard_in_one_statement(postgres_session):
+    repo = GolfRoundStatsRepository(model=GolfRoundStats)
+    repo.db_session = postgres_session
+    connection = postgres_session.connection.return_value
+
+    rows = repo.bulk_create(records=scorecard(golf_round_id=1))
+
+    assert rows == connection.execute.return_value.fetchall.return_value
+    assert connection.execute.call_count == 1, "Expecting a single INSERT for the whole scorecard"
+    statement, = connection.execute.call_args.args
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert str(compiled).count('%(golf_round_id_m') == 18
+    assert 'RETURNING public.golf_round_stats.id' in str(compiled)
+    assert compiled.params['putts_m0'] == 0, "Expecting the Python side column default to be applied"
+    assert compiled.params['fairway_hit_m2'] is None
+    postgres_session.commit.assert_called_once()
+
+
+def test_bulk_create_applies_column_defaults_per_record(postgres_session):
+    repo = GolfRoundStatsRepository(model=GolfRoundStats)
+    repo.db_session = postgres_session
+    connection = postgres_session.connection.return_value
+    records = scorecard(golf_round_id=1)
+    records[0]['penalties'] = 2
+
+    repo.bulk_create(records=records)
+
+    statement, = connection.execute.call_args.args
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert compiled.params['penalties_m0'] == 2
+    assert compiled.params['penalties_m1'] == 0, "Expecting records without penalties to get the column default"
+
+
+def test_bulk_create_copies_large_batches(postgres_session, monkeypatch):
+    monkeypatch.setattr('api.repositories.base_repository.BULK_COPY_THRESHOLD', 18)
+    repo = GolfRoundStatsRepository(model=GolfRoundStats)
+    repo.db_session = postgres_session
+    connection = postgres_session.connection.return_value
+    cursor = connection.connection.cursor.return_value
+
+    repo.bulk_create(records=scorecard(golf_round_id=1))
+
+    copy_statement, buffer = cursor.copy_expert.call_args.args
+    assert copy_statement.startswith('COPY bulk_create_golf_round_stats (golf_round_id, hole_id, gross_score')
+    lines = buffer.getvalue().splitlines()
+    assert len(lines) == 18
+    assert lines[2].startswith('1,3,4,\\N,True,0,0,0,0,'), "Expecting a missing fairway to be copied as NULL"
+    insert, drop = [call.args[0].text for call in connection.execute.call_args_list]
+    assert insert.startswith('INSERT INTO public.golf_round_stats (golf_round_id, hole_id')
+    assert insert.endswith('FROM bulk_create_golf_round_stats RETURNING *')
+    assert drop == 'DROP TABLE bulk_create_golf_round_stats'
+
+
+def test_bulk_create_without_records(postgres_session):
+    repo = HoleRepository(model=Hole)
+    repo.db_session = postgres_session
+
+    assert repo.bulk_create(records=[]) == []
+    assert not postgres_session.commit.called
+
+
+def test_bulk_create_falls_back_to_the_orm(sqlite_session):
+    repo = HoleRepository(model=Hole)
+    repo.db_session = sqlite_session
+    records = [
+        {
+            'golf_course_id': 1,
+            'tee_box_id': 1,
+            'hole_number': hole_number,
+            'par': 4,
+            'handicap': hole_number,
+            'distance': 400,
+            'unit': 'yards',
+        }
+        for hole_number in range(1, 19)
+    ]
+
+    holes = repo.bulk_create(records=records)
+
+    assert [hole.id for hole in holes] == list(range(1, 19))
+
+
+def golf_club_repo(session):
+    repo = GolfClubRepository(model=GolfClub)
+    repo.db_session = session
+    return repo
+
+
+def test_create_keeps_the_record_loaded(sqlite_session, count_queries):
+    repo = golf_club_repo(sqlite_session)
+
+    golf_club = repo.create(data={'name': 'Olympia Fields'})
+    count_queries.clear()
+
+    assert (golf_club.id, golf_club.name) == (1, 'Olympia Fields')
+    assert golf_club.created_ts is not None
+    assert not count_queries, "Expecting the new record not to be reloaded after the commit"
+
+
+def test_transaction_commits_every_write_together(sqlite_session):
+    repo = golf_club_repo(sqlite_session)
+
+    with repo.transaction():
+        first = repo.create(data={'name': 'Medinah'})
+        with repo.transaction():
+            second = repo.create(data={'name': 'Cog Hill'})
+        assert (first.id, second.id) == (1, 2), "Expecting ids to be assigned before the block ends"
+    sqlite_session.close()
+
+    assert [golf_club.name for golf_club in repo.get_all().items] == ['Medinah', 'Cog Hill']
+
+
+def test_transaction_rolls_back_every_write(sqlite_session):
+    repo = golf_club_repo(sqlite_session)
+
+    with pytest.raises(ValueError):
+        with repo.transaction():
+            repo.create(data={'name': 'Medinah'})
+            raise ValueError("Scorecard doesn't add up")
+
+    assert repo.get_all().items == []
+    repo.create(data={'name': 'Cog Hill'})
+    assert [golf_club.name for golf_club in repo.get_all().items] == ['Cog Hill']
+
+
+def test_get_reuses_its_baked_query(sqlite_session, monkeypatch):
+    repo = golf_club_repo(sqlite_session)
+    repo.create(data={'name': 'Medinah'})
+    repo.create(data={'name': 'Cog Hill'})
+    assert repo.get(model_id=1).name == 'Medinah'
+
+    def build_query(*args, **kwargs):
+        raise AssertionError("Expecting the query to be served from the bakery")
+
+    monkeypatch.setattr(sqlite_session, 'query', build_query)
+    assert repo.get(model_id=2).name == 'Cog Hill'
+    assert repo.get(model_id=3) is None
+
+
+def test_baked_queries_are_cached_per_model_and_schema(sqlite_session, golf_course):
+    repo = golf_club_repo(sqlite_session)
+    golf_course_repo = GolfCourseRepository(model=GolfCourse)
+    golf_course_repo.db_session = sqlite_session
+
+    assert repo.get(model_id=1).name == 'Olympia Fields'
+    assert golf_course_repo.get(model_id=1).name == 'North'
+    sqlite_session.expunge_all()
+    golf_club = repo.get(model_id=1, schema=GolfClubSchema())
+    sqlite_session.close()
+
+    assert 'golf_courses' in golf_club.__dict__, "Expecting the schema's relationships to be eager loaded"
+
+
+def test_transaction_nested_rollback_leaves_the_outer_block_in_charge(sqlite_session):
+    repo = golf_club_repo(sqlite_session)
+
+    with pytest.raises(ValueError):
+        with repo.transaction():
+            repo.create(data={'name': 'Medinah'})
+            with repo.transaction():
+                raise ValueError("Scorecard doesn't add up")
+
+    assert sqlite_session.info['transaction_depth'] == 0
+    assert repo.get_all().items == []
+    with repo.transaction():
+        repo.create(data={'name': 'Cog Hill'})
+        with pytest.raises(ValueError):
+            with repo.transaction():
+                raise ValueError("Scorecard doesn't add up")
+    sqlite_session.close()
+
+    assert sqlite_session.info.get('transaction_depth', 0) == 0
+    assert [golf_club.name for golf_club in repo.get_all().items] == ['Cog Hill']
@@ -0,0 +1,42 @@
+import pytest
+
+from api.models import GolfRoundStats
+from api.repositories.golf_round_stats_repository import GolfRoundStatsRepository
+
+EXPECTED_SUMMARY = {
+    'putts': 32,
+    'fairways': 7,
+    'greens_in_regulation': 14,
+    'up_and_downs': 2,
+    'sand_saves': 1,
+}
+
+
+@pytest.fixture
+def golf_round_stats_repo(sqlite_session):
+    repo = GolfRoundStatsRepository(model=GolfRoundStats)
+    repo.db_session = sqlite_session
+    return repo
+
+
+@pytest.mark.parametrize('num_rounds', [1, 50])
+def test_get_summaries_by_user_id_runs_one_query(golf_round_stats_repo, add_rounds, count_queries, num_rounds):
+    golf_round_ids = add_rounds(user_id=1, num_rounds=num_rounds)
+    count_queries.clear()
+
+    summaries = golf_round_stats_repo.get_summaries_by_user_id(user_id=1)
+
+    assert len(count_queries) == 1
+    assert {summary.golf_round_id: summary._asdict() for summary in summaries} == {
+        golf_round_id: {'golf_round_id': golf_round_id, **EXPECTED_SUMMARY} for golf_round_id in golf_round_ids
+    }
+
+
+def test_get_summaries_by_user_id_skips_unfinished_and_other_users_rounds(golf_round_stats_repo, add_rounds):
+    golf_round_id, = add_rounds(user_id=1)
+    add_rounds(user_id=1, hole_numbers=range(1, 10))
+    add_rounds(user_id=2)
+
+    summaries = golf_round_stats_repo.get_summaries_by_user_id(user_id=1)
+
+    assert [summary.golf_round_id for summary in summaries] == [golf_round_id]
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from api.models import Handicap, User
+from api.repositories.handicap_repository import HandicapRepository
+
+
+@pytest.fixture
+def handicap_repo(sqlite_session):
+    sqlite_session.execute(User.__table__.insert(), [
+        {
+            'email': f'golfer{n}@footwedge.com',
+            'password_hash': 'hash',
+            'first_name': 'Golfer',
+            'last_name': f'Number {n}',
+        }
+        for n in (1, 2)
+    ])
+    sqlite_session.commit()
+    repo = HandicapRepository(model=Handicap)
+    repo.db_session = sqlite_session
+    return repo
+
+
+def active_indexes(repo) -> dict:
+    return {
+        handicap.user_id: handicap.index
+        for handicap in repo.db_session.query(Handicap).filter(Handicap.record_end_date.is_(None))
+    }
+
+
+def test_replace_active_closes_the_previous_handicap(handicap_repo, count_queries):
+    handicap_repo.replace_active(user_id=1, index=Decimal('12.4'))
+    count_queries.clear()
+    handicap_repo.replace_active(user_id=1, index=Decimal('11.9'))
+
+    assert len(count_queries) == 3, "Expecting the lock, the UPDATE and the INSERT"
+    assert active_indexes(handicap_repo) == {1: Decimal('11.9')}
+    assert handicap_repo.db_session.query(Handicap).count() == 2
+
+
+def test_bulk_replace(handicap_repo):
+    handicap_repo.replace_active(user_id=1, index=Decimal('12.4'))
+
+    assert handicap_repo.bulk_replace(indexes={1: Decimal('11.9'), 2: Decimal('20.1')}) == 2
+    assert active_indexes(handicap_repo) == {1: Decimal('11.9'), 2: Decimal('20.1')}
+
+
+def test_a_second_active_handicap_is_rejected(handicap_repo):
+    handicap_repo.replace_active(user_id=1, index=Decimal('12.4'))
+
+    with pytest.raises(IntegrityError):
+        handicap_repo.create(data={'user_id': 1, 'index': Decimal('11.9')})
+
+
+def test_close_active(handicap_repo):
+    handicap_repo.bulk_replace(indexes={1: Decimal('12.4'), 2: Decimal('20.1')})
+
+    assert handicap_repo.close_active(user_id=1) == 1
+    assert active_indexes(handicap_repo) == {2: Decimal('20.1')}
+    assert handicap_repo.close_active(user_id=1) == 0
+
+
+def test_close_active_range(handicap_repo):
+    handicap_repo.bulk_replace(indexes={1: Decimal('12.4'), 2: Decimal('20.1')})
+
+    assert handicap_repo.close_active_range(min_user_id=1, max_user_id=2, keep_user_ids=[2]) == 1
+    assert active_indexes(handicap_repo) == {2: Decimal('20.1')}
+    assert handicap_repo.close_active_range(min_user_id=3, max_user_id=5, keep_user_ids=[]) == 0
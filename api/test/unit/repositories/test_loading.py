@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from api.models import (
+    GolfClub,
+    GolfCourse,
+    GolfRound,
+    TeeBox,
+    User,
+)
+from api.repositories.golf_club_repository import GolfClubRepository
+from api.repositories.golf_round_repository import GolfRoundRepository
+from api.repositories.loading import schema_loading_options
+from api.schemas import GolfClubSchema, GolfRoundSchema
+
+
+def add_golf_clubs(session, num_clubs: int):
+    for club_number in range(num_clubs):
+        session.add(GolfClub(
+            name=f'Golf Club {club_number}',
+            golf_courses=[
+                GolfCourse(
+                    name=f'Course {course_number}',
+                    num_holes=18,
+                    tee_boxes=[
+                        TeeBox(
+                            tee_color=color,
+                            par=72,
+                            distance=6800,
+                            unit='yards',
+                            course_rating=Decimal('72.1'),
+                            slope=Decimal('130'),
+                        )
+                        for color in ('blue', 'white')
+                    ],
+                )
+                for course_number in range(2)
+            ],
+        ))
+    session.commit()
+    session.expunge_all()
+
+
+def test_schema_loading_options_follow_nested_fields():
+    options = schema_loading_options(GolfClub, GolfClubSchema())
+
+    paths = [[str(token) for token in option.path] for option in options]
+    assert paths == [['GolfClub.golf_courses', 'GolfCourse.tee_boxes']]
+    assert schema_loading_options(GolfClub, GolfClubSchema(exclude=['golf_courses'])) == []
+
+
+@pytest.mark.parametrize('num_clubs', [1, 25])
+def test_get_all_golf_clubs_runs_constant_queries(sqlite_session, count_queries, num_clubs):
+    add_golf_clubs(sqlite_session, num_clubs=num_clubs)
+    golf_club_repo = GolfClubRepository(model=GolfClub)
+    golf_club_repo.db_session = sqlite_session
+    schema = GolfClubSchema()
+    count_queries.clear()
+
+    results = schema.dump(golf_club_repo.get_all(schema=schema).items, many=True)
+
+    assert len(results) == num_clubs
+    assert all(len(course['tee_boxes']) == 2 for club in results for course in club['golf_courses'])
+    assert len(count_queries) == 3, "golf_club, golf_course and tee_box should each be read with one query"
+
+
+def test_get_golf_rounds_by_user_id_runs_constant_queries(sqlite_session, count_queries):
+    add_golf_clubs(sqlite_session, num_clubs=1)
+    user = User(email='golfer@footwedge.com', password='password', first_name='Jack', last_name='Nicklaus')
+    sqlite_session.add(user)
+    sqlite_session.flush()
+    user_id = user.id
+    for _ in range(10):
+        sqlite_session.add(GolfRound(
+            golf_course_id=1,
+            tee_box_id=1,
+            user_id=user_id,
+            gross_score=85,
+            towards_handicap=True,
+            played_on=date(2021, 5, 1),
+        ))
+    sqlite_session.commit()
+    golf_round_repo = GolfRoundRepository(model=GolfRound)
+    golf_round_repo.db_session = sqlite_session
+    schema = GolfRoundSchema()
+    count_queries.clear()
+
+    results = schema.dump(golf_round_repo.get_by_user_id(user_id=user_id, schema=schema).items, many=True)
+
+    assert len(results) == 10
+    assert len(count_queries) == 2, "golf_round and golf_round_stats should each be read with one query"
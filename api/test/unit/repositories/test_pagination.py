@@ -0,0 +1,146 @@
+from datetime import date, timedelta
+
+import pytest
+
+from api.models import (
+    GolfClub,
+    GolfCourse,
+    GolfRound,
+    User,
+)
+from api.pagination import (
+    InvalidPageRequest,
+    MAX_PAGE_LIMIT,
+    PageRequest,
+    decode_cursor,
+    encode_cursor,
+)
+from api.repositories.golf_club_repository import GolfClubRepository
+from api.repositories.golf_round_repository import GolfRoundRepository
+from api.schemas import GolfRoundSchema
+
+
+@pytest.fixture
+def golf_club_repo(sqlite_session):
+    for club_number in range(25):
+        sqlite_session.add(GolfClub(name=f'Golf Club {club_number}'))
+    sqlite_session.commit()
+    repo = GolfClubRepository(model=GolfClub)
+    repo.db_session = sqlite_session
+    return repo
+
+
+@pytest.fixture
+def golf_round_repo(sqlite_session):
+    sqlite_session.add(GolfClub(name='Golf Club', golf_courses=[GolfCourse(name='Course', num_holes=18)]))
+    user = User(email='golfer@footwedge.com', password='password', first_name='Jack', last_name='Nicklaus')
+    sqlite_session.add(user)
+    sqlite_session.flush()
+    # several rounds share a played_on date so the id has to break ties
+    for round_number in range(12):
+        sqlite_session.add(GolfRound(
+            golf_course_id=1,
+            tee_box_id=1,
+            user_id=user.id,
+            gross_score=80 + round_number,
+            towards_handicap=True,
+            played_on=date(2021, 5, 1) + timedelta(days=round_number // 3),
+        ))
+    sqlite_session.commit()
+    repo = GolfRoundRepository(model=GolfRound)
+    repo.db_session = sqlite_session
+    return repo
+
+
+def fetch_all_pages(fetch_page, limit: int, stream: str = None) -> list:
+    pages = []
+    cursor = None
+    while True:
+        page = fetch_page(PageRequest(cursor=cursor, limit=limit, stream=stream))
+        pages.append(list(page.items))
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([date(2021, 5, 1), 42])
+
+    assert decode_cursor(cursor, [GolfRound.played_on, GolfRound.id]) == [date(2021, 5, 1), 42]
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor([1]), encode_cursor(['yesterday', 1])])
+def test_decode_cursor_rejects_foreign_cursors(cursor):
+    with pytest.raises(InvalidPageRequest):
+        decode_cursor(cursor, [GolfRound.played_on, GolfRound.id])
+
+
+@pytest.mark.parametrize('args', [{'limit': '0'}, {'limit': str(MAX_PAGE_LIMIT + 1)}, {'limit': 'ten'}])
+def test_page_request_rejects_invalid_limits(args):
+    with pytest.raises(InvalidPageRequest):
+        PageRequest.from_args(args)
+
+
+def test_get_all_pages_through_every_record_once(golf_club_repo):
+    pages = fetch_all_pages(lambda page_request: golf_club_repo.get_all(page_request=page_request), limit=10)
+
+    assert [len(items) for items in pages] == [10, 10, 5]
+    assert [club.id for items in pages for club in items] == list(range(1, 26))
+
+
+def test_get_all_without_page_request_returns_a_single_page(golf_club_repo):
+    page = golf_club_repo.get_all()
+
+    assert len(page.items) == 25
+    assert page.next_cursor is None
+
+
+def test_get_by_user_id_pages_most_recent_first(golf_round_repo):
+    pages = fetch_all_pages(
+        lambda page_request: golf_round_repo.get_by_user_id(user_id=1, page_request=page_request),
+        limit=5,
+    )
+
+    golf_rounds = [golf_round for items in pages for golf_round in items]
+    assert [len(items) for items in pages] == [5, 5, 2]
+    assert [golf_round.id for golf_round in golf_rounds] == [12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+
+
+def test_streamed_page_eager_loads_each_chunk(golf_round_repo, count_queries, monkeypatch):
+    monkeypatch.setattr('api.pagination.STREAM_CHUNK_SIZE', 5)
+    count_queries.clear()
+
+    page = golf_round_repo.get_by_user_id(
+        user_id=1,
+        schema=GolfRoundSchema(),
+        page_request=PageRequest(stream='ndjson'),
+    )
+    golf_rounds = list(page.items)
+
+    assert [golf_round.id for golf_round in golf_rounds] == list(range(12, 0, -1))
+    assert page.next_cursor is None
+    assert len(count_queries) == 5, \
+        "the end of the page should be read once, golf_round once and golf_round_stats once per chunk"
+
+
+def test_streamed_pages_are_capped_at_the_limit(golf_club_repo):
+    pages = fetch_all_pages(
+        lambda page_request: golf_club_repo.get_all(page_request=page_request),
+        limit=10,
+        stream='ndjson',
+    )
+
+    assert [len(items) for items in pages] == [10, 10, 5]
+    assert [club.id for items in pages for club in items] == list(range(1, 26))
+
+
+def test_streamed_baked_pages_are_capped_at_the_limit(golf_round_repo):
+    pages = fetch_all_pages(
+        lambda page_request: golf_round_repo.get_by_user_id(user_id=1, page_request=page_request),
+        limit=5,
+        stream='json',
+    )
+
+    golf_rounds = [golf_round for items in pages for golf_round in items]
+    assert [len(items) for items in pages] == [5, 5, 2]
+    assert [golf_round.id for golf_round in golf_rounds] == list(range(12, 0, -1))
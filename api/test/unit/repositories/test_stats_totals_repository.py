@@ -0,0 +1,108 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from api.models import GolfRoundStats, StatsTotals
+from api.repositories.stats_totals_repository import CAREER_PERIOD, COUNTER_COLUMNS, StatsTotalsRepository
+
+ROUND_TOTALS = {
+    'rounds': 1,
+    'holes': 18,
+    'putts': 32,
+    'fairways': 7,
+    'fairway_attempts': 14,
+    'greens_in_regulation': 14,
+    'up_and_downs': 2,
+    'up_and_down_attempts': 2,
+    'sand_saves': 1,
+    'sand_save_attempts': 1,
+}
+
+
+@pytest.fixture
+def stats_totals_repo(sqlite_session):
+    repo = StatsTotalsRepository(model=StatsTotals)
+    repo.db_session = sqlite_session
+    return repo
+
+
+def stats_ids(session, golf_round_id: int) -> list:
+    return [
+        stat_id for stat_id, in session.query(GolfRoundStats.id).filter(GolfRoundStats.golf_round_id == golf_round_id)
+    ]
+
+
+def record_rounds(repo, golf_round_ids: list):
+    for golf_round_id in golf_round_ids:
+        repo.add_round_stats(golf_round_id=golf_round_id, stats_ids=stats_ids(repo.db_session, golf_round_id))
+
+
+def counters(totals: StatsTotals) -> dict:
+    return {column: getattr(totals, column) for column in COUNTER_COLUMNS}
+
+
+def rounds_totals(num_rounds: int) -> dict:
+    return {column: value * num_rounds for column, value in ROUND_TOTALS.items()}
+
+
+def all_totals(repo) -> dict:
+    return {(totals.user_id, totals.period): counters(totals) for totals in repo.db_session.query(StatsTotals)}
+
+
+def test_add_round_stats_updates_career_and_season_totals(stats_totals_repo, add_rounds):
+    record_rounds(stats_totals_repo, add_rounds(user_id=1, num_rounds=2, played_on=date(2021, 5, 1)))
+    record_rounds(stats_totals_repo, add_rounds(user_id=1, played_on=date(2020, 8, 1)))
+    record_rounds(stats_totals_repo, add_rounds(user_id=2))
+
+    assert counters(stats_totals_repo.get_for_period(user_id=1)) == rounds_totals(3)
+    assert counters(stats_totals_repo.get_for_period(user_id=1, period='2021')) == rounds_totals(2)
+    assert counters(stats_totals_repo.get_for_period(user_id=1, period='2020')) == rounds_totals(1)
+    assert counters(stats_totals_repo.get_for_period(user_id=2, period=CAREER_PERIOD)) == rounds_totals(1)
+
+
+def test_add_round_stats_counts_a_round_recorded_in_parts_once(stats_totals_repo, add_rounds, add_stats):
+    golf_round_id, = add_rounds(user_id=1, hole_numbers=range(1, 10))
+    record_rounds(stats_totals_repo, [golf_round_id])
+
+    back_nine = add_stats(golf_round_id=golf_round_id, hole_numbers=range(10, 19))
+    stats_totals_repo.add_round_stats(golf_round_id=golf_round_id, stats_ids=back_nine)
+
+    assert counters(stats_totals_repo.get_for_period(user_id=1)) == rounds_totals(1)
+
+
+def test_remove_round(stats_totals_repo, add_rounds):
+    golf_round_ids = add_rounds(user_id=1, num_rounds=2)
+    record_rounds(stats_totals_repo, golf_round_ids)
+
+    stats_totals_repo.remove_round(golf_round_id=golf_round_ids[0])
+
+    assert all_totals(stats_totals_repo) == {(1, CAREER_PERIOD): rounds_totals(1), (1, '2021'): rounds_totals(1)}
+
+
+def test_rebuild_matches_the_incremental_totals(stats_totals_repo, add_rounds):
+    record_rounds(stats_totals_repo, add_rounds(user_id=1, num_rounds=2))
+    record_rounds(stats_totals_repo, add_rounds(user_id=1, played_on=date(2020, 8, 1)))
+    record_rounds(stats_totals_repo, add_rounds(user_id=2))
+    incremental = all_totals(stats_totals_repo)
+    stats_totals_repo.db_session.expunge_all()
+
+    assert stats_totals_repo.rebuild() == 5
+    assert all_totals(stats_totals_repo) == incremental
+
+
+def test_apply_upserts_every_period_in_one_statement(stats_totals_repo, postgres_session):
+    stats_totals_repo.db_session = postgres_session
+    connection = postgres_session.connection.return_value
+    deltas = [
+        {'user_id': 1, 'period': period, **ROUND_TOTALS, 'touched_ts': datetime(2021, 5, 1)}
+        for period in (CAREER_PERIOD, '2021')
+    ]
+
+    stats_totals_repo._apply(deltas)
+
+    statement, = connection.execute.call_args.args
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (user_id, period) DO UPDATE SET' in sql
+    assert 'rounds = (public.stats_totals.rounds + excluded.rounds)' in sql
+    assert sql.count('%(period_m') == 2
@@ -0,0 +1,64 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from api.index import app
+from api.models import GolfRound, HandicapDifferential
+from api.repositories.golf_round_repository import golf_round_repo
+from api.repositories.handicap_differential_repository import handicap_differential_repo
+from api.repositories.stats_totals_repository import stats_totals_repo
+from api.repositories.tee_box_repository import tee_box_repo
+from api.schemas import GolfRoundSchema
+from api.services.golf_round_service import GolfRoundService
+from api.services.handicap_window_service import HandicapWindowService
+
+QUEUE_HANDICAP_CALCULATION_IMPORT_PATH = 'api.services.golf_round_service.GolfRoundService._queue_handicap_calculation'
+
+
+@pytest.fixture
+def golf_round_service(sqlite_db, golf_course):
+    window_service = HandicapWindowService(
+        repo=handicap_differential_repo,
+        golf_round_repo=golf_round_repo,
+        tee_box_repo=tee_box_repo,
+    )
+    with app.app_context(), patch(QUEUE_HANDICAP_CALCULATION_IMPORT_PATH):
+        yield GolfRoundService(
+            repo=golf_round_repo,
+            schema=GolfRoundSchema(),
+            handicap_window_service=window_service,
+            stats_totals_repo=stats_totals_repo,
+        )
+
+
+def golf_round_payload() -> dict:
+    return {
+        'golf_course_id': 1,
+        'tee_box_id': 1,
+        'gross_score': 86,
+        'towards_handicap': True,
+        'played_on': date(2021, 5, 1).isoformat(),
+    }
+
+
+def test_add_is_rolled_back_with_the_handicap_window(golf_round_service, sqlite_db):
+    with patch.object(HandicapWindowService, 'add_round', side_effect=RuntimeError('window unavailable')):
+        with pytest.raises(RuntimeError):
+            golf_round_service.add(user_id=1, payload=golf_round_payload())
+
+    assert sqlite_db.query(GolfRound).count() == 0, "Expecting the round not to outlive its window entry"
+
+
+def test_delete_is_rolled_back_with_the_handicap_window(golf_round_service, sqlite_db):
+    golf_round_service.add(user_id=1, payload=golf_round_payload())
+    golf_round_id, = [golf_round.id for golf_round in sqlite_db.query(GolfRound)]
+
+    with patch.object(type(stats_totals_repo), 'remove_round', side_effect=RuntimeError('totals unavailable')):
+        with pytest.raises(RuntimeError):
+            golf_round_service.delete(_id=golf_round_id)
+    sqlite_db.expire_all()
+
+    assert sqlite_db.query(GolfRound).count() == 1
+    assert [entry.golf_round_id for entry in sqlite_db.query(HandicapDifferential)] == [golf_round_id], \
+        "Expecting the round to stay in its handicap window while it isn't deleted"
@@ -0,0 +1,243 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from api.catalog_cache import CatalogCache, golf_club_tag
+
+
+class FakeRedis:
+    """The commands CatalogCache uses, without expiry"""
+
+    def __init__(self):
+        self.data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        with self._lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self.data[key] = str(int(self.data.get(key, 0)) + 1)
+            return int(self.data[key])
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, command):
+        return lambda *args, **kwargs: self._commands.append((command, args, kwargs))
+
+    def execute(self):
+        return [getattr(self._redis, command)(*args, **kwargs) for command, args, kwargs in self._commands]
+
+
+@pytest.fixture
+def cache():
+    return CatalogCache(redis=FakeRedis(), ttl_seconds=60, lock_seconds=5, lock_wait_seconds=0.5)
+
+
+def loader(*values):
+    return MagicMock(side_effect=values)
+
+
+def test_read_through(cache):
+    load = loader({'id': 1, 'name': 'Olympia Fields'})
+
+    for _ in range(3):
+        value = cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=load)
+
+    assert value == {'id': 1, 'name': 'Olympia Fields'}
+    assert load.call_count == 1
+    assert cache.stats() == {'golf_club': {'miss': 1, 'hit': 2}}
+
+
+def test_invalidate_only_the_entries_of_a_tag(cache):
+    medinah = loader({'name': 'Medinah'}, {'name': 'Medinah Country Club'})
+    cog_hill = loader({'name': 'Cog Hill'})
+
+    cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=medinah)
+    cache.get_or_load(name='golf_club', key='2', tags=[golf_club_tag(2)], load=cog_hill)
+    cache.invalidate([golf_club_tag(1)])
+
+    assert cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=medinah) == \
+        {'name': 'Medinah Country Club'}
+    assert cache.get_or_load(name='golf_club', key='2', tags=[golf_club_tag(2)], load=cog_hill) == \
+        {'name': 'Cog Hill'}
+    assert (medinah.call_count, cog_hill.call_count) == (2, 1)
+
+
+def test_entry_loaded_during_a_write_is_not_served(cache):
+    def load_while_written():
+        # the write commits and invalidates after this load read the database
+        cache.invalidate([golf_club_tag(1)])
+        return {'name': 'Medinah'}
+
+    cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=load_while_written)
+    load = loader({'name': 'Medinah Country Club'})
+
+    assert cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=load) == \
+        {'name': 'Medinah Country Club'}
+
+
+def test_one_worker_loads_a_missed_entry(cache):
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        time.sleep(0.1)
+        return {'name': 'Olympia Fields'}
+
+    def read(_):
+        return cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=slow_load)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        values = list(executor.map(read, range(10)))
+
+    assert values == [{'name': 'Olympia Fields'}] * 10
+    assert len(loads) == 1, "Expecting the other readers to wait for the first one's load"
+    assert cache.stats()['golf_club'] == {'miss': 1, 'hit': 9}
+
+
+def test_missed_entry_is_loaded_from_the_primary():
+    reads = []
+
+    @contextmanager
+    def primary_reads():
+        reads.append('primary')
+        yield
+
+    cache = CatalogCache(redis=FakeRedis(), ttl_seconds=60, primary_reads=primary_reads)
+    load = MagicMock(side_effect=lambda: reads.append('load') or {'name': 'Olympia Fields'})
+
+    for _ in range(2):
+        cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=load)
+
+    assert reads == ['primary', 'load'], "Expecting only the missed entry's load, inside primary_reads"
+
+
+def test_lock_wait_runs_out(cache):
+    cache._redis_client.set('catalog:lock:golf_club:1', 'another worker')
+    cache._lock_wait_seconds = 0.05
+    load = loader({'name': 'Olympia Fields'})
+
+    assert cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=load) == \
+        {'name': 'Olympia Fields'}
+    assert cache.stats() == {'golf_club': {'lock_timeout': 1}}
+
+
+def test_redis_unavailable_reads_the_database():
+    redis = MagicMock()
+    redis.pipeline.return_value.execute.side_effect = ConnectionError('Connection refused')
+    cache = CatalogCache(redis=redis, ttl_seconds=60)
+    load = loader({'name': 'Olympia Fields'}, {'name': 'Olympia Fields'})
+
+    assert cache.get_or_load(name='golf_club', key='1', tags=[golf_club_tag(1)], load=load) == \
+        {'name': 'Olympia Fields'}
+    cache.invalidate([golf_club_tag(1)])
+    assert cache.stats() == {'golf_club': {'error': 1}}
+
+
+def test_disabled_cache_always_loads():
+    cache = CatalogCache(redis=None, ttl_seconds=60, enabled=False)
+    load = loader(1, 2)
+
+    assert [cache.get_or_load(name='golf_club', key='1', tags=[], load=load) for _ in range(2)] == [1, 2]
+    cache.invalidate([golf_club_tag(1)])
+
+
+@pytest.fixture
+def cached_catalog(cache, monkeypatch, sqlite_db, golf_course):
+    monkeypatch.setattr('api.controllers.golf_club.catalog_cache', cache)
+    monkeypatch.setattr('api.controllers.golf_course.catalog_cache', cache)
+    return cache
+
+
+def test_golf_club_reads_are_served_from_the_cache(client, cached_catalog, query_budget):
+    first = client.get('/api/golf-clubs/1')
+    second = client.get('/api/golf-clubs/1')
+
+    assert first.get_json() == second.get_json()
+    assert query_budget(second, max_queries=0) == 0, "Expecting the golf club and its ETag from the cache"
+
+
+def test_cached_reads_are_not_modified_without_the_database(client, cached_catalog, query_budget):
+    etag, _ = client.get('/api/golf-courses/tee-boxes/1').get_etag()
+
+    resp = client.get('/api/golf-courses/tee-boxes/1', headers={'If-None-Match': f'"{etag}"'})
+
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+    assert query_budget(resp, max_queries=0) == 0
+    cached_catalog.invalidate(['tee_box:1'])
+    assert client.get(
+        '/api/golf-courses/tee-boxes/1', headers={'If-None-Match': f'"{etag}"'},
+    ).status_code == HTTPStatus.OK
+
+
+def test_entry_versions_start_over_in_a_new_epoch(cache):
+    fallback = MagicMock()
+    version = cache.get_version(name='golf_club', key='1', tags=[golf_club_tag(1)], fallback=fallback)
+
+    cache._redis_client.data.clear()
+
+    assert cache.get_version(name='golf_club', key='1', tags=[golf_club_tag(1)], fallback=fallback) != version, \
+        "Expecting an ETag from before Redis lost its versions not to match again"
+    fallback.assert_not_called()
+
+
+def test_redis_unavailable_versions_from_the_database():
+    redis = MagicMock()
+    redis.mget.side_effect = ConnectionError('Connection refused')
+    cache = CatalogCache(redis=redis, ttl_seconds=60)
+    fallback = MagicMock()
+
+    assert cache.get_version(name='golf_club', key='1', tags=[golf_club_tag(1)], fallback=fallback) == \
+        fallback.return_value
+
+
+def test_adding_a_tee_box_invalidates_its_golf_club(client, cached_catalog):
+    client.get('/api/golf-clubs/1')
+    client.get('/api/golf-courses/tee-boxes/2')
+
+    resp = client.post('/api/golf-courses/1/tee-boxes', json={
+        'tee_color': 'white', 'par': 70, 'distance': 6400, 'unit': 'yards', 'course_rating': 70.1, 'slope': 125,
+    })
+
+    assert resp.status_code == HTTPStatus.OK
+    golf_course, = client.get('/api/golf-clubs/1').get_json()['result']['golf_courses']
+    assert [tee_box['tee_color'] for tee_box in golf_course['tee_boxes']] == ['blue', 'white']
+    assert client.get('/api/golf-courses/tee-boxes/2').get_json()['result']['tee_color'] == 'white', \
+        "Expecting a read of the new tee box from before it existed to be invalidated"
+
+
+def test_adding_holes_invalidates_the_holes_of_their_tee_box(client, cached_catalog, holes_post_body):
+    path = '/api/golf-courses/1/tee-boxes/1/holes'
+    assert len(client.get(path).get_json()['result']) == 18
+
+    client.post(path, json={'holes': [{**holes_post_body['holes'][0], 'hole_number': 19}]})
+
+    assert len(client.get(path).get_json()['result']) == 19
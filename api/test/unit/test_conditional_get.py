@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.models import GolfClub
+
+
+@pytest.fixture
+def catalog(sqlite_db, golf_course):
+    return sqlite_db
+
+
+def test_etag_is_sent(client, catalog):
+    resp = client.get('/api/golf-clubs/1')
+
+    assert resp.status_code == HTTPStatus.OK
+    etag, weak = resp.get_etag()
+    assert etag and not weak, "Expecting a strong ETag"
+    assert resp.last_modified is None, "Expecting no Last-Modified, it can't tell that a row was deleted"
+
+
+def test_unchanged_etag_is_not_modified(client, catalog, query_budget):
+    etag, _ = client.get('/api/golf-clubs/1').get_etag()
+
+    resp = client.get('/api/golf-clubs/1', headers={'If-None-Match': f'"{etag}"'})
+
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+    assert resp.data == b''
+    assert resp.get_etag() == (etag, False)
+    assert query_budget(resp, max_queries=1) == 1, "Expecting a 304 without loading the golf club"
+
+
+def test_if_modified_since_is_ignored(client, catalog):
+    resp = client.get(
+        '/api/golf-courses/1/tee-boxes/1/holes',
+        headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'},
+    )
+
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_adding_a_nested_row_changes_the_etag(client, catalog):
+    etag, _ = client.get('/api/golf-clubs/1').get_etag()
+
+    client.post('/api/golf-courses/1/tee-boxes', json={
+        'tee_color': 'white', 'par': 70, 'distance': 6400, 'unit': 'yards', 'course_rating': 70.1, 'slope': 125,
+    })
+    resp = client.get('/api/golf-clubs/1', headers={'If-None-Match': f'"{etag}"'})
+
+    assert resp.status_code == HTTPStatus.OK, "Expecting the golf club's new tee box to be a modification"
+    assert resp.get_etag()[0] != etag
+
+
+def test_touching_a_row_changes_the_etag(client, catalog):
+    etag, _ = client.get('/api/golf-clubs/1').get_etag()
+
+    catalog.query(GolfClub).get(1).name = 'Olympia Fields Country Club'
+    catalog.commit()
+    resp = client.get('/api/golf-clubs/1', headers={'If-None-Match': f'"{etag}"'})
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.get_json()['result']['name'] == 'Olympia Fields Country Club'
+
+
+def test_pages_have_their_own_etags(client, catalog, add_rounds, access_token):
+    add_rounds(user_id=1, num_rounds=4)
+    headers = access_token(user_id=1)
+
+    first = client.get('/api/golf-rounds/?limit=2', headers=headers)
+    cursor = first.get_json()['next_cursor']
+    assert cursor is not None
+    second = client.get(f'/api/golf-rounds/?limit=2&cursor={cursor}', headers=headers)
+
+    assert first.get_etag()[0] != second.get_etag()[0]
+    assert client.get(
+        f'/api/golf-rounds/?limit=2&cursor={cursor}',
+        headers={**headers, 'If-None-Match': second.headers['ETag']},
+    ).status_code == HTTPStatus.NOT_MODIFIED
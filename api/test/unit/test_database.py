@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import create_engine, event
+
+from api.database import RoutingSession
+from api.models import GolfClub
+
+
+class FakeStickyReads:
+
+    def __init__(self, sticky_user_ids=()):
+        self.sticky_user_ids = set(sticky_user_ids)
+        self.marked = []
+
+    def mark(self, user_id):
+        self.marked.append(user_id)
+
+    def is_sticky(self, user_id):
+        return user_id in self.sticky_user_ids
+
+
+def golf_club_engine(name: str):
+    engine = create_engine('sqlite://')
+
+    @event.listens_for(engine, 'connect')
+    def attach_public_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    GolfClub.__table__.create(engine)
+    engine.execute(GolfClub.__table__.insert().values(name=name))
+    return engine
+
+
+@pytest.fixture
+def primary():
+    return golf_club_engine('primary')
+
+
+@pytest.fixture
+def replica():
+    return golf_club_engine('replica')
+
+
+def golf_club_names(session) -> list:
+    return [golf_club.name for golf_club in session.query(GolfClub).order_by(GolfClub.id)]
+
+
+def test_reads_go_to_the_replica(app, primary, replica):
+    session = RoutingSession(bind=primary, replicas=[replica], sticky_reads=FakeStickyReads())
+
+    with app.test_request_context('/api/golf-clubs/'):
+        assert golf_club_names(session) == ['replica']
+
+
+def test_reads_outside_of_a_request_go_to_the_primary(primary, replica):
+    session = RoutingSession(bind=primary, replicas=[replica], sticky_reads=FakeStickyReads())
+
+    assert golf_club_names(session) == ['primary']
+
+
+def test_reads_without_replicas_go_to_the_primary(app, primary):
+    session = RoutingSession(bind=primary, sticky_reads=FakeStickyReads())
+
+    with app.test_request_context('/api/golf-clubs/'):
+        assert golf_club_names(session) == ['primary']
+
+
+def test_session_reads_its_own_writes(app, primary, replica):
+    sticky_reads = FakeStickyReads()
+    session = RoutingSession(bind=primary, replicas=[replica], sticky_reads=sticky_reads)
+
+    with app.test_request_context('/api/golf-rounds/7'):
+        assert golf_club_names(session) == ['replica']
+        session.add(GolfClub(name='new'))
+        session.commit()
+
+        assert golf_club_names(session) == ['primary', 'new']
+        assert sticky_reads.marked == [7], "Expecting the user's reads to stick to the primary"
+
+
+def test_reads_for_a_user_that_just_wrote_go_to_the_primary(app, primary, replica):
+    session = RoutingSession(bind=primary, replicas=[replica], sticky_reads=FakeStickyReads(sticky_user_ids=[7]))
+
+    with app.test_request_context('/api/golf-rounds/7'):
+        assert golf_club_names(session) == ['primary']
+
+
+def test_locking_reads_go_to_the_primary(app, primary, replica):
+    session = RoutingSession(bind=primary, replicas=[replica], sticky_reads=FakeStickyReads())
+
+    with app.test_request_context('/api/golf-clubs/'):
+        golf_club = session.query(GolfClub).with_for_update().one()
+
+    assert golf_club.name == 'primary'
+
+
+def test_primary_reads_go_to_the_primary(app, primary, replica):
+    session = RoutingSession(bind=primary, replicas=[replica], sticky_reads=FakeStickyReads())
+
+    with app.test_request_context('/api/golf-clubs/'):
+        with session.primary_reads():
+            assert golf_club_names(session) == ['primary']
+        assert golf_club_names(session) == ['replica'], "Expecting reads after the block to go back to the replica"
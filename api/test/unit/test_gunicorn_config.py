@@ -0,0 +1,36 @@
+import os
+import runpy
+
+import pytest
+
+import api
+
+GUNICORN_CONFIG = os.path.join(os.path.dirname(api.__file__), 'gunicorn_config.py')
+
+
+def load_config(monkeypatch, **env) -> dict:
+    for name in ('API_SERVING_MODE', 'API_THREADS', 'API_WORKER_CONNECTIONS'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(GUNICORN_CONFIG)
+
+
+def test_threads_is_the_default_serving_mode(monkeypatch):
+    config = load_config(monkeypatch)
+
+    assert config['threads'] == 2
+    assert 'worker_class' not in config
+
+
+def test_gevent_serving_mode(monkeypatch):
+    config = load_config(monkeypatch, API_SERVING_MODE='gevent', API_WORKER_CONNECTIONS='500')
+
+    assert config['worker_class'] == 'gevent'
+    assert config['worker_connections'] == 500
+    assert 'threads' not in config
+
+
+def test_unknown_serving_mode(monkeypatch):
+    with pytest.raises(ValueError):
+        load_config(monkeypatch, API_SERVING_MODE='asgi')
@@ -0,0 +1,88 @@
+from collections import namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from api.handicap_history import handicap_history
+from api.handicap_math import MIN_HANDICAP_ROUNDS, handicap
+from api.schemas import HandicapHistorySchema
+from api.services.handicap_history_service import HandicapHistoryService
+
+HistoryEntry = namedtuple('HistoryEntry', ['golf_round_id', 'played_on', 'differential'])
+HandicapRoundRow = namedtuple(
+    'HandicapRoundRow',
+    ['id', 'user_id', 'played_on', 'gross_score', 'course_rating', 'slope'],
+)
+
+
+def history_entries(num_rounds: int):
+    return [
+        HistoryEntry(
+            golf_round_id=i,
+            played_on=date(2020, 1, 1) + timedelta(days=i),
+            differential=Decimal(f'{(i * 7) % 23}.{i % 10}'),
+        )
+        for i in range(1, num_rounds + 1)
+    ]
+
+
+def full_recalculation(entries, window_size: int = 20):
+    differentials = [entry.differential for entry in entries[-window_size:]]
+    if len(differentials) < MIN_HANDICAP_ROUNDS:
+        return None
+    return round(handicap(differentials=differentials), 1)
+
+
+def test_handicap_history_matches_full_recalculation():
+    entries = history_entries(num_rounds=45)
+
+    history = list(handicap_history(entries=entries))
+
+    assert [entry for entry, _ in history] == entries
+    expected = [full_recalculation(entries[:i]) for i in range(1, len(entries) + 1)]
+    assert [handicap_index for _, handicap_index in history] == expected
+
+
+def test_handicap_history_resumes_from_seed():
+    entries = history_entries(num_rounds=30)
+
+    resumed = list(handicap_history(entries=entries[25:], seed=entries[6:25]))
+
+    assert [handicap_index for _, handicap_index in resumed] == \
+        [full_recalculation(entries[:i]) for i in range(26, 31)]
+
+
+def test_refresh_replaces_history_from_played_on():
+    mock_golf_round_repo = MagicMock()
+    mock_handicap_history_repo = MagicMock()
+    golf_rounds = [
+        HandicapRoundRow(
+            id=i,
+            user_id=1,
+            played_on=date(2021, 5, i),
+            gross_score=80 + i,
+            course_rating=Decimal('72.0'),
+            slope=Decimal('113'),
+        )
+        for i in range(1, 8)
+    ]
+    mock_golf_round_repo.get_handicap_window.return_value = list(reversed(golf_rounds[:4]))
+    mock_golf_round_repo.get_handicap_rounds.return_value = golf_rounds[4:]
+    mock_handicap_history_repo.replace_from.side_effect = lambda user_id, entries, played_on_from: len(entries)
+    service = HandicapHistoryService(
+        repo=mock_handicap_history_repo,
+        golf_round_repo=mock_golf_round_repo,
+        schema=HandicapHistorySchema(),
+    )
+
+    num_entries = service.refresh(user_id=1, played_on_from=date(2021, 5, 5))
+
+    assert num_entries == 3
+    mock_golf_round_repo.get_handicap_window.assert_called_with(
+        user_id=1,
+        window_size=19,
+        played_before=date(2021, 5, 5),
+    )
+    entries = mock_handicap_history_repo.replace_from.call_args.kwargs['entries']
+    assert [entry.golf_round_id for entry in entries] == [5, 6, 7]
+    assert [entry.handicap_index for entry in entries] == [Decimal('8.6'), Decimal('8.6'), Decimal('8.6')]
@@ -0,0 +1,76 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from api.handicap_kernel import (
+    from_tenths,
+    handicap_indexes,
+    to_tenths,
+)
+from api.handicap_math import handicap
+
+
+def decimal_index(rounds):
+    differentials = [
+        (gross_score - course_rating) * 113 / slope
+        for gross_score, course_rating, slope in rounds
+    ]
+    if len(differentials) < 5:
+        return None
+    return round(handicap(differentials=differentials), 1)
+
+
+def kernel_indexes(rounds_by_user: dict) -> dict:
+    rows = [(user_id, *golf_round) for user_id, rounds in rounds_by_user.items() for golf_round in rounds]
+    user_ids, index_tenths = handicap_indexes(
+        user_ids=[row[0] for row in rows],
+        gross_scores=[row[1] for row in rows],
+        course_ratings=to_tenths(row[2] for row in rows),
+        slopes=to_tenths(row[3] for row in rows),
+    )
+    return {int(user_id): from_tenths(tenths) for user_id, tenths in zip(user_ids, index_tenths)}
+
+
+def test_handicap_indexes_match_decimal_path():
+    rng = random.Random(18)
+    rounds_by_user = {
+        user_id: [
+            (rng.randint(62, 125), Decimal(rng.randint(660, 780)) / 10, Decimal(rng.randint(55, 155)))
+            for _ in range(rng.randint(0, 20))
+        ]
+        for user_id in range(1, 2001)
+    }
+
+    indexes = kernel_indexes(rounds_by_user)
+
+    expected = {
+        user_id: decimal_index(rounds)
+        for user_id, rounds in rounds_by_user.items()
+        if decimal_index(rounds) is not None
+    }
+    assert indexes == expected
+
+
+def test_handicap_indexes_rounding_tie_matches_decimal_path():
+    # (75 - 70.0) * 113 / 96 * 0.96 is exactly 5.65
+    rounds = [(75, Decimal('70.0'), Decimal('96'))] + [(90, Decimal('70.0'), Decimal('96'))] * 4
+
+    indexes = kernel_indexes({1: rounds})
+
+    assert indexes == {1: decimal_index(rounds)}
+
+
+def test_handicap_indexes_only_count_window():
+    recent_rounds = [(85, Decimal('72.0'), Decimal('113'))] * 20
+    old_rounds = [(72, Decimal('72.0'), Decimal('113'))] * 5
+
+    indexes = kernel_indexes({1: recent_rounds + old_rounds})
+
+    assert indexes == {1: decimal_index(recent_rounds)}
+
+
+def test_to_tenths_rejects_extra_precision():
+    assert list(to_tenths([Decimal('73.5'), Decimal('134')])) == [735, 1340]
+    with pytest.raises(ValueError):
+        to_tenths([Decimal('73.55')])
@@ -0,0 +1,22 @@
+import os
+import random
+from decimal import Decimal
+
+from api import handicap_math
+from api.handicap_math import determine_lowest_differentials
+
+REPO_ROOT = os.path.join(os.path.dirname(handicap_math.__file__), '..')
+LAMBDA_HANDICAP_MATH = os.path.join(REPO_ROOT, 'lambdas', 'handicap-service', 'src', 'lib', 'handicap_math.py')
+
+
+def test_determine_lowest_differentials():
+    rng = random.Random(18)
+    differentials = [Decimal(rng.randint(-50, 400)) / 10 for _ in range(20)]
+
+    assert determine_lowest_differentials(differentials=differentials, size=10) == sorted(differentials)[:10]
+
+
+def test_lambda_copy_matches():
+    with open(handicap_math.__file__) as api_copy, open(LAMBDA_HANDICAP_MATH) as lambda_copy:
+        assert lambda_copy.read() == api_copy.read(), \
+            "Expecting the handicap lambda's src/lib/handicap_math.py to be a copy of api/handicap_math.py"
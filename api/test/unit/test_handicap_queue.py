@@ -0,0 +1,99 @@
+import queue
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+from redis.exceptions import ConnectionError
+
+from api.handicap_queue import HandicapQueue
+from api.job_queue import Job
+from api.settings import Settings
+
+
+@pytest.fixture
+def mock_job_queue():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_redis_client():
+    pending = set()
+
+    def _set(key, value, nx=False, ex=None):
+        if nx and key in pending:
+            return None
+        pending.add(key)
+        return True
+
+    redis_client = MagicMock()
+    redis_client.set.side_effect = _set
+    redis_client.delete.side_effect = lambda key: pending.discard(key)
+    return redis_client
+
+
+def test_request_recompute_coalesces_per_user(mock_job_queue, mock_redis_client):
+    handicap_queue = HandicapQueue(
+        job_queue=mock_job_queue,
+        redis=mock_redis_client,
+        coalesce_seconds=30,
+    )
+
+    sent = [handicap_queue.request_recompute(user_id=1) for _ in range(5)]
+    sent.append(handicap_queue.request_recompute(user_id=2))
+
+    assert sent == [True, False, False, False, False, True]
+    assert mock_job_queue.send.call_count == 2
+    mock_job_queue.send.assert_called_with(body={"user_id": 2}, delay_seconds=30)
+    mock_redis_client.set.assert_called_with('handicap:pending:2', '1', nx=True, ex=30)
+
+
+def test_request_recompute_clears_pending_when_queue_is_full(mock_job_queue, mock_redis_client):
+    handicap_queue = HandicapQueue(
+        job_queue=mock_job_queue,
+        redis=mock_redis_client,
+        coalesce_seconds=30,
+    )
+    mock_job_queue.send.side_effect = queue.Full()
+
+    with pytest.raises(queue.Full):
+        handicap_queue.request_recompute(user_id=1)
+    mock_job_queue.send.side_effect = None
+
+    assert handicap_queue.request_recompute(user_id=1), \
+        "A job that could not be queued should not leave the User's recompute marked as pending"
+
+
+def test_request_recompute_fails_open(mock_job_queue):
+    mock_redis_client = MagicMock()
+    mock_redis_client.set.side_effect = ConnectionError()
+    handicap_queue = HandicapQueue(
+        job_queue=mock_job_queue,
+        redis=mock_redis_client,
+        coalesce_seconds=30,
+    )
+
+    assert handicap_queue.request_recompute(user_id=1)
+    assert handicap_queue.request_recompute(user_id=1)
+    assert mock_job_queue.send.call_count == 2
+
+
+def test_failed_job_clears_pending(mock_job_queue, mock_redis_client):
+    handicap_queue = HandicapQueue(
+        job_queue=mock_job_queue,
+        redis=mock_redis_client,
+        coalesce_seconds=30,
+    )
+    handicap_queue.request_recompute(user_id=1)
+    (job_failed,), _ = mock_job_queue.on_failure.call_args
+
+    job_failed(Job(body={"user_id": 1}, delay_seconds=30))
+
+    assert handicap_queue.request_recompute(user_id=1), \
+        "A job the queue gave up on should not leave the User's recompute marked as pending"
+
+
+def test_sqs_backend_requires_queue_url():
+    with pytest.raises(ValidationError):
+        Settings(JOB_QUEUE_BACKEND='sqs', HANDICAP_QUEUE_URL=None)
+
+    assert Settings(JOB_QUEUE_BACKEND='redis', HANDICAP_QUEUE_URL=None).HANDICAP_QUEUE_URL is None
@@ -0,0 +1,92 @@
+from collections import namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from api.handicap_math import handicap
+from api.handicap_window import DifferentialWindow
+
+WindowEntry = namedtuple('WindowEntry', ['golf_round_id', 'played_on', 'differential'])
+
+
+@pytest.fixture
+def window_entry_factory():
+    def _window_entry_factory(golf_round_id: int, differential: str, days_ago: int = None):
+        days_ago = golf_round_id if days_ago is None else days_ago
+        return WindowEntry(
+            golf_round_id=golf_round_id,
+            played_on=date(2021, 6, 1) - timedelta(days=days_ago),
+            differential=Decimal(differential),
+        )
+    return _window_entry_factory
+
+
+def test_handicap_index_matches_full_recalculation(window_entry_factory):
+    entries = [window_entry_factory(golf_round_id=i, differential=f'{i % 7}.{i % 3}') for i in range(1, 26)]
+    window = DifferentialWindow(entries=reversed(entries), window_size=20, capacity=40)
+
+    most_recent = [entry.differential for entry in entries[:20]]
+    assert [entry.golf_round_id for entry in window.window] == list(range(1, 21))
+    assert window.handicap_index() == round(handicap(differentials=most_recent), 1)
+
+
+def test_handicap_index_not_enough_rounds(window_entry_factory):
+    entries = [window_entry_factory(golf_round_id=i, differential='10.0') for i in range(1, 5)]
+    window = DifferentialWindow(entries=entries)
+
+    assert window.handicap_index() is None, "Users with less than 5 golf rounds should not receive a handicap"
+    assert window.is_short
+
+
+def test_add_drops_rounds_past_capacity(window_entry_factory):
+    window = DifferentialWindow(
+        entries=[window_entry_factory(golf_round_id=i, differential='10.0') for i in range(1, 5)],
+        window_size=2,
+        capacity=4,
+    )
+
+    newest = window_entry_factory(golf_round_id=5, differential='1.0', days_ago=0)
+    dropped = window.add(newest)
+    assert [entry.golf_round_id for entry in dropped] == [4]
+    assert window.window[0] is newest
+
+    too_old = window_entry_factory(golf_round_id=6, differential='1.0', days_ago=30)
+    assert window.add(too_old) == [too_old]
+    assert len(window) == 4
+
+
+def test_remove_backfills_window(window_entry_factory):
+    entries = [window_entry_factory(golf_round_id=i, differential=f'{i}.0') for i in range(1, 8)]
+    window = DifferentialWindow(entries=entries, window_size=5, capacity=10)
+    assert window.handicap_index() == round(handicap(differentials=[Decimal(f'{i}.0') for i in range(1, 6)]), 1)
+
+    removed = window.remove(golf_round_id=1, played_on=entries[0].played_on)
+
+    assert removed is entries[0]
+    assert [entry.golf_round_id for entry in window.window] == [2, 3, 4, 5, 6]
+    assert window.handicap_index() == round(handicap(differentials=[Decimal(f'{i}.0') for i in range(2, 7)]), 1)
+    assert window.remove(golf_round_id=1, played_on=entries[0].played_on) is None
+
+
+def test_incomplete_window_does_not_append_older_rounds(window_entry_factory):
+    entries = [window_entry_factory(golf_round_id=i, differential='10.0') for i in range(1, 4)]
+    # round 4 was trimmed past capacity, then deletes shrank the window below it
+    window = DifferentialWindow(entries=entries, window_size=2, capacity=4, complete=False)
+
+    backdated = window_entry_factory(golf_round_id=5, differential='1.0', days_ago=10)
+    assert window.add(backdated) == [backdated], "Expecting round 4 might come before the backdated round"
+    assert [entry.golf_round_id for entry in window.entries] == [1, 2, 3]
+
+    within = window_entry_factory(golf_round_id=6, differential='1.0', days_ago=2)
+    assert window.add(within) == []
+    assert [entry.golf_round_id for entry in window.entries] == [1, 6, 2, 3]
+
+
+def test_complete_window_appends_older_rounds(window_entry_factory):
+    entries = [window_entry_factory(golf_round_id=i, differential='10.0') for i in range(1, 4)]
+    window = DifferentialWindow(entries=entries, window_size=2, capacity=4)
+
+    backdated = window_entry_factory(golf_round_id=5, differential='1.0', days_ago=10)
+    assert window.add(backdated) == []
+    assert window.entries[-1] is backdated
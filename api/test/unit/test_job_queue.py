@@ -0,0 +1,102 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+from api.job_queue import (
+    InProcessJobQueue,
+    Job,
+    RedisJobQueue,
+    SqsJobQueue,
+)
+
+QUEUE_URL = "https://sqs.us-east-2.amazonaws.com/1/HandicapQueue"
+
+
+def test_sqs_job_queue_sends_batches():
+    mock_sqs_client = MagicMock()
+    mock_sqs_client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+    job_queue = SqsJobQueue(queue_url=QUEUE_URL, sqs_client=mock_sqs_client, flush_seconds=0.5)
+
+    for user_id in range(25):
+        job_queue.send(body={"user_id": user_id}, delay_seconds=30)
+    assert job_queue.flush(), "Every job should be handed to SQS"
+
+    batches = [call.kwargs['Entries'] for call in mock_sqs_client.send_message_batch.call_args_list]
+    assert all(len(entries) <= 10 for entries in batches), "SendMessageBatch accepts at most 10 entries"
+    assert len(batches) < 25, "Jobs should be sent in batches"
+    bodies = [json.loads(entry['MessageBody']) for entries in batches for entry in entries]
+    assert bodies == [{"user_id": user_id} for user_id in range(25)]
+    assert all(entry['DelaySeconds'] == 30 for entries in batches for entry in entries)
+
+
+def test_send_does_not_wait_for_backend():
+    release = threading.Event()
+    mock_sqs_client = MagicMock()
+    mock_sqs_client.send_message_batch.side_effect = lambda **kwargs: release.wait() and {}
+    job_queue = SqsJobQueue(queue_url=QUEUE_URL, sqs_client=mock_sqs_client)
+
+    job_queue.send(body={"user_id": 1})
+    assert not job_queue.flush(timeout=0.1), "A slow backend should not block send"
+
+    release.set()
+    assert job_queue.flush()
+
+
+def test_redis_job_queue_delays_jobs():
+    mock_redis_client = MagicMock()
+    job_queue = RedisJobQueue(redis_client=mock_redis_client, name='handicap')
+
+    job_queue._send_batch([Job(body={"user_id": 1}, delay_seconds=0), Job(body={"user_id": 2}, delay_seconds=30)])
+
+    pipeline = mock_redis_client.pipeline.return_value
+    pipeline.rpush.assert_called_with('jobs:handicap', '{"user_id": 1}')
+    key, scores = pipeline.zadd.call_args.args
+    assert key == 'jobs:handicap:delayed'
+    assert list(scores) == ['{"user_id": 2}']
+    assert pipeline.execute.called
+
+
+def test_in_process_job_queue_runs_handler():
+    handled = []
+    job_queue = InProcessJobQueue(handler=handled.append)
+
+    job_queue.send(body={"user_id": 1})
+    job_queue.send(body={"user_id": 2})
+
+    assert job_queue.flush()
+    assert handled == [{"user_id": 1}, {"user_id": 2}]
+
+
+def test_sqs_job_queue_retries_rejected_jobs():
+    mock_sqs_client = MagicMock()
+    mock_sqs_client.send_message_batch.side_effect = [
+        {'Successful': [{'Id': '0'}], 'Failed': [{'Id': '1', 'SenderFault': False, 'Code': 'InternalError'}]},
+        ConnectionError('Connection reset'),
+        {'Successful': [{'Id': '0'}], 'Failed': []},
+    ]
+    job_queue = SqsJobQueue(queue_url=QUEUE_URL, sqs_client=mock_sqs_client, flush_seconds=0.1, retry_seconds=0.01)
+    failed = []
+    job_queue.on_failure(failed.append)
+
+    job_queue.send(body={"user_id": 1})
+    job_queue.send(body={"user_id": 2})
+    assert job_queue.flush()
+
+    retried = [call.kwargs['Entries'] for call in mock_sqs_client.send_message_batch.call_args_list[1:]]
+    assert [[json.loads(entry['MessageBody']) for entry in entries] for entries in retried] == \
+        [[{"user_id": 2}], [{"user_id": 2}]], "Expecting only the rejected job to be retried"
+    assert failed == []
+
+
+def test_job_queue_gives_up_after_max_attempts():
+    mock_sqs_client = MagicMock()
+    mock_sqs_client.send_message_batch.side_effect = ConnectionError('Connection refused')
+    job_queue = SqsJobQueue(queue_url=QUEUE_URL, sqs_client=mock_sqs_client, max_attempts=3, retry_seconds=0.01)
+    failed = []
+    job_queue.on_failure(failed.append)
+
+    job_queue.send(body={"user_id": 1})
+    assert job_queue.flush()
+
+    assert mock_sqs_client.send_message_batch.call_count == 3
+    assert failed == [Job(body={"user_id": 1}, delay_seconds=0)]
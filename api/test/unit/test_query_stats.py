@@ -0,0 +1,46 @@
+import json
+import logging
+
+from sqlalchemy import text
+
+from api.database import db_session
+from api.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, REPEATED_STATEMENT_THRESHOLD
+
+
+def add_route(app, num_queries: int):
+    @app.route('/api/query-stats-test')
+    def run_queries():
+        for _ in range(num_queries):
+            db_session.execute(text('SELECT 1'))
+        return 'ok'
+
+
+def test_query_stats_headers(app, client, sqlite_db, query_budget):
+    add_route(app, num_queries=2)
+
+    resp = client.get('/api/query-stats-test')
+
+    assert resp.headers[QUERY_COUNT_HEADER] == '2'
+    assert float(resp.headers[QUERY_TIME_HEADER]) >= 0
+    assert query_budget(resp, max_queries=2) == 2
+
+
+def test_query_stats_headers_are_off_by_default(app, client, sqlite_db):
+    add_route(app, num_queries=1)
+
+    resp = client.get('/api/query-stats-test')
+
+    assert QUERY_COUNT_HEADER not in resp.headers
+
+
+def test_query_stats_are_logged(app, client, sqlite_db, caplog):
+    add_route(app, num_queries=REPEATED_STATEMENT_THRESHOLD)
+
+    with caplog.at_level(logging.INFO, logger='api.query_stats'):
+        client.get('/api/query-stats-test')
+
+    request_queries, repeated_statement = [json.loads(record.message) for record in caplog.records]
+    assert request_queries['queries'] == REPEATED_STATEMENT_THRESHOLD
+    assert request_queries['path'] == '/api/query-stats-test'
+    assert repeated_statement['event'] == 'repeated_statement'
+    assert repeated_statement['statement'] == 'SELECT 1'
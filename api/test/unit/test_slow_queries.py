@@ -0,0 +1,131 @@
+import json
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from api import slow_queries
+from api.settings import settings
+from api.slow_queries import SlowQueryLog, explain, explainable, normalize, slow_query_log
+
+
+@pytest.fixture
+def every_statement_is_slow(monkeypatch):
+    monkeypatch.setattr(settings, 'SLOW_QUERY_SECONDS', 0)
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+def test_normalize_collapses_parameters_and_literals():
+    assert normalize(
+        "SELECT * FROM public.golf_round WHERE user_id = %(user_id_1)s AND id IN (%(id_1)s, %(id_2)s, %(id_3)s) "
+        "AND played_on > '2021-05-01' LIMIT 20"
+    ) == "SELECT * FROM public.golf_round WHERE user_id = ? AND id IN (?) AND played_on > ? LIMIT ?"
+
+
+def test_normalize_collapses_multi_row_values():
+    two_rows = normalize("INSERT INTO public.hole (par, handicap) VALUES (%(par_m0)s, 1), (%(par_m1)s, 2)")
+    three_rows = normalize("INSERT INTO public.hole (par, handicap) VALUES (?, ?), (?, ?),\n (?, ?)")
+
+    assert two_rows == three_rows == "INSERT INTO public.hole (par, handicap) VALUES (?, ?)"
+
+
+def test_slow_query_log_keeps_the_slowest_statements():
+    log = SlowQueryLog(top_n=2)
+    log.record('SELECT ?', 0.6)
+    log.record('SELECT ? FROM public.hole', 0.9)
+    log.record('SELECT ?', 0.7)
+    log.record('SELECT ? FROM public.golf_round', 0.5)
+    log.record('SELECT ? FROM public.tee_box', 1.2)
+
+    top = log.top()
+
+    assert [entry['sql'] for entry in top] == ['SELECT ? FROM public.tee_box', 'SELECT ? FROM public.hole']
+    log.record('SELECT ?', 2.0)
+    assert [(entry['sql'], entry['count']) for entry in log.top()] == [
+        ('SELECT ?', 1),
+        ('SELECT ? FROM public.tee_box', 1),
+    ], "Expecting an evicted statement to start counting again"
+
+
+def test_slow_statement_is_captured_with_its_repository_method_and_endpoint(
+    client, sqlite_db, every_statement_is_slow, caplog
+):
+    with caplog.at_level(logging.WARNING, logger='api.slow_queries'):
+        client.get('/api/golf-clubs/')
+
+    captured = [json.loads(record.message) for record in caplog.records]
+    assert captured and all(entry['event'] == 'slow_query' for entry in captured)
+    assert all(entry['plan'] is None for entry in captured), "Expecting only Postgres statements to be explained"
+    entries = {entry['repository_method']: entry for entry in every_statement_is_slow.top()}
+    assert entries['GolfClubRepository.get_all']['endpoint'] == 'golf-clubs.golf_clubs'
+
+
+def test_fast_statements_are_not_captured(client, sqlite_db):
+    slow_query_log.clear()
+
+    client.get('/api/golf-clubs/')
+
+    assert slow_query_log.top() == []
+
+
+def postgres_connection():
+    conn = MagicMock()
+    conn.dialect.name = 'postgresql'
+    return conn
+
+
+@pytest.mark.parametrize('statement, executemany, expected', [
+    ('SELECT * FROM public.hole WHERE id = %(id_1)s', False, True),
+    ('WITH rounds AS (SELECT 1) SELECT * FROM rounds', False, True),
+    ('SELECT * FROM public.user WHERE id = %(id_1)s FOR NO KEY UPDATE', False, True),
+    ('SELECT * FROM public.hole', True, False),
+    ('UPDATE public.handicap SET record_end_date = now()', False, False),
+    ('WITH deleted AS (DELETE FROM public.hole RETURNING id) SELECT * FROM deleted', False, False),
+])
+def test_only_reads_are_explained(statement, executemany, expected):
+    assert explainable(postgres_connection(), statement, executemany) is expected
+
+
+def test_explain_runs_in_a_savepoint():
+    conn = postgres_connection()
+    cursor = conn.connection.cursor.return_value
+    cursor.fetchall.return_value = [('Index Scan using ix_hole_tee_box_id on hole',), ('  Buffers: shared hit=4',)]
+
+    plan = explain(conn, 'SELECT * FROM public.hole WHERE tee_box_id = %(tee_box_id_1)s', {'tee_box_id_1': 1})
+
+    assert plan == 'Index Scan using ix_hole_tee_box_id on hole\n  Buffers: shared hit=4'
+    assert [call.args for call in cursor.execute.call_args_list] == [
+        ('SAVEPOINT slow_query_explain',),
+        (
+            'EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM public.hole WHERE tee_box_id = %(tee_box_id_1)s',
+            {'tee_box_id_1': 1},
+        ),
+        ('RELEASE SAVEPOINT slow_query_explain',),
+    ]
+    cursor.close.assert_called_once()
+
+
+def test_failed_explain_rolls_back_to_the_savepoint():
+    conn = postgres_connection()
+    cursor = conn.connection.cursor.return_value
+    cursor.execute.side_effect = [None, Exception('canceling statement due to statement timeout'), None]
+
+    assert explain(conn, 'SELECT 1', {}) is None
+    assert cursor.execute.call_args_list[-1].args == ('ROLLBACK TO SAVEPOINT slow_query_explain',)
+    cursor.close.assert_called_once()
+
+
+def test_sampled_statements_are_explained(monkeypatch, every_statement_is_slow, caplog):
+    monkeypatch.setattr(settings, 'SLOW_QUERY_EXPLAIN_RATE', 1)
+    monkeypatch.setattr(slow_queries, 'explain', lambda conn, statement, parameters: 'Seq Scan on hole')
+
+    with caplog.at_level(logging.WARNING, logger='api.slow_queries'):
+        slow_queries.capture(postgres_connection(), 'SELECT * FROM public.hole', {}, False, 0.8)
+
+    captured, = [json.loads(record.message) for record in caplog.records]
+    assert captured['plan'] == 'Seq Scan on hole'
+    entry, = every_statement_is_slow.top()
+    assert 'plan' not in entry, "Expecting the plan not to be served with the statement, it can quote parameters"
+    assert (entry['sql'], entry['max_seconds'], entry['endpoint']) == ('SELECT * FROM public.hole', 0.8, None)
@@ -0,0 +1,108 @@
+from collections import namedtuple
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from api.models import Handicap
+from api.tasks import (
+    calculate_handicap_indexes,
+    calculate_usga_handicap,
+    recalculate_handicap_range,
+    split_user_id_range,
+)
+
+HandicapWindowRow = namedtuple(
+    'HandicapWindowRow',
+    ['user_id', 'golf_round_id', 'gross_score', 'course_rating', 'slope', 'recency'],
+)
+
+
+@pytest.fixture
+def handicap_window_factory():
+    def _handicap_window_factory(user_id: int, gross_scores: list):
+        return [
+            HandicapWindowRow(
+                user_id=user_id,
+                golf_round_id=recency,
+                gross_score=gross_score,
+                course_rating=Decimal('73.5'),
+                slope=Decimal('134'),
+                recency=recency,
+            )
+            for recency, gross_score in enumerate(gross_scores, start=1)
+        ]
+    return _handicap_window_factory
+
+
+def test_calculate_handicap_indexes(handicap_window_factory):
+    handicap_windows = [
+        *handicap_window_factory(user_id=1, gross_scores=[74, 75, 76, 77, 78]),
+        *handicap_window_factory(user_id=2, gross_scores=[80, 82, 84, 86, 88, 90, 92, 94, 96, 98, 100]),
+    ]
+
+    indexes = calculate_handicap_indexes(handicap_windows=handicap_windows)
+
+    assert indexes == {1: Decimal('0.4'), 2: Decimal('8.5')}
+
+
+def test_calculate_handicap_indexes_more_precise_than_tenths(handicap_window_factory):
+    precise_rounds = [
+        row._replace(course_rating=Decimal('73.55'))
+        for row in handicap_window_factory(user_id=2, gross_scores=[74, 75, 76, 77, 78])
+    ]
+    handicap_windows = [*handicap_window_factory(user_id=1, gross_scores=[74, 75, 76, 77, 78]), *precise_rounds]
+
+    indexes = calculate_handicap_indexes(handicap_windows=handicap_windows)
+
+    assert indexes == {1: Decimal('0.4'), 2: Decimal('0.4')}, \
+        "Expecting a User with a more precise course rating to be calculated with Decimals, not fail the batch"
+
+
+def test_calculate_handicap_indexes_not_enough_rounds(handicap_window_factory):
+    handicap_windows = handicap_window_factory(user_id=1, gross_scores=[74, 75, 76, 77])
+
+    indexes = calculate_handicap_indexes(handicap_windows=handicap_windows)
+
+    assert indexes == {}, "Users with less than 5 golf rounds should not receive a handicap"
+
+
+def test_split_user_id_range():
+    assert split_user_id_range(1, 10, 3) == [(1, 4), (5, 8), (9, 10)]
+    assert split_user_id_range(5, 5, 4) == [(5, 5)]
+
+
+def test_recalculate_handicap_range_closes_handicaps_without_enough_rounds(sqlite_db, golf_course, add_rounds):
+    add_rounds(user_id=1, num_rounds=5)
+    add_rounds(user_id=2, num_rounds=4)
+    sqlite_db.add(Handicap(user_id=2, index=Decimal('20.1')))
+    sqlite_db.commit()
+
+    assert recalculate_handicap_range(min_user_id=1, max_user_id=2) == {'rounds': 9, 'handicaps': 1}
+
+    active_handicaps = sqlite_db.query(Handicap).filter(Handicap.record_end_date.is_(None)).all()
+    assert [handicap.user_id for handicap in active_handicaps] == [1], \
+        "Users left with less than 5 golf rounds should have their handicap closed"
+
+
+@patch('api.tasks.db_session')
+@patch('api.tasks.handicap_repo')
+@patch('api.tasks.HandicapWindowService')
+def test_calculate_usga_handicap(mock_window_service, mock_handicap_repo, mock_db_session):
+    mock_window_service.return_value.handicap_index.return_value = Decimal('12.4')
+
+    calculate_usga_handicap(1)
+
+    mock_handicap_repo.bulk_replace.assert_called_once_with(indexes={1: Decimal('12.4')})
+
+
+@patch('api.tasks.db_session')
+@patch('api.tasks.handicap_repo')
+@patch('api.tasks.HandicapWindowService')
+def test_calculate_usga_handicap_not_enough_rounds(mock_window_service, mock_handicap_repo, mock_db_session):
+    mock_window_service.return_value.handicap_index.return_value = None
+
+    calculate_usga_handicap(1)
+
+    mock_handicap_repo.close_active.assert_called_once_with(user_id=1)
+    mock_handicap_repo.bulk_replace.assert_not_called()
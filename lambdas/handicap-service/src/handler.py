@@ -1,15 +1,69 @@
 import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
-from lib.footwedge_api import FootwedgeApi
+from lib.footwedge_api import FootwedgeApi, call_stats
 from lib.service import HandicapService
 
+logger = logging.getLogger(__name__)
+logger.setLevel(level=logging.INFO)
 
-def lambda_handler(event, context):
-    print(json.dumps(event))
-    for record in event['Records']:
-        payload = json.loads(record["body"])
-        user_id = payload.get("user_id")
+MAX_WORKERS = int(os.environ.get("HANDICAP_MAX_WORKERS", "8"))
+
+# created once per container and reused across warm invocations
+footwedge_api_client = FootwedgeApi()
+
+
+def group_message_ids_by_user_id(records: List[dict]) -> Tuple[Dict[int, List[str]], List[str]]:
+    """
+    Collapse a batch of SQS records into one entry per user_id
+    :return: (mapping of user_id to the message ids requesting it, message ids that could not be parsed)
+    """
+    message_ids_by_user_id = OrderedDict()
+    invalid_message_ids = []
+    for record in records:
+        message_id = record["messageId"]
+        try:
+            user_id = int(json.loads(record["body"])["user_id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            logger.error(f"Unable to read a user_id from message: {message_id} reason: {exc}")
+            invalid_message_ids.append(message_id)
+            continue
+        message_ids_by_user_id.setdefault(user_id, []).append(message_id)
+
+    return message_ids_by_user_id, invalid_message_ids
+
+
+def calculate_handicap(footwedge_api_client: FootwedgeApi, user_id: int) -> bool:
+    try:
         HandicapService(
-            footwedge_api_client=FootwedgeApi(),
+            footwedge_api_client=footwedge_api_client,
             user_id=user_id,
         ).add_handicap()
+    except Exception:
+        logger.exception(f"Handicap calculation failed for user: {user_id}")
+        return False
+    return True
+
+
+def lambda_handler(event, context):
+    records = event['Records']
+    message_ids_by_user_id, failed_message_ids = group_message_ids_by_user_id(records=records)
+    logger.info(f"Received {len(records)} messages for {len(message_ids_by_user_id)} users")
+
+    call_stats.reset()
+    user_ids = list(message_ids_by_user_id)
+    num_workers = max(min(MAX_WORKERS, len(user_ids)), 1)
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        results = executor.map(lambda user_id: calculate_handicap(footwedge_api_client, user_id), user_ids)
+        for user_id, succeeded in zip(user_ids, results):
+            if not succeeded:
+                failed_message_ids.extend(message_ids_by_user_id[user_id])
+    logger.info(f"FootwedgeApi calls: {json.dumps(call_stats.summary())}")
+
+    return {
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids],
+    }
@@ -1,24 +1,108 @@
 import os
+import random
+import threading
+import time
+from collections import defaultdict
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 AUTH_SERVICE_TOKEN_URL = ""
 FOOTWEDGE_API_URL = os.environ.get("FOOTWEDGE_API_URL")
+# the API's SERVICE_API_TOKEN
+FOOTWEDGE_API_TOKEN = os.environ.get("FOOTWEDGE_API_TOKEN", "")
+POOL_SIZE = int(os.environ.get("FOOTWEDGE_API_POOL_SIZE", "10"))
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.2
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10.0
 
 
-class FootwedgeApi:
+class JitteredRetry(Retry):
+    """Retry with full jitter, so concurrent callers don't retry a struggling API in lockstep"""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff)
+
+
+class CallStats:
+    """Per-method call counts and latency of FootwedgeApi calls, safe to share between threads"""
 
     def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = defaultdict(int)
+            self.errors = defaultdict(int)
+            self.total_seconds = defaultdict(float)
+            self.max_seconds = defaultdict(float)
+
+    def record(self, method: str, elapsed: float, ok: bool):
+        with self._lock:
+            self.calls[method] += 1
+            self.total_seconds[method] += elapsed
+            self.max_seconds[method] = max(self.max_seconds[method], elapsed)
+            if not ok:
+                self.errors[method] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                method: {
+                    "calls": calls,
+                    "errors": self.errors[method],
+                    "avg_ms": round(self.total_seconds[method] / calls * 1000, 1),
+                    "max_ms": round(self.max_seconds[method] * 1000, 1),
+                }
+                for method, calls in self.calls.items()
+            }
+
+
+def build_session(pool_size: int = POOL_SIZE, max_retries: int = MAX_RETRIES) -> requests.Session:
+    """
+    A keep-alive session with a connection pool sized for the handler's worker threads,
+    retrying connection errors, timeouts and 5xx responses with jittered exponential backoff
+    """
+    retry = JitteredRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# module level so warm Lambda invocations reuse open connections
+session = build_session()
+call_stats = CallStats()
+
+
+class FootwedgeApi:
+
+    def __init__(self, http_session: requests.Session = None, stats: CallStats = None):
+        self.session = http_session or session
+        self.stats = stats or call_stats
         self.access_token = self.get_access_token()
 
     @staticmethod
     def get_access_token() -> str:
-        # TODO: implement integration with auth service
-        return ""
+        return FOOTWEDGE_API_TOKEN
 
     def apply_auth_header(self, headers: dict):
         auth_key = "Authorization"
-        headers[auth_key] = self.access_token
+        headers.setdefault(auth_key, f"Bearer {self.access_token}")
 
     def call(self, method: str, path: str, **kwargs):
         """
@@ -26,16 +110,20 @@ class FootwedgeApi:
         """
         url = f"{FOOTWEDGE_API_URL}{path}"
         headers = kwargs.pop('headers', {})
-        # headers = kwargs.get('headers') or {}
-        # apply auth header
-        # self.apply_auth_header(headers=headers)
-        resp = requests.request(
-            method=method,
-            url=url,
-            headers=headers,
-            timeout=10.0,
-            verify=False,
-            **kwargs
-        )
+        self.apply_auth_header(headers=headers)
+        start = time.perf_counter()
+        ok = False
+        try:
+            resp = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                verify=False,
+                **kwargs
+            )
+            ok = resp.ok
+        finally:
+            self.stats.record(method=method.upper(), elapsed=time.perf_counter() - start, ok=ok)
 
         return resp
@@ -0,0 +1,57 @@
+"""
+Handicap math shared by the API and the handicap lambda, one User at a time on Decimals.
+
+It imports nothing but the standard library. The lambda packages a copy of this file as
+lambdas/handicap-service/src/lib/handicap_math.py, test_handicap_math checks the two match.
+For many Users at once see api.handicap_kernel.
+"""
+import heapq
+import logging
+from decimal import Decimal
+
+MIN_HANDICAP_ROUNDS = 5
+WINDOW_SIZE = 20
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_differential(gross_score, course_rating, slope):
+    differential = ((gross_score - course_rating) * 113) / slope
+    return differential
+
+
+def sample_size(num_rounds: int):
+    if num_rounds < MIN_HANDICAP_ROUNDS:
+        logger.info('sample size is too small, need atleast 5 rounds recorded')
+        return
+    if num_rounds <= 10:
+        size = 1
+    elif num_rounds <= 19:
+        size = 5
+    else:
+        size = 10
+
+    return size
+
+
+def determine_lowest_differentials(differentials, size):
+    num_differentials = len(differentials)
+    if size > num_differentials:
+        raise Exception('Size greater than the number of differentials')
+    elif size == num_differentials:
+        return differentials
+    else:
+        return heapq.nsmallest(size, differentials)
+
+
+def average_handicap(lowest_differentials):
+    return (sum(lowest_differentials)/len(lowest_differentials)) * Decimal('0.96')
+
+
+def handicap(differentials):
+    size = sample_size(num_rounds=len(differentials))
+    lowest_differentials = determine_lowest_differentials(
+        differentials=differentials,
+        size=size,
+    )
+    return average_handicap(lowest_differentials)
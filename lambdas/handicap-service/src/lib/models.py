@@ -22,3 +22,8 @@ class TeeBox(BaseModel):
     unit: str
     course_rating: Decimal
     slope: Decimal
+
+
+class HandicapRound(GolfRound):
+    course_rating: Decimal
+    slope: Decimal
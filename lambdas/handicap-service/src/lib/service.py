@@ -3,11 +3,9 @@ import logging
 from decimal import Decimal
 from typing import List
 
+from lib import handicap_math
 from lib.footwedge_api import FootwedgeApi
-from lib.models import (
-    GolfRound,
-    TeeBox,
-)
+from lib.models import HandicapRound
 from lib.exceptions import (
     SampleSizeTooSmall,
     HandicapServiceFailure,
@@ -23,54 +21,31 @@ class HandicapService:
         self.footwedge_api_client = footwedge_api_client
         self.user_id = user_id
 
-    def _get_golf_rounds(self) -> List[GolfRound]:
-        path = f"/golf-rounds/{self.user_id}"
+    def _get_handicap_window(self) -> List[HandicapRound]:
+        path = f"/golf-rounds/{self.user_id}/handicap-window"
         resp = self.footwedge_api_client.call(method="get", path=path)
         if not resp.ok:
             error_message = f"status_code: '{resp.status_code}' reason: '{resp.text}'"
             logger.error(error_message)
             raise HandicapServiceFailure(error_message)
 
-        results = resp.json().get('result')
-        if not results:
-            error_message = f"The user_id: {self.user_id} does not have any golf_round records"
-            logger.error(error_message)
-            raise HandicapServiceFailure(error_message)
-        golf_rounds = [GolfRound(**result) for result in results]
-        return golf_rounds
-
-    def _get_tee_box(self, tee_box_id: int) -> TeeBox:
-        path = f"/golf-courses/tee-boxes/{tee_box_id}"
-        resp = self.footwedge_api_client.call(method="get", path=path)
-        if not resp.ok:
-            error_message = f"status_code: '{resp.status_code}' reason: '{resp.text}'"
-            logger.error(error_message)
-            raise HandicapServiceFailure(error_message)
-
-        result = resp.json().get('result')
-        if not result:
-            error_message = f"No tee-box with id: {tee_box_id}"
-            raise HandicapServiceFailure(error_message)
-        return TeeBox(**result)
+        results = resp.json().get('result') or []
+        return [HandicapRound(**result) for result in results]
 
     @staticmethod
     def calculate_differential(gross_score: int, course_rating: Decimal, slope: Decimal) -> Decimal:
-        differential = ((gross_score - course_rating) * 113) / slope
-        return differential
+        return handicap_math.calculate_differential(
+            gross_score=gross_score,
+            course_rating=course_rating,
+            slope=slope,
+        )
 
     @staticmethod
     def determine_sample_size(num_rounds: int) -> int:
-        if num_rounds < 5:
+        if num_rounds < handicap_math.MIN_HANDICAP_ROUNDS:
             error_message = 'sample size is too small, need atleast 5 rounds recorded'
             raise SampleSizeTooSmall(error_message)
-        if num_rounds <= 10:
-            size = 1
-        elif num_rounds <= 19:
-            size = 5
-        else:
-            size = 10
-
-        return size
+        return handicap_math.sample_size(num_rounds=num_rounds)
 
     def determine_lowest_differential(self, differentials: List[Decimal]) -> List[Decimal]:
         sample_size = self.determine_sample_size(num_rounds=len(differentials))
@@ -82,15 +57,13 @@ class HandicapService:
         elif sample_size == num_differentials:
             return differentials
         else:
-            sorted_differentials = sorted(differentials)
-            lowest_differentials = sorted_differentials[:sample_size]
-            return lowest_differentials
+            return handicap_math.determine_lowest_differentials(differentials=differentials, size=sample_size)
 
     def calculate_handicap_index(self, differentials) -> Decimal:
         lowest_differentials = self.determine_lowest_differential(
             differentials=differentials,
         )
-        handicap_index = (sum(lowest_differentials) / len(lowest_differentials)) * Decimal('0.96')
+        handicap_index = handicap_math.average_handicap(lowest_differentials)
         return round(handicap_index, 1)
 
     def post_handicap(self, handicap_index: Decimal):
@@ -103,26 +76,39 @@ class HandicapService:
             headers={"Content-Type": "application/json"},
         )
 
+    def close_active_handicap(self):
+        resp = self.footwedge_api_client.call(method="delete", path=f"/handicaps/{self.user_id}/active")
+        if not resp.ok:
+            failure_message = f"Unable to close the active handicap for user: {self.user_id} \n" \
+                              f"Reason: {resp.text}"
+            logger.error(failure_message)
+            raise HandicapServiceFailure(failure_message)
+
     def add_handicap(self):
-        ordered_golf_rounds = self._get_golf_rounds()
-        if len(ordered_golf_rounds) > 20:
-            golf_rounds = ordered_golf_rounds[:20]
-        else:
-            golf_rounds = ordered_golf_rounds
-
-        differentials = []
-        for golf_round in golf_rounds:
-            tee_box = self._get_tee_box(tee_box_id=golf_round.tee_box_id)
-            differential = self.calculate_differential(
-                gross_score=golf_round.gross_score,
-                course_rating=tee_box.course_rating,
-                slope=tee_box.slope,
+        handicap_rounds = self._get_handicap_window()
+        if not handicap_rounds:
+            # deleting a User's last eligible round still requests a recompute, to close their handicap
+            logger.info(f"The user_id: {self.user_id} does not have any handicap eligible golf_round records")
+            self.close_active_handicap()
+            return
+
+        differentials = [
+            self.calculate_differential(
+                gross_score=handicap_round.gross_score,
+                course_rating=handicap_round.course_rating,
+                slope=handicap_round.slope,
             )
-            differentials.append(differential)
+            for handicap_round in handicap_rounds
+        ]
 
         try:
             handicap_index = self.calculate_handicap_index(differentials=differentials)
-        except (SampleSizeTooSmall, HandicapServiceFailure) as exc:
+        except SampleSizeTooSmall as exc:
+            # too few rounds left for a handicap, the one they had no longer applies
+            logger.info(f"user_id: {self.user_id}, {exc}")
+            self.close_active_handicap()
+            return
+        except HandicapServiceFailure as exc:
             logger.exception(exc)
             return
 
@@ -134,4 +120,5 @@ class HandicapService:
         else:
             failure_message = f"Unable to post handicap for user: {self.user_id} \n" \
                               f"Reason: {resp.text}"
-            logger.info(failure_message)
+            logger.error(failure_message)
+            raise HandicapServiceFailure(failure_message)
@@ -3,10 +3,6 @@ from unittest.mock import patch
 
 import pytest
 
-from lib.models import TeeBox
-from lib.exceptions import (
-    HandicapServiceFailure,
-)
 from lib.service import HandicapService
 
 HANDICAP_SERVICE_IMPORT_PATH = 'lib.service.HandicapService'
@@ -45,43 +41,17 @@ class TestHandicapService:
     #         user_id=cls.user_id,
     #     )
 
-    def test_get_golf_rounds_user_no_golf_rounds(self, footwedge_api_client):
-        invalid_user_id = IMPOSSIBLY_LARGE_INT
+    def test_get_handicap_window_user_no_golf_rounds(self, footwedge_api_client):
         handicap_svc = HandicapService(
             footwedge_api_client=footwedge_api_client,
-            user_id=invalid_user_id
+            user_id=IMPOSSIBLY_LARGE_INT,
         )
-        with pytest.raises(HandicapServiceFailure):
-            handicap_svc._get_golf_rounds()
-
-    def test_get_tee_box_invalid_id(self, footwedge_api_client):
-        invalid_tee_box_id = IMPOSSIBLY_LARGE_INT
-        handicap_service = HandicapService(
-            footwedge_api_client=footwedge_api_client,
-            user_id=1,
-        )
-        with pytest.raises(HandicapServiceFailure):
-            handicap_service._get_tee_box(
-                tee_box_id=invalid_tee_box_id,
-            )
-
-    def test_get_tee_box(self, footwedge_api_client, tee_box):
-        tee_box_id = tee_box.get('id')
-
-        handicap_service = HandicapService(
-            footwedge_api_client=footwedge_api_client,
-            user_id=1,
-        )
-        actual_tee_box = handicap_service._get_tee_box(
-            tee_box_id=tee_box_id,
-        )
-        expected_tee_box = TeeBox(**tee_box)
-        assert actual_tee_box == expected_tee_box, f"Expected a result = {expected_tee_box.json()}"
+        assert handicap_svc._get_handicap_window() == []
 
     @patch(f'{HANDICAP_SERVICE_IMPORT_PATH}.post_handicap')
-    @patch(f'{HANDICAP_SERVICE_IMPORT_PATH}._get_golf_rounds')
+    @patch(f'{HANDICAP_SERVICE_IMPORT_PATH}._get_handicap_window')
     def test_post_handicap_not_enough_golf_rounds(self,
-                                                  mock_get_golf_rounds,
+                                                  mock_get_handicap_window,
                                                   mock_post_handicap,
                                                   footwedge_api_client,
                                                   tee_box,
@@ -92,7 +62,7 @@ class TestHandicapService:
             user_id=user_id_not_enough_rounds,
             tee_box_id=tee_box_id,
         )
-        mock_get_golf_rounds.return_value = [golf_round]
+        mock_get_handicap_window.return_value = [golf_round]
         handicap_svc = HandicapService(
             footwedge_api_client=footwedge_api_client,
             user_id=user_id_not_enough_rounds
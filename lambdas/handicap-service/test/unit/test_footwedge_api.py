@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock
+
+import pytest
+from requests.exceptions import ConnectTimeout
+
+from lib.footwedge_api import (
+    CallStats,
+    FootwedgeApi,
+    JitteredRetry,
+    build_session,
+)
+
+
+def test_jittered_retry_backoff_is_bounded():
+    retry = JitteredRetry(total=5, backoff_factor=0.2)
+    for _ in range(3):
+        retry = retry.increment(method="GET", url="/golf-rounds/1")
+    max_backoff = 0.2 * (2 ** (3 - 1))
+
+    backoffs = [retry.get_backoff_time() for _ in range(50)]
+    assert all(0 <= backoff <= max_backoff for backoff in backoffs)
+    assert len(set(backoffs)) > 1, "Backoff should be jittered"
+
+
+def test_build_session_mounts_pooled_adapter():
+    session = build_session(pool_size=4, max_retries=2)
+    adapter = session.get_adapter("https://footwedge.test/api")
+
+    assert adapter._pool_maxsize == 4
+    assert isinstance(adapter.max_retries, JitteredRetry)
+    assert adapter.max_retries.total == 2
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_call_records_latency():
+    mock_session = MagicMock()
+    mock_session.request.return_value.ok = False
+    stats = CallStats()
+    footwedge_api = FootwedgeApi(http_session=mock_session, stats=stats)
+
+    footwedge_api.call(method="get", path="/golf-rounds/1")
+    footwedge_api.call(method="get", path="/golf-rounds/2")
+
+    summary = stats.summary()
+    assert summary["GET"]["calls"] == 2
+    assert summary["GET"]["errors"] == 2
+    assert mock_session.request.call_count == 2, "Calls should go through the shared session"
+
+
+def test_call_records_latency_on_timeout():
+    mock_session = MagicMock()
+    mock_session.request.side_effect = ConnectTimeout()
+    stats = CallStats()
+    footwedge_api = FootwedgeApi(http_session=mock_session, stats=stats)
+
+    with pytest.raises(ConnectTimeout):
+        footwedge_api.call(method="post", path="/handicaps/1")
+
+    summary = stats.summary()
+    assert summary["POST"]["calls"] == 1
+    assert summary["POST"]["errors"] == 1
+
+
+def test_call_sends_service_token(monkeypatch):
+    monkeypatch.setattr("lib.footwedge_api.FOOTWEDGE_API_TOKEN", "service-token")
+    mock_session = MagicMock()
+    footwedge_api = FootwedgeApi(http_session=mock_session, stats=CallStats())
+
+    footwedge_api.call(method="get", path="/golf-rounds/1/handicap-window")
+
+    _, kwargs = mock_session.request.call_args
+    assert kwargs["headers"]["Authorization"] == "Bearer service-token"
+
+
+def test_call_keeps_callers_authorization(monkeypatch):
+    monkeypatch.setattr("lib.footwedge_api.FOOTWEDGE_API_TOKEN", "service-token")
+    mock_session = MagicMock()
+    footwedge_api = FootwedgeApi(http_session=mock_session, stats=CallStats())
+
+    footwedge_api.call(method="get", path="/handicaps", headers={"Authorization": "Bearer user-token"})
+
+    _, kwargs = mock_session.request.call_args
+    assert kwargs["headers"]["Authorization"] == "Bearer user-token"
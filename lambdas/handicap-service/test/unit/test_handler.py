@@ -0,0 +1,68 @@
+import json
+from unittest.mock import patch, MagicMock
+
+from handler import (
+    group_message_ids_by_user_id,
+    lambda_handler,
+)
+from lib.exceptions import HandicapServiceFailure
+
+HANDLER_IMPORT_PATH = 'handler'
+
+
+def sqs_record(message_id: str, body) -> dict:
+    return {"messageId": message_id, "body": json.dumps(body)}
+
+
+def test_group_message_ids_by_user_id():
+    records = [
+        sqs_record("a", {"user_id": 1}),
+        sqs_record("b", {"user_id": 2}),
+        sqs_record("c", {"user_id": 1}),
+        sqs_record("d", {"some-key": "some-value"}),
+    ]
+
+    message_ids_by_user_id, invalid_message_ids = group_message_ids_by_user_id(records=records)
+
+    assert message_ids_by_user_id == {1: ["a", "c"], 2: ["b"]}
+    assert invalid_message_ids == ["d"]
+
+
+@patch(f"{HANDLER_IMPORT_PATH}.footwedge_api_client")
+@patch(f"{HANDLER_IMPORT_PATH}.HandicapService")
+def test_lambda_handler_dedupes_users(mock_handicap_service, mock_footwedge_api_client):
+    event = {"Records": [sqs_record(str(i), {"user_id": i % 3}) for i in range(9)]}
+
+    resp = lambda_handler(event, None)
+
+    assert resp == {"batchItemFailures": []}
+    assert mock_handicap_service.call_count == 3, "Each user should only be calculated once per batch"
+    assert all(
+        call.kwargs['footwedge_api_client'] is mock_footwedge_api_client
+        for call in mock_handicap_service.call_args_list
+    ), "Every invocation should share the module level FootwedgeApi client"
+    user_ids = sorted(call.kwargs['user_id'] for call in mock_handicap_service.call_args_list)
+    assert user_ids == [0, 1, 2]
+
+
+@patch(f"{HANDLER_IMPORT_PATH}.footwedge_api_client")
+@patch(f"{HANDLER_IMPORT_PATH}.HandicapService")
+def test_lambda_handler_reports_partial_failures(mock_handicap_service, mock_footwedge_api_client):
+    failing_service = MagicMock()
+    failing_service.add_handicap.side_effect = HandicapServiceFailure("Unable to post handicap")
+    mock_handicap_service.side_effect = \
+        lambda footwedge_api_client, user_id: failing_service if user_id == 2 else MagicMock()
+    event = {
+        "Records": [
+            sqs_record("a", {"user_id": 1}),
+            sqs_record("b", {"user_id": 2}),
+            sqs_record("c", {"user_id": 2}),
+            {"messageId": "d", "body": "not-json"},
+        ]
+    }
+
+    resp = lambda_handler(event, None)
+
+    failed_message_ids = sorted(failure["itemIdentifier"] for failure in resp["batchItemFailures"])
+    assert failed_message_ids == ["b", "c", "d"], \
+        "Only the messages of the failed user and the unreadable message should be redelivered"
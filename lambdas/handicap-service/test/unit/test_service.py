@@ -9,6 +9,7 @@ from lib.service import HandicapService
 from lib.footwedge_api import FootwedgeApi
 from lib.models import (
     GolfRound,
+    HandicapRound,
     TeeBox,
 )
 from lib.exceptions import (
@@ -77,6 +78,18 @@ def golf_round_factory():
     return _golf_round_factory
 
 
+@pytest.fixture
+def handicap_round_factory(golf_round_factory):
+    def _handicap_round_factory(tee_box: TeeBox):
+        golf_round = golf_round_factory(tee_box_id=tee_box.id)
+        return HandicapRound(
+            course_rating=tee_box.course_rating,
+            slope=tee_box.slope,
+            **golf_round.dict(),
+        )
+    return _handicap_round_factory
+
+
 @pytest.fixture
 def tee_box():
     tee_box_id = random.randrange(1, 1000, 1)
@@ -101,7 +114,7 @@ def tee_box():
 
 class TestHandicapService:
 
-    def test_get_golf_rounds_bad_request(self):
+    def test_get_handicap_window_bad_request(self):
         mock_footwedge_api_client = MagicMock()
         mock_response = MagicMock()
         mock_footwedge_api_client.call.return_value = mock_response
@@ -112,94 +125,54 @@ class TestHandicapService:
             user_id=1,
         )
         with pytest.raises(HandicapServiceFailure):
-            handicap_service._get_golf_rounds()
+            handicap_service._get_handicap_window()
 
-    def test_get_golf_rounds(self):
+    def test_get_handicap_window(self):
         mock_footwedge_api_client = MagicMock()
         mock_response = MagicMock()
         mock_footwedge_api_client.call.return_value = mock_response
         mock_response.ok = True
-        golf_round_dict = {
+        handicap_round_dict = {
             'id': 1,
             'golf_course_id': 1,
             'tee_box_id': 1,
             'user_id': 1,
             'gross_score': 70,
             'towards_handicap': True,
-            'played_on': datetime.now().strftime('%Y-%m-%d')
+            'played_on': datetime.now().strftime('%Y-%m-%d'),
+            'course_rating': '72.6',
+            'slope': '127',
         }
         response_body = {
-            "result": [golf_round_dict]
+            "result": [handicap_round_dict]
         }
         mock_response.json.return_value = response_body
-        expected_golf_rounds = [GolfRound(**golf_round_dict)]
+        expected_handicap_rounds = [HandicapRound(**handicap_round_dict)]
 
         handicap_service = HandicapService(
             footwedge_api_client=mock_footwedge_api_client,
             user_id=1,
         )
-        golf_rounds = handicap_service._get_golf_rounds()
+        handicap_rounds = handicap_service._get_handicap_window()
 
-        assert expected_golf_rounds == golf_rounds
+        assert expected_handicap_rounds == handicap_rounds
+        mock_footwedge_api_client.call.assert_called_once_with(method="get", path="/golf-rounds/1/handicap-window")
 
-    def test_get_tee_box_bad_request(self):
-        mock_footwedge_api_client = MagicMock()
-        mock_response = MagicMock()
-        mock_footwedge_api_client.call.return_value = mock_response
-        mock_response.ok = False
-
-        handicap_service = HandicapService(
-            footwedge_api_client=mock_footwedge_api_client,
-            user_id=1,
-        )
-        with pytest.raises(HandicapServiceFailure):
-            handicap_service._get_tee_box(tee_box_id=1)
-
-    def test_get_tee_box_none_found(self):
+    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}.post_handicap")
+    def test_add_handicap_no_eligible_golf_rounds(self, mock_post_handicap):
         mock_footwedge_api_client = MagicMock()
-        mock_response = MagicMock()
-        mock_footwedge_api_client.call.return_value = mock_response
-        mock_response.ok = True
-        response_body = {
-            "result": {},
-        }
-        mock_response.json.return_value = response_body
+        mock_footwedge_api_client.call.return_value.ok = True
+        mock_footwedge_api_client.call.return_value.json.return_value = {"result": []}
 
         handicap_service = HandicapService(
             footwedge_api_client=mock_footwedge_api_client,
             user_id=1,
         )
-        with pytest.raises(HandicapServiceFailure):
-            handicap_service._get_tee_box(tee_box_id=-1)
-
-    def test_get_tee_box(self):
-        mock_footwedge_api_client = MagicMock()
-        mock_response = MagicMock()
-        mock_footwedge_api_client.call.return_value = mock_response
-        mock_response.ok = True
-        tee_box_dict = {
-            'id': 1,
-            'golf_course_id': 1,
-            'tee_color': "Blue",
-            'par': 72,
-            'distance': 6500,
-            'unit': "yards",
-            'course_rating': '72.6',
-            'slope': '127',
-        }
-        response_body = {
-            "result": tee_box_dict
-        }
-        mock_response.json.return_value = response_body
-        expected_tee_box = TeeBox(**tee_box_dict)
-
-        handicap_service = HandicapService(
-            footwedge_api_client=mock_footwedge_api_client,
-            user_id=1,
-        )
-        tee_box = handicap_service._get_tee_box(tee_box_id=1)
+        handicap_service.add_handicap()
 
-        assert expected_tee_box == tee_box
+        assert not mock_post_handicap.called, \
+            "A User without handicap eligible golf_rounds has no handicap to post, and it shouldn't be retried"
+        mock_footwedge_api_client.call.assert_called_with(method="delete", path="/handicaps/1/active")
 
     def test_calculate_differential(self):
         gross_score = 79
@@ -358,53 +331,80 @@ class TestHandicapService:
             f"For the differentials: {sorted_score_differentials}, expect a handicap of {expected_handicap_index}"
 
     @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}.post_handicap")
-    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_tee_box")
-    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_golf_rounds")
+    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_handicap_window")
     def test_add_handicap_not_enough_golf_rounds(self,
-                                                 mock_get_golf_rounds,
-                                                 mock_get_tee_box,
+                                                 mock_get_handicap_window,
                                                  mock_post_handicap,
                                                  tee_box,
-                                                 golf_round_factory):
-        golf_round = golf_round_factory(tee_box_id=tee_box.id)
+                                                 handicap_round_factory):
+        handicap_round = handicap_round_factory(tee_box=tee_box)
         mock_footwedge_api_client = MagicMock()
-        mock_get_golf_rounds.return_value = [golf_round]
-        mock_get_tee_box.return_value = tee_box
+        mock_get_handicap_window.return_value = [handicap_round]
 
         handicap_service = HandicapService(
             footwedge_api_client=mock_footwedge_api_client,
             user_id=1,
         )
-        handicap_service._get_golf_rounds = mock_get_golf_rounds
-        handicap_service._get_tee_box = mock_get_tee_box
+        handicap_service._get_handicap_window = mock_get_handicap_window
 
         handicap_service.add_handicap()
 
         assert not mock_post_handicap.called, \
             "If not enough golf_rounds for a user, post_handicap should not be called"
+        mock_footwedge_api_client.call.assert_called_once_with(method="delete", path="/handicaps/1/active")
+
+    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_handicap_window")
+    def test_add_handicap_after_deleting_a_round_of_five(self,
+                                                         mock_get_handicap_window,
+                                                         tee_box,
+                                                         handicap_round_factory):
+        handicap_rounds = [handicap_round_factory(tee_box=tee_box) for _ in range(5)]
+        mock_footwedge_api_client = MagicMock()
+        mock_footwedge_api_client.call.return_value.ok = True
+        mock_get_handicap_window.side_effect = [handicap_rounds, handicap_rounds[1:]]
+
+        handicap_service = HandicapService(
+            footwedge_api_client=mock_footwedge_api_client,
+            user_id=1,
+        )
+        handicap_service.add_handicap()
+        handicap_service.add_handicap()
+
+        calls = [(call.kwargs['method'], call.kwargs['path']) for call in mock_footwedge_api_client.call.call_args_list]
+        assert calls == [("post", "/handicaps/1"), ("delete", "/handicaps/1/active")], \
+            "Expecting the handicap posted for 5 rounds to be closed once one of them is deleted"
+
+    def test_close_active_handicap_failure(self):
+        mock_footwedge_api_client = MagicMock()
+        mock_footwedge_api_client.call.return_value.ok = False
+
+        handicap_service = HandicapService(
+            footwedge_api_client=mock_footwedge_api_client,
+            user_id=1,
+        )
+        with pytest.raises(HandicapServiceFailure):
+            handicap_service.close_active_handicap()
 
     @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}.post_handicap")
-    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_tee_box")
-    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_golf_rounds")
+    @patch(f"{HANDICAP_SERVICE_IMPORT_PATH}._get_handicap_window")
     def test_add_handicap(self,
-                          mock_get_golf_rounds,
-                          mock_get_tee_box,
+                          mock_get_handicap_window,
                           mock_post_handicap,
                           tee_box,
-                          golf_round_factory):
-        golf_round = golf_round_factory(tee_box_id=tee_box.id)
+                          handicap_round_factory):
+        handicap_round = handicap_round_factory(tee_box=tee_box)
         mock_footwedge_api_client = MagicMock()
-        mock_get_golf_rounds.return_value = [golf_round, golf_round, golf_round, golf_round, golf_round]
-        mock_get_tee_box.return_value = tee_box
+        mock_get_handicap_window.return_value = [handicap_round] * 5
 
         handicap_service = HandicapService(
             footwedge_api_client=mock_footwedge_api_client,
             user_id=1,
         )
-        handicap_service._get_golf_rounds = mock_get_golf_rounds
-        handicap_service._get_tee_box = mock_get_tee_box
+        handicap_service._get_handicap_window = mock_get_handicap_window
 
         handicap_service.add_handicap()
 
         assert mock_post_handicap.called, \
             "If > 5 golf_rounds for a user, we expect post_handicap to be called"
+        assert mock_footwedge_api_client.call.call_count == 0, \
+            "The handicap window should be the only data fetched to calculate a handicap"
@@ -0,0 +1,8 @@
+import logging
+
+from api.tasks import rebuild_handicap_histories
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rebuild_handicap_histories()
@@ -0,0 +1,8 @@
+import logging
+
+from api.tasks import rebuild_stats_totals
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rebuild_stats_totals()
@@ -0,0 +1,21 @@
+import argparse
+import logging
+
+from api.tasks import bulk_recalculate_handicaps
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recalculate the handicap of every user")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes, defaults to the number of CPUs",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    bulk_recalculate_handicaps(num_workers=args.workers)
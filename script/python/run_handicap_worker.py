@@ -0,0 +1,26 @@
+import logging
+
+from api.handicap_queue import REDIS_QUEUE_NAME
+from api.job_queue import RedisJobQueue
+from api.redis_client import redis_client
+from api.tasks import calculate_usga_handicap
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    job_queue = RedisJobQueue(redis_client=redis_client, name=REDIS_QUEUE_NAME)
+    logger.info(f"Waiting for handicap jobs on redis queue: '{REDIS_QUEUE_NAME}'")
+    while True:
+        body = job_queue.receive(timeout=1)
+        if body is None:
+            continue
+        try:
+            calculate_usga_handicap(body['user_id'])
+        except Exception:
+            logger.exception(f"Handicap calculation failed for job: {body}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
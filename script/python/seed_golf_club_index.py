@@ -45,9 +45,9 @@ def create_index(index: str, nested_properties: List[str]):
 
 def build_request_bodies() -> List[dict]:
     request_bodies = []
-    golf_clubs_records = golf_club_repo.get_all()
+    golf_clubs_records = golf_club_repo.get_all().items
     for golf_club in golf_clubs_records:
-        golf_course_records = golf_course_repo.get_by_golf_club_id(golf_club_id=golf_club.id)
+        golf_course_records = golf_course_repo.get_by_golf_club_id(golf_club_id=golf_club.id).items
         golf_course_data = golf_course_schema.dump(golf_course_records, many=True).data
         golf_club_data = golf_club_schema.dump(golf_club).data
         golf_club_data['golf_courses'] = golf_course_data
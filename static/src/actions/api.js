@@ -167,6 +167,8 @@ export const getGolfRounds = () => {
       endpoint: endPoint,
       httpMethod: 'GET',
       headers: {},
+      query: {limit: 1000},
+      followCursor: true,
       types: [
         GET_GOLF_ROUNDS_REQUEST,
         GET_GOLF_ROUNDS_SUCCESS,
@@ -14,6 +14,23 @@ const isRefreshAction = (apiAction, refreshAction) => {
   return apiAction.endpoint === refreshAction[REFRESH_TOKEN_REQUIRED].endpoint;
 }
 
+// follows next_cursor until the last page, resolving with every page's result as one payload
+const requestAllPages = (config, results = []) => {
+  return axios.request(config)
+    .then(res => {
+      const payload = res.data;
+      const allResults = results.concat(payload.result);
+      if (!payload.next_cursor) {
+        return {...payload, result: allResults};
+      }
+      const nextConfig = {
+        ...config,
+        params: {...config.params, cursor: payload.next_cursor},
+      };
+      return requestAllPages(nextConfig, allResults);
+    })
+}
+
 export const apiMiddleware = store => next => action => {
   const apiAction = action[CALL_API];
   if (typeof apiAction === "undefined") {
@@ -21,7 +38,7 @@ export const apiMiddleware = store => next => action => {
   }
 
   let { endpoint, httpMethod, body, query, headers } = apiAction;
-  const { types } = apiAction;
+  const { types, followCursor } = apiAction;
 
   if (body) {
     body = JSON.stringify(body);
@@ -50,9 +67,12 @@ export const apiMiddleware = store => next => action => {
   const [requestType, successType, failureType] = types;
   next(actionWith({ type: requestType }));
 
-  return axios.request(config)
-    .then(res => {
-      const payload = res.data;
+  const request = followCursor
+    ? requestAllPages(config)
+    : axios.request(config).then(res => res.data);
+
+  return request
+    .then(payload => {
       // want to normalize the response
       next(actionWith({
         type: successType,